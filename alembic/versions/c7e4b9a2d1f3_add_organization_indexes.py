@@ -0,0 +1,29 @@
+"""Add organization lookup indexes on users and audits
+
+Revision ID: c7e4b9a2d1f3
+Revises: a1b2c3d4e5f6, a3f8d2c91b47
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c7e4b9a2d1f3"
+down_revision: str | Sequence[str] | None = ("a1b2c3d4e5f6", "a3f8d2c91b47")
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Index organization_id for member and audit counts."""
+    op.create_index("ix_users_organization", "users", ["organization_id"])
+    op.create_index("ix_audits_organization", "audits", ["organization_id"])
+
+
+def downgrade() -> None:
+    """Drop organization lookup indexes."""
+    op.drop_index("ix_audits_organization", table_name="audits")
+    op.drop_index("ix_users_organization", table_name="users")
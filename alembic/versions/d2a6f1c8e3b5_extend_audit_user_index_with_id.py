@@ -0,0 +1,48 @@
+"""Extend the per-user audit index with id for keyset pagination
+
+Revision ID: d2a6f1c8e3b5
+Revises: c7e4b9a2d1f3
+Create Date: 2026-10-17 12:30:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d2a6f1c8e3b5"
+down_revision: str | Sequence[str] | None = "c7e4b9a2d1f3"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Replace ix_audits_user_created with (user_id, created_at, id).
+
+    Audit listings order by ``created_at DESC, id DESC`` and seek on
+    ``(created_at, id)``; a backward scan of this index serves both without a
+    sort. Built concurrently so the audits table stays writable.
+    """
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_audits_user_created_id",
+            "audits",
+            ["user_id", "created_at", "id"],
+            postgresql_concurrently=True,
+        )
+        op.drop_index("ix_audits_user_created", table_name="audits", postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Restore the original (user_id, created_at) index."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_audits_user_created",
+            "audits",
+            ["user_id", "created_at"],
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_audits_user_created_id", table_name="audits", postgresql_concurrently=True
+        )
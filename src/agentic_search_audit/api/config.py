@@ -40,6 +40,10 @@ class APISettings(BaseSettings):
     jwt_algorithm: str = Field(default="HS256")
     jwt_expiration_hours: int = Field(default=24)
     api_key_header: str = Field(default="X-API-Key")
+    password_hash_time_cost: int = Field(default=2, ge=1, description="Argon2id iterations")
+    password_hash_memory_kib: int = Field(
+        default=65536, ge=8, description="Argon2id memory cost in KiB"
+    )
 
     @model_validator(mode="after")
     def validate_secret_key_in_production(self) -> "APISettings":
@@ -81,6 +85,13 @@ class APISettings(BaseSettings):
         description="Redis connection URL for job queue",
     )
     redis_job_ttl: int = Field(default=86400, description="Job TTL in seconds (24h)")
+    redis_ratelimit_urls: list[str] = Field(
+        default=[],
+        description=(
+            "Redis URLs for rate-limit counters. Empty shares the main Redis "
+            "connection; several URLs shard identifiers across instances."
+        ),
+    )
 
     # Rate limiting
     rate_limit_requests: int = Field(default=100, description="Requests per window")
@@ -100,6 +111,11 @@ class APISettings(BaseSettings):
         """Check if running in production."""
         return self.environment == "production"
 
+    @property
+    def jwt_expiration_seconds(self) -> int:
+        """Access token lifetime in seconds."""
+        return self.jwt_expiration_hours * 3600
+
 
 @lru_cache
 def get_settings() -> APISettings:
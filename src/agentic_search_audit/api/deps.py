@@ -1,7 +1,9 @@
 """API dependencies for database and Redis connections."""
 
+import hashlib
 import logging
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from typing import Any
 
 from .config import get_settings
@@ -12,6 +14,7 @@ logger = logging.getLogger(__name__)
 _db_engine = None
 _db_session_factory = None
 _redis_client = None
+_ratelimit_clients: list[Any] = []
 
 
 async def init_db() -> None:
@@ -54,8 +57,9 @@ async def close_db() -> None:
         logger.info("Database connection pool closed")
 
 
-async def get_db_session() -> AsyncGenerator:
-    """Get a database session."""
+@asynccontextmanager
+async def get_db_session() -> AsyncIterator[Any]:
+    """Open a database session, committing on success and rolling back on error."""
     if not _db_session_factory:
         raise RuntimeError("Database not initialized. Call init_db() first.")
 
@@ -103,3 +107,56 @@ async def get_redis() -> Any:
         raise RuntimeError("Redis not initialized. Call init_redis() first.")
 
     return _redis_client
+
+
+async def init_ratelimit_redis() -> None:
+    """Initialize dedicated Redis connections for rate limiting, if configured."""
+    global _ratelimit_clients
+
+    settings = get_settings()
+    if not settings.redis_ratelimit_urls:
+        return
+
+    import redis.asyncio as redis
+
+    clients = [
+        redis.from_url(url, encoding="utf-8", decode_responses=True)
+        for url in settings.redis_ratelimit_urls
+    ]
+    for client in clients:
+        await client.ping()  # type: ignore[misc]
+
+    _ratelimit_clients = clients
+    logger.info(f"Rate-limit Redis initialized ({len(clients)} shard(s))")
+
+
+async def close_ratelimit_redis() -> None:
+    """Close dedicated rate-limit Redis connections."""
+    global _ratelimit_clients
+
+    for client in _ratelimit_clients:
+        await client.close()
+    if _ratelimit_clients:
+        _ratelimit_clients = []
+        logger.info("Rate-limit Redis connections closed")
+
+
+async def get_ratelimit_redis_clients() -> list[Any]:
+    """Get every Redis client that holds rate-limit counters."""
+    return list(_ratelimit_clients) or [await get_redis()]
+
+
+async def get_ratelimit_redis(identifier: str) -> Any:
+    """Get the Redis client owning the rate-limit counters for an identifier.
+
+    Falls back to the main Redis client when no dedicated instances are
+    configured; otherwise identifiers are sharded by a stable hash.
+    """
+    if not _ratelimit_clients:
+        return await get_redis()
+
+    if len(_ratelimit_clients) == 1:
+        return _ratelimit_clients[0]
+
+    digest = hashlib.blake2b(identifier.encode(), digest_size=8).digest()
+    return _ratelimit_clients[int.from_bytes(digest, "big") % len(_ratelimit_clients)]
@@ -2,11 +2,16 @@
 
 import logging
 import os
+import queue
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any
 
+import orjson
 from fastapi import FastAPI
+from fastapi.datastructures import Default
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, Response
 from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, generate_latest
@@ -18,6 +23,13 @@ from .routes import audits, auth, billing, gdpr, health, users
 logger = logging.getLogger(__name__)
 
 
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson instead of the stdlib encoder."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
 def init_sentry() -> None:
     """Initialize Sentry error tracking."""
     settings = get_settings()
@@ -42,10 +54,39 @@ def init_sentry() -> None:
         logger.info("Sentry initialized")
 
 
+def start_queued_logging() -> QueueListener | None:
+    """Move root log handler I/O onto a background thread.
+
+    The root logger's handlers are replaced by a QueueHandler, so request
+    handlers and middleware only enqueue records; a QueueListener thread
+    formats and emits them through the original handlers.
+    """
+    root = logging.getLogger()
+    handlers = [h for h in root.handlers if not isinstance(h, QueueHandler)]
+    if not handlers:
+        return None
+
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    root.handlers = [QueueHandler(log_queue)]
+    listener.start()
+    return listener
+
+
+def stop_queued_logging(listener: QueueListener | None) -> None:
+    """Flush queued log records and restore the original root handlers."""
+    if listener is None:
+        return
+
+    listener.stop()
+    logging.getLogger().handlers = list(listener.handlers)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Application lifespan manager for startup/shutdown."""
     settings = get_settings()
+    log_listener = start_queued_logging()
     logger.info(f"Starting {settings.app_name} v{settings.app_version}")
     logger.info(f"Environment: {settings.environment}")
 
@@ -53,20 +94,30 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     init_sentry()
 
     # Startup: Initialize connections
-    from .deps import init_db, init_redis
+    from .deps import get_ratelimit_redis_clients, init_db, init_ratelimit_redis, init_redis
+    from .middleware import load_rate_limit_script
 
     await init_db()
     await init_redis()
+    await init_ratelimit_redis()
+
+    # Register the rate-limit script so requests can use EVALSHA
+    for client in await get_ratelimit_redis_clients():
+        await load_rate_limit_script(client)
 
     logger.info("Application started successfully")
     yield
 
     # Shutdown: Close connections
-    from .deps import close_db, close_redis
+    from .deps import close_db, close_ratelimit_redis, close_redis
+    from .routes.billing import close_stripe_http
 
     await close_db()
+    await close_ratelimit_redis()
     await close_redis()
+    await close_stripe_http()
     logger.info("Application shutdown complete")
+    stop_queued_logging(log_listener)
 
 
 def create_app() -> FastAPI:
@@ -81,6 +132,9 @@ def create_app() -> FastAPI:
         redoc_url="/redoc" if not settings.is_production else None,
         openapi_url="/openapi.json" if not settings.is_production else None,
         lifespan=lifespan,
+        # Kept as a Default placeholder so routes with a response model still
+        # use FastAPI's direct pydantic-core JSON path; other routes use orjson
+        default_response_class=Default(ORJSONResponse),
     )
 
     # Add middleware (order matters - first added is outermost)
@@ -94,12 +148,12 @@ def create_app() -> FastAPI:
 
     # Add custom middleware
     app.add_middleware(RequestLoggingMiddleware)
-    app.add_middleware(RateLimitMiddleware)
+    app.add_middleware(RateLimitMiddleware, settings=settings)
     app.add_middleware(MetricsMiddleware)
 
     # Global exception handler
     @app.exception_handler(Exception)
-    async def global_exception_handler(request: object, exc: Exception) -> JSONResponse:
+    async def global_exception_handler(request: object, exc: Exception) -> ORJSONResponse:
         logger.exception("Unhandled exception")
 
         # Report to Sentry in production
@@ -108,7 +162,7 @@ def create_app() -> FastAPI:
 
             sentry_sdk.capture_exception(exc)
 
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={
                 "error": "internal_server_error",
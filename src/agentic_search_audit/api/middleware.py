@@ -1,94 +1,344 @@
 """API middleware for rate limiting, logging, and metrics."""
 
+import asyncio
+import hashlib
 import logging
+import math
 import time
+from collections import OrderedDict
 from collections.abc import Awaitable, Callable
 from typing import Any, cast
 
+import orjson
 from fastapi import Request, Response, status
-from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from .config import get_settings
+from .config import APISettings, get_settings
 
 logger = logging.getLogger(__name__)
 
+# Rate-limit identities derived from JWTs are reused for this long
+_TOKEN_CACHE_TTL_SECONDS = 60.0
+_TOKEN_CACHE_MAX_SIZE = 10_000
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
+
+def _token_digest(token: str) -> bytes:
+    """Fixed-size digest used to key cached token lookups."""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+class _TokenIdentifierCache:
     """
-    Rate limiting middleware using Redis sliding window.
+    Bounded TTL cache mapping bearer tokens to rate-limit identifiers.
 
-    Limits requests per user (authenticated) or IP (anonymous).
+    Tokens are keyed by a 16-byte BLAKE2b digest to bound memory, and an
+    entry never outlives the ``exp`` claim of the token it was derived from.
     """
 
-    async def dispatch(
-        self, request: Request, call_next: Callable[[Request], Awaitable[Response]]
-    ) -> Response:
-        settings = get_settings()
+    def __init__(
+        self,
+        maxsize: int = _TOKEN_CACHE_MAX_SIZE,
+        ttl: float = _TOKEN_CACHE_TTL_SECONDS,
+    ) -> None:
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._entries: OrderedDict[bytes, tuple[str, float]] = OrderedDict()
+
+    def get(self, token: str) -> str | None:
+        """Return the cached identifier for a token, if still fresh."""
+        key = _token_digest(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        identifier, expires_at = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return identifier
+
+    def set(self, token: str, identifier: str, token_exp: float | None = None) -> None:
+        """Cache an identifier, evicting the least recently used entry if full."""
+        expires_at = time.time() + self._ttl
+        if token_exp is not None:
+            expires_at = min(expires_at, token_exp)
+
+        key = _token_digest(token)
+        self._entries[key] = (identifier, expires_at)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_token_identifier_cache = _TokenIdentifierCache()
+
+# Redis key prefix for identifiers shared across worker processes
+_SHARED_TOKEN_KEY_PREFIX = "jwt:"
+
+# Increment the current window counter and read the previous one in one trip.
+# Counters live for two windows so the next window can still weight them.
+_RATE_LIMIT_SCRIPT = """
+local current = redis.call('INCR', KEYS[1])
+if current == 1 then
+    redis.call('EXPIRE', KEYS[1], tonumber(ARGV[1]) * 2)
+end
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+return {current, previous}
+"""
+
+
+# Static parts of the 429 body, equivalent to json.dumps of the error payload
+_LIMIT_BODY_PREFIX = (
+    b'{"error":"rate_limit_exceeded",'
+    b'"message":"Too many requests. Please try again later.",'
+    b'"retry_after":'
+)
+_LIMIT_BODY_SUFFIX = b"}"
+
+
+class _RateLimitBatcher:
+    """
+    Coalesce rate-limit script calls issued in the same event-loop tick.
+
+    Concurrent requests each queue their EVALSHA and await a future; a flush
+    scheduled with ``call_soon`` sends everything queued so far as a single
+    non-transactional pipeline, turning N round trips into one.
+    """
+
+    def __init__(self) -> None:
+        self._pending: list[tuple[Any, tuple[Any, ...], asyncio.Future[Any]]] = []
+        self._flush_tasks: set[asyncio.Task[None]] = set()
+
+    async def evalsha(self, redis: Any, *args: Any) -> Any:
+        """Queue an EVALSHA and wait for its result."""
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[Any] = loop.create_future()
+        if not self._pending:
+            loop.call_soon(self._start_flush)
+        self._pending.append((redis, args, future))
+        return await future
+
+    def _start_flush(self) -> None:
+        task = asyncio.ensure_future(self._flush())
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _flush(self) -> None:
+        batch, self._pending = self._pending, []
+
+        # Group by client so each pipeline targets the connection it came from
+        groups: dict[int, list[tuple[Any, tuple[Any, ...], asyncio.Future[Any]]]] = {}
+        for entry in batch:
+            groups.setdefault(id(entry[0]), []).append(entry)
+
+        for entries in groups.values():
+            await self._execute(entries)
+
+    @staticmethod
+    async def _execute(entries: list[tuple[Any, tuple[Any, ...], asyncio.Future[Any]]]) -> None:
+        redis = entries[0][0]
+        try:
+            if len(entries) == 1:
+                # Nothing to coalesce; skip the pipeline bookkeeping
+                results = [await redis.evalsha(*entries[0][1])]
+            else:
+                pipe = redis.pipeline(transaction=False)
+                for _, args, _ in entries:
+                    pipe.evalsha(*args)
+                results = await pipe.execute(raise_on_error=False)
+        except Exception as e:
+            results = [e] * len(entries)
+
+        for (_, _, future), result in zip(entries, results, strict=True):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
 
-        # Skip rate limiting for health checks
-        if request.url.path.startswith("/health"):
-            return cast(Response, await call_next(request))
+_rate_limit_batcher = _RateLimitBatcher()
+
+# SHA of _RATE_LIMIT_SCRIPT as registered with Redis (set by SCRIPT LOAD)
+_rate_limit_script_sha: str | None = None
+
+
+async def load_rate_limit_script(redis: Any) -> str:
+    """Register the rate-limit script with Redis and cache its SHA.
+
+    Called at startup after connecting to Redis, and again whenever Redis
+    reports NOSCRIPT (e.g. after a restart flushed its script cache).
+    """
+    global _rate_limit_script_sha
+
+    sha: str = await redis.script_load(_RATE_LIMIT_SCRIPT)
+    _rate_limit_script_sha = sha
+    return sha
+
+
+class RateLimitMiddleware:
+    """
+    Rate limiting middleware using Redis window counters.
+
+    Limits requests per user (authenticated) or IP (anonymous). Implemented
+    as plain ASGI so the hot path reads only the headers it needs from the
+    scope instead of building a Starlette ``Request``.
+    """
+
+    def __init__(self, app: ASGIApp, settings: APISettings | None = None) -> None:
+        self.app = app
+
+        # Settings are fixed for the app's lifetime, so resolve them once
+        self._settings = settings or get_settings()
+        self._max_requests = self._settings.rate_limit_requests
+        self._window_seconds = self._settings.rate_limit_window
+        self._limit_header = str(self._max_requests).encode()
+        self._skip_prefixes = ("/health",)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Skip non-HTTP traffic and health checks
+        if scope["type"] != "http" or scope["path"].startswith(self._skip_prefixes):
+            await self.app(scope, receive, send)
+            return
 
         # Get identifier (user_id from token or IP)
-        identifier = await self._get_identifier(request)
+        identifier = await self._get_identifier(scope)
 
         # Check rate limit
         is_allowed, remaining, reset_at = await self._check_rate_limit(
             identifier,
-            settings.rate_limit_requests,
-            settings.rate_limit_window,
+            self._max_requests,
+            self._window_seconds,
         )
 
+        limit = self._limit_header
+        reset = str(reset_at).encode()
+
         if not is_allowed:
-            return JSONResponse(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                content={
-                    "error": "rate_limit_exceeded",
-                    "message": "Too many requests. Please try again later.",
-                    "retry_after": reset_at,
-                },
-                headers={
-                    "X-RateLimit-Limit": str(settings.rate_limit_requests),
-                    "X-RateLimit-Remaining": "0",
-                    "X-RateLimit-Reset": str(reset_at),
-                    "Retry-After": str(reset_at),
-                },
+            # Only retry_after varies, so splice it into a pre-encoded body
+            body = _LIMIT_BODY_PREFIX + reset + _LIMIT_BODY_SUFFIX
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": status.HTTP_429_TOO_MANY_REQUESTS,
+                    "headers": [
+                        (b"content-type", b"application/json"),
+                        (b"content-length", str(len(body)).encode()),
+                        (b"x-ratelimit-limit", limit),
+                        (b"x-ratelimit-remaining", b"0"),
+                        (b"x-ratelimit-reset", reset),
+                        (b"retry-after", reset),
+                    ],
+                }
             )
-
-        # Process request
-        response = cast(Response, await call_next(request))
-
-        # Add rate limit headers
-        response.headers["X-RateLimit-Limit"] = str(settings.rate_limit_requests)
-        response.headers["X-RateLimit-Remaining"] = str(remaining)
-        response.headers["X-RateLimit-Reset"] = str(reset_at)
-
-        return response
-
-    async def _get_identifier(self, request: Request) -> str:
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        rate_limit_headers = [
+            (b"x-ratelimit-limit", limit),
+            (b"x-ratelimit-remaining", str(remaining).encode()),
+            (b"x-ratelimit-reset", reset),
+        ]
+
+        async def send_with_headers(message: Message) -> None:
+            # Add rate limit headers
+            if message["type"] == "http.response.start":
+                message = {
+                    **message,
+                    "headers": [*message.get("headers", []), *rate_limit_headers],
+                }
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+    async def _get_identifier(self, scope: Scope) -> str:
         """Get identifier for rate limiting."""
+        # ASGI header names are already lowercased bytes; scan once for both
+        auth_header = forwarded = None
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                auth_header = value
+            elif name == b"x-forwarded-for":
+                forwarded = value
+
         # Try to get user_id from authorization header
-        auth_header = request.headers.get("Authorization", "")
-        if auth_header.startswith("Bearer "):
+        if auth_header is not None and auth_header.startswith(b"Bearer "):
+            token = auth_header.split(b" ")[1].decode("latin-1")
+            cached = _token_identifier_cache.get(token)
+            if cached is not None:
+                return cached
+
+            # Another worker may already have verified this token
+            shared = await self._get_shared_identifier(token)
+            if shared is not None:
+                _token_identifier_cache.set(token, *shared)
+                return shared[0]
+
             try:
                 from .routes.auth import verify_token
 
-                settings = get_settings()
-                token = auth_header.split(" ")[1]
-                payload = verify_token(token, settings)
-                return f"user:{payload['sub']}"
+                payload = verify_token(token, self._settings)
+                identifier = f"user:{payload['sub']}"
+                exp = payload.get("exp")
+                _token_identifier_cache.set(token, identifier, exp)
+                await self._set_shared_identifier(token, identifier, exp)
+                return identifier
             except Exception:
                 pass
 
         # Fall back to IP address
-        client_ip = request.client.host if request.client else "unknown"
-        forwarded = request.headers.get("X-Forwarded-For")
+        client = scope.get("client")
+        client_ip = client[0] if client else "unknown"
         if forwarded:
-            client_ip = forwarded.split(",")[0].strip()
+            client_ip = forwarded.split(b",")[0].strip().decode("latin-1")
 
         return f"ip:{client_ip}"
 
+    async def _get_shared_identifier(self, token: str) -> tuple[str, float] | None:
+        """Look up an identifier derived from this token by any worker."""
+        try:
+            from .deps import get_redis
+
+            redis = await get_redis()
+            cached = await redis.get(_SHARED_TOKEN_KEY_PREFIX + _token_digest(token).hex())
+            if not cached:
+                return None
+            entry = orjson.loads(cached)
+            return entry["ident"], entry["exp"]
+        except Exception:
+            return None
+
+    async def _set_shared_identifier(self, token: str, identifier: str, exp: float | None) -> None:
+        """Share a verified identifier with other workers until the token expires."""
+        if exp is None:
+            return
+        ttl = int(exp - time.time())
+        if ttl <= 0:
+            return
+
+        try:
+            from .deps import get_redis
+
+            redis = await get_redis()
+            await redis.set(
+                _SHARED_TOKEN_KEY_PREFIX + _token_digest(token).hex(),
+                orjson.dumps({"ident": identifier, "exp": exp}),
+                ex=ttl,
+            )
+        except Exception as e:
+            logger.debug(f"Could not share token identifier: {e}")
+
     async def _check_rate_limit(
         self,
         identifier: str,
@@ -96,40 +346,42 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         window_seconds: int,
     ) -> tuple[bool, int, int]:
         """
-        Check rate limit using Redis sliding window.
+        Check rate limit using a two-bucket sliding window approximation.
+
+        Each window is an O(1) Redis counter; the previous window's count is
+        weighted by how much of it still overlaps the sliding window.
 
         Returns: (is_allowed, remaining_requests, reset_timestamp)
         """
         try:
-            from .deps import get_redis
+            from redis.exceptions import NoScriptError
 
-            redis = await get_redis()
-            key = f"ratelimit:{identifier}"
-            now = int(time.time())
-            window_start = now - window_seconds
+            from .deps import get_ratelimit_redis
 
-            # Use Redis pipeline for atomic operations
-            pipe = redis.pipeline()
+            redis = await get_ratelimit_redis(identifier)
+            now = time.time()
+            bucket = int(now // window_seconds)
+            current_key = f"rl:{identifier}:{bucket}"
+            previous_key = f"rl:{identifier}:{bucket - 1}"
+            script_args = (2, current_key, previous_key, window_seconds)
 
-            # Remove old entries
-            pipe.zremrangebyscore(key, 0, window_start)
-
-            # Count current entries
-            pipe.zcard(key)
-
-            # Add current request
-            pipe.zadd(key, {str(now): now})
+            sha = _rate_limit_script_sha or await load_rate_limit_script(redis)
+            try:
+                result = await _rate_limit_batcher.evalsha(redis, sha, *script_args)
+            except NoScriptError:
+                # Redis lost its script cache; register the script again
+                sha = await load_rate_limit_script(redis)
+                result = await _rate_limit_batcher.evalsha(redis, sha, *script_args)
 
-            # Set expiry
-            pipe.expire(key, window_seconds)
+            current_count, previous_count = result
 
-            results = await pipe.execute()
-            current_count = results[1]
+            elapsed_fraction = (now % window_seconds) / window_seconds
+            weighted_count = int(previous_count) * (1 - elapsed_fraction) + int(current_count)
 
-            remaining = max(0, max_requests - current_count - 1)
-            reset_at = now + window_seconds
+            remaining = max(0, max_requests - math.ceil(weighted_count))
+            reset_at = (bucket + 1) * window_seconds
 
-            is_allowed = current_count < max_requests
+            is_allowed = weighted_count <= max_requests
 
             return is_allowed, remaining, reset_at
 
@@ -150,7 +402,9 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
 
         # Log request
         logger.info(
-            f"Request: {request.method} {request.url.path}",
+            "Request: %s %s",
+            request.method,
+            request.url.path,
             extra={
                 "method": request.method,
                 "path": request.url.path,
@@ -167,7 +421,9 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
 
         # Log response
         logger.info(
-            f"Response: {response.status_code} ({duration:.3f}s)",
+            "Response: %s (%.3fs)",
+            response.status_code,
+            duration,
             extra={
                 "status_code": response.status_code,
                 "duration_ms": round(duration * 1000, 2),
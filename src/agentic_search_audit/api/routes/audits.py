@@ -1,13 +1,13 @@
 """Audit management endpoints."""
 
-from typing import Annotated
+from typing import Annotated, Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 
 from ...core.types import Query as QueryModel
-from ..config import APISettings, get_settings
-from ..routes.auth import oauth2_scheme, verify_token
+from ..routes.auth import get_current_payload
 from ..routes.users import get_current_user
 from ..schemas import (
     AuditCancelRequest,
@@ -16,7 +16,6 @@ from ..schemas import (
     AuditDetail,
     AuditListResponse,
     AuditStatus,
-    AuditSummary,
 )
 
 router = APIRouter()
@@ -25,28 +24,32 @@ router = APIRouter()
 # TODO: This should be fetched from the user's subscription plan
 DEFAULT_MONTHLY_AUDIT_LIMIT = 100
 
+# Direct value -> member lookup, skipping Enum.__call__ for every DB row
+_STATUS_MAP = {member.value: member for member in AuditStatus}
+
+
+def _as_uuid(value: Any) -> UUID:
+    """Return a UUID, only re-parsing values the DB driver did not already convert."""
+    return value if isinstance(value, UUID) else UUID(str(value))
+
 
 @router.post("", response_model=AuditCreateResponse, status_code=status.HTTP_202_ACCEPTED)
 async def create_audit(
     audit_request: AuditCreateRequest,
-    token: Annotated[str, Depends(oauth2_scheme)],
-    settings: Annotated[APISettings, Depends(get_settings)],
+    user: Annotated[Any, Depends(get_current_user)],
 ) -> AuditCreateResponse:
     """
     Create a new search audit job.
 
     The audit runs asynchronously. Use the returned audit_id to check status.
     """
-    payload = verify_token(token, settings)
-    user_id = UUID(payload["sub"])
-
-    user = await get_current_user(token, settings)
+    user_id = UUID(str(user.id))
 
     from ...db.repositories import AuditRepository, UsageRepository  # type: ignore[import-untyped]
     from ...jobs.tasks import enqueue_audit  # type: ignore[import-untyped]
     from ..deps import get_db_session
 
-    async for session in get_db_session():
+    async with get_db_session() as session:
         # Check usage limits
         usage_repo = UsageRepository(session)
         current_usage = await usage_repo.get_current_period(user_id)
@@ -92,90 +95,106 @@ async def create_audit(
             estimated_duration_seconds=estimated_seconds,
         )
 
-    raise HTTPException(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        detail="Database session unavailable",
-    )
-
 
 @router.get("", response_model=AuditListResponse)
 async def list_audits(
-    token: Annotated[str, Depends(oauth2_scheme)],
-    settings: Annotated[APISettings, Depends(get_settings)],
+    payload: Annotated[dict[str, Any], Depends(get_current_payload)],
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=20, ge=1, le=100),
     status_filter: AuditStatus | None = Query(default=None, alias="status"),
-) -> AuditListResponse:
+    cursor: str | None = Query(default=None),
+) -> Response:
     """
     List audits for the current user.
 
-    Supports pagination and filtering by status.
+    Supports pagination and filtering by status. Pass the returned
+    ``next_cursor`` back as ``cursor`` to fetch the following page; ``page``
+    is kept for offset-based clients.
     """
-    payload = verify_token(token, settings)
     user_id = UUID(payload["sub"])
 
-    from ...db.repositories import AuditRepository
+    from ...db.repositories import AuditRepository, encode_audit_cursor
     from ..deps import get_db_session
 
-    async for session in get_db_session():
+    async with get_db_session() as session:
         repo = AuditRepository(session)
-        audits, total = await repo.list_by_user(
-            user_id=user_id,
-            page=page,
-            page_size=page_size,
-            status=status_filter,
-        )
+        total: int | None
+        if cursor is not None or page == 1:
+            try:
+                rows, next_cursor, total = await repo.list_by_user_keyset(
+                    user_id=user_id,
+                    cursor=cursor,
+                    limit=page_size,
+                    status=status_filter,
+                )
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid pagination cursor",
+                )
+        else:
+            rows, total = await repo.list_summaries_by_user(
+                user_id=user_id,
+                page=page,
+                page_size=page_size,
+                status=status_filter,
+            )
+            next_cursor = None
+            if rows and page * page_size < total:
+                next_cursor = encode_audit_cursor(rows[-1].created_at, rows[-1].id)
 
-        pages = (total + page_size - 1) // page_size
+        pages = None if total is None else (total + page_size - 1) // page_size
 
+        # Rows come from our own DB and were validated on write, so the page is
+        # encoded straight to JSON instead of going through AuditSummary models
+        # and a model_dump; AuditListResponse remains the documented schema
         items = [
-            AuditSummary(
-                id=UUID(str(a.id)),
-                site_url=a.site_url,
-                status=AuditStatus(a.status),
-                query_count=len(a.queries),
-                completed_queries=a.completed_queries,
-                average_score=a.average_score,
-                created_at=a.created_at,
-                started_at=a.started_at,
-                completed_at=a.completed_at,
-                error_message=a.error_message,
-            )
-            for a in audits
+            {
+                "id": row.id,
+                "site_url": row.site_url,
+                "status": row.status,
+                "query_count": row.query_count or 0,
+                "completed_queries": row.completed_queries,
+                "average_score": row.average_score,
+                "created_at": row.created_at,
+                "started_at": row.started_at,
+                "completed_at": row.completed_at,
+                "error_message": row.error_message,
+            }
+            for row in rows
         ]
 
-        return AuditListResponse(
-            items=items,
-            total=total,
-            page=page,
-            page_size=page_size,
-            pages=pages,
+        return Response(
+            content=orjson.dumps(
+                {
+                    "items": items,
+                    "total": total,
+                    "page": page,
+                    "page_size": page_size,
+                    "pages": pages,
+                    "next_cursor": next_cursor,
+                }
+            ),
+            media_type="application/json",
         )
 
-    raise HTTPException(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        detail="Database session unavailable",
-    )
-
 
 @router.get("/{audit_id}", response_model=AuditDetail)
 async def get_audit(
     audit_id: UUID,
-    token: Annotated[str, Depends(oauth2_scheme)],
-    settings: Annotated[APISettings, Depends(get_settings)],
+    payload: Annotated[dict[str, Any], Depends(get_current_payload)],
 ) -> AuditDetail:
     """
     Get detailed information about an audit.
 
     Includes query results if the audit is completed.
     """
-    payload = verify_token(token, settings)
     user_id = UUID(payload["sub"])
 
     from ...db.repositories import AuditRepository
     from ..deps import get_db_session
 
-    async for session in get_db_session():
+    async with get_db_session() as session:
         repo = AuditRepository(session)
         audit = await repo.get_by_id(audit_id)
 
@@ -197,10 +216,10 @@ async def get_audit(
             QueryModel(id=f"q{i}", text=q, lang="en") for i, q in enumerate(audit.queries)
         ]
 
-        return AuditDetail(
-            id=UUID(str(audit.id)),
+        return AuditDetail.model_construct(
+            id=_as_uuid(audit.id),
             site_url=audit.site_url,
-            status=AuditStatus(audit.status),
+            status=_STATUS_MAP[audit.status],
             query_count=len(audit.queries),
             completed_queries=audit.completed_queries,
             average_score=audit.average_score,
@@ -215,32 +234,25 @@ async def get_audit(
             results=None,
         )
 
-    raise HTTPException(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        detail="Database session unavailable",
-    )
-
 
 @router.post("/{audit_id}/cancel", status_code=status.HTTP_200_OK)
 async def cancel_audit(
     audit_id: UUID,
     cancel_request: AuditCancelRequest,
-    token: Annotated[str, Depends(oauth2_scheme)],
-    settings: Annotated[APISettings, Depends(get_settings)],
+    payload: Annotated[dict[str, Any], Depends(get_current_payload)],
 ) -> dict[str, str]:
     """
     Cancel a running audit.
 
     Only audits with status PENDING or RUNNING can be cancelled.
     """
-    payload = verify_token(token, settings)
     user_id = UUID(payload["sub"])
 
     from ...db.repositories import AuditRepository
     from ...jobs.tasks import cancel_audit_job
     from ..deps import get_db_session
 
-    async for session in get_db_session():
+    async with get_db_session() as session:
         repo = AuditRepository(session)
         audit = await repo.get_by_id(audit_id)
 
@@ -274,30 +286,23 @@ async def cancel_audit(
 
         return {"message": "Audit cancelled successfully"}
 
-    raise HTTPException(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        detail="Database session unavailable",
-    )
-
 
 @router.delete("/{audit_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_audit(
     audit_id: UUID,
-    token: Annotated[str, Depends(oauth2_scheme)],
-    settings: Annotated[APISettings, Depends(get_settings)],
+    payload: Annotated[dict[str, Any], Depends(get_current_payload)],
 ) -> None:
     """
     Delete an audit and its results.
 
     This action is irreversible.
     """
-    payload = verify_token(token, settings)
     user_id = UUID(payload["sub"])
 
     from ...db.repositories import AuditRepository
     from ..deps import get_db_session
 
-    async for session in get_db_session():
+    async with get_db_session() as session:
         repo = AuditRepository(session)
         audit = await repo.get_by_id(audit_id)
 
@@ -316,17 +321,11 @@ async def delete_audit(
         await repo.delete(audit_id)
         return
 
-    raise HTTPException(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        detail="Database session unavailable",
-    )
-
 
 @router.get("/{audit_id}/report")
 async def get_audit_report(
     audit_id: UUID,
-    token: Annotated[str, Depends(oauth2_scheme)],
-    settings: Annotated[APISettings, Depends(get_settings)],
+    payload: Annotated[dict[str, Any], Depends(get_current_payload)],
     format: str = Query(default="html", pattern="^(html|md|json)$"),
 ) -> dict[str, str]:
     """
@@ -334,13 +333,12 @@ async def get_audit_report(
 
     Only available for completed audits.
     """
-    payload = verify_token(token, settings)
     user_id = UUID(payload["sub"])
 
     from ...db.repositories import AuditRepository
     from ..deps import get_db_session
 
-    async for session in get_db_session():
+    async with get_db_session() as session:
         repo = AuditRepository(session)
         audit = await repo.get_by_id(audit_id)
 
@@ -375,8 +373,3 @@ async def get_audit_report(
             "content": report.content,
             "generated_at": report.generated_at.isoformat(),
         }
-
-    raise HTTPException(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        detail="Database session unavailable",
-    )
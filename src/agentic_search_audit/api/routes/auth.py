@@ -1,9 +1,25 @@
 """Authentication endpoints."""
 
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Annotated, Any
 from uuid import UUID
 
+import bcrypt
+import jwt
+import orjson
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 
@@ -13,6 +29,7 @@ from ..schemas import (
     APIKeyListItem,
     APIKeyResponse,
     TokenResponse,
+    UserBulkCreate,
     UserCreate,
     UserLogin,
     UserResponse,
@@ -23,40 +40,219 @@ router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 
 
+class _ORJSONJWT(jwt.PyJWT):
+    """PyJWT with orjson claim (de)serialization, via its documented override hooks."""
+
+    def _encode_payload(
+        self,
+        payload: dict[str, Any],
+        headers: dict[str, Any] | None = None,
+        json_encoder: type[json.JSONEncoder] | None = None,
+    ) -> bytes:
+        if json_encoder is not None:
+            return super()._encode_payload(payload, headers, json_encoder)
+        return orjson.dumps(payload)
+
+    def _decode_payload(self, decoded: dict[str, Any]) -> dict[str, Any]:
+        try:
+            payload = orjson.loads(decoded["payload"])
+        except orjson.JSONDecodeError as e:
+            raise jwt.DecodeError(f"Invalid payload string: {e}") from e
+        if not isinstance(payload, dict):
+            raise jwt.DecodeError("Invalid payload string: must be a json object")
+        return payload
+
+
+_jwt = _ORJSONJWT()
+
+# Verified token payloads are reused until the token expires, capped at this TTL
+_PAYLOAD_CACHE_TTL_SECONDS = 300.0
+_PAYLOAD_CACHE_MAX_SIZE = 10_000
+
+
+class _TokenPayloadCache:
+    """
+    Bounded TTL cache of decoded JWT payloads.
+
+    Entries are keyed by a digest of the token together with the signing
+    settings, so a cached payload is never served for a different secret.
+    Only successfully verified tokens are stored.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = _PAYLOAD_CACHE_MAX_SIZE,
+        ttl: float = _PAYLOAD_CACHE_TTL_SECONDS,
+    ) -> None:
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._entries: OrderedDict[bytes, tuple[dict[str, Any], float]] = OrderedDict()
+
+    @staticmethod
+    def _key(token: str, settings: APISettings) -> bytes:
+        material = f"{settings.jwt_algorithm}\0{settings.secret_key}\0{token}"
+        return hashlib.blake2b(material.encode(), digest_size=16).digest()
+
+    def get(self, token: str, settings: APISettings) -> dict[str, Any] | None:
+        """Return the cached payload for a token, if still fresh."""
+        key = self._key(token, settings)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        payload, expires_at = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return payload
+
+    def set(self, token: str, settings: APISettings, payload: dict[str, Any]) -> None:
+        """Cache a payload until its ``exp``, evicting the oldest entry if full."""
+        expires_at = time.time() + self._ttl
+        exp = payload.get("exp")
+        if isinstance(exp, int | float):
+            expires_at = min(expires_at, exp)
+
+        key = self._key(token, settings)
+        self._entries[key] = (payload, expires_at)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_token_payload_cache = _TokenPayloadCache()
+
+# New password hashes use Argon2id; bcrypt hashes from before the switch
+# are still accepted
+_ARGON2_PREFIX = b"$argon2"
+
+# Password hashing runs off the event loop; both argon2-cffi and bcrypt
+# release the GIL, so hashes on this pool run in parallel
+_password_hash_pool = ThreadPoolExecutor(
+    max_workers=os.cpu_count() or 1, thread_name_prefix="password-hash"
+)
+
+
+@lru_cache
+def _get_password_hasher() -> PasswordHasher:
+    """Argon2id hasher configured from settings."""
+    settings = get_settings()
+    return PasswordHasher(
+        time_cost=settings.password_hash_time_cost,
+        memory_cost=settings.password_hash_memory_kib,
+        parallelism=1,
+    )
+
+
+# Rejected passwords are remembered briefly so floods of the same wrong
+# password against one account do not each pay for a full hash check
+_FAILED_PASSWORD_TTL_SECONDS = 2.0
+_FAILED_PASSWORD_MAX_SIZE = 1024
+
+
+class _FailedPasswordCache:
+    """
+    Bounded, short-lived set of password/hash pairs that failed verification.
+
+    Only failures are recorded, so a correct password is always checked
+    against the real hash. Entries are keyed by the stored hash rather than the email,
+    so changing a password naturally invalidates them.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = _FAILED_PASSWORD_MAX_SIZE,
+        ttl: float = _FAILED_PASSWORD_TTL_SECONDS,
+    ) -> None:
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._entries: OrderedDict[bytes, float] = OrderedDict()
+        # Verification runs on the password hash pool, not the event loop
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(password: bytes, hashed: bytes) -> bytes:
+        return hashlib.blake2b(hashed + b"\0" + password, digest_size=16).digest()
+
+    def __contains__(self, item: tuple[bytes, bytes]) -> bool:
+        key = self._key(*item)
+        with self._lock:
+            expires_at = self._entries.get(key)
+            if expires_at is None:
+                return False
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return False
+            return True
+
+    def add(self, password: bytes, hashed: bytes) -> None:
+        """Record a failed verification, evicting the oldest entry if full."""
+        key = self._key(password, hashed)
+        with self._lock:
+            self._entries[key] = time.monotonic() + self._ttl
+            self._entries.move_to_end(key)
+            if len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_failed_password_cache = _FailedPasswordCache()
+
+
 def create_access_token(
     user_id: UUID,
     settings: APISettings,
     expires_delta: timedelta | None = None,
 ) -> str:
     """Create a JWT access token."""
-    import jwt
-
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(hours=settings.jwt_expiration_hours)
+    now = datetime.utcnow()
+    if expires_delta is None:
+        expires_delta = timedelta(seconds=settings.jwt_expiration_seconds)
 
     payload = {
         "sub": str(user_id),
-        "exp": expire,
-        "iat": datetime.utcnow(),
+        "exp": now + expires_delta,
+        "iat": now,
         "type": "access",
     }
 
-    token: str = jwt.encode(payload, settings.secret_key, algorithm=settings.jwt_algorithm)
+    token: str = _jwt.encode(payload, settings.secret_key, algorithm=settings.jwt_algorithm)
     return token
 
 
 def verify_token(token: str, settings: APISettings) -> dict[str, Any]:
-    """Verify and decode a JWT token."""
-    import jwt
+    """Verify and decode a JWT token.
+
+    Verified payloads are cached, so a token reused across requests is only
+    decoded once per cache TTL.
+    """
+    cached = _token_payload_cache.get(token, settings)
+    if cached is not None:
+        return cached
 
     try:
-        payload: dict[str, Any] = jwt.decode(
+        payload: dict[str, Any] = _jwt.decode(
             token,
             settings.secret_key,
             algorithms=[settings.jwt_algorithm],
         )
+        _token_payload_cache.set(token, settings, payload)
         return payload
     except jwt.ExpiredSignatureError:
         raise HTTPException(
@@ -72,26 +268,77 @@ def verify_token(token: str, settings: APISettings) -> dict[str, Any]:
         )
 
 
-def hash_password(password: str) -> str:
-    """Hash a password using bcrypt."""
-    import bcrypt
+async def get_current_payload(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    settings: Annotated[APISettings, Depends(get_settings)],
+) -> dict[str, Any]:
+    """Decode the bearer token for the current request.
+
+    FastAPI caches dependency results per request, so every dependant
+    (including ``get_current_user``) shares a single JWT verification.
+    """
+    return verify_token(token, settings)
+
 
-    hashed: str = bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+def hash_password(password: str) -> str:
+    """Hash a password using Argon2id."""
+    hashed: str = _get_password_hasher().hash(password)
     return hashed
 
 
-def verify_password(password: str, hashed: str) -> bool:
-    """Verify a password against its hash."""
-    import bcrypt
+def verify_password(password: str, hashed: str | bytes) -> bool:
+    """Verify a password against its Argon2 or legacy bcrypt hash.
 
-    result: bool = bcrypt.checkpw(password.encode(), hashed.encode())
+    Repeats of a recently rejected password are refused without hashing
+    them again.
+    """
+    password_bytes = password.encode()
+    hashed_bytes = hashed if isinstance(hashed, bytes) else hashed.encode()
+
+    if (password_bytes, hashed_bytes) in _failed_password_cache:
+        return False
+
+    result: bool
+    if hashed_bytes.startswith(_ARGON2_PREFIX):
+        try:
+            result = _get_password_hasher().verify(hashed_bytes, password_bytes)
+        except (VerificationError, InvalidHashError):
+            result = False
+    else:
+        result = bcrypt.checkpw(password_bytes, hashed_bytes)
+    if not result:
+        _failed_password_cache.add(password_bytes, hashed_bytes)
     return result
 
 
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the password hash pool without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_hash_pool, hash_password, password)
+
+
+async def verify_password_async(password: str, hashed: str | bytes) -> bool:
+    """Verify a password on the password hash pool without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_hash_pool, verify_password, password, hashed)
+
+
+def hash_api_key(key: str) -> str:
+    """Hash an API key using SHA-256.
+
+    API keys are high-entropy random tokens, so a fast digest is sufficient;
+    the slow password hash is reserved for user-chosen passwords.
+    """
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def verify_api_key(key: str, hashed: str) -> bool:
+    """Verify an API key against its hash in constant time."""
+    return hmac.compare_digest(hash_api_key(key), hashed)
+
+
 def generate_api_key() -> tuple[str, str]:
     """Generate an API key and its prefix."""
-    import secrets
-
     key = secrets.token_urlsafe(32)
     prefix = key[:8]
     return key, prefix
@@ -110,7 +357,7 @@ async def register(
     from ...db.repositories import UserRepository  # type: ignore[import-untyped]
     from ..deps import get_db_session
 
-    async for session in get_db_session():
+    async with get_db_session() as session:
         repo = UserRepository(session)
 
         # Check if user exists
@@ -122,7 +369,7 @@ async def register(
             )
 
         # Create user
-        password_hash = hash_password(user_data.password)
+        password_hash = await hash_password_async(user_data.password)
         user = await repo.create(
             email=user_data.email,
             name=user_data.name,
@@ -130,19 +377,83 @@ async def register(
         )
 
         return UserResponse(
-            id=UUID(str(user.id)),
+            id=user.id,
             email=user.email,
             name=user.name,
             is_active=user.is_active,
             is_admin=user.is_admin,
             created_at=user.created_at,
-            organization_id=UUID(str(user.organization_id)) if user.organization_id else None,
+            organization_id=user.organization_id,
         )
 
-    raise HTTPException(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        detail="Database session unavailable",
-    )
+
+@router.post(
+    "/register/bulk", response_model=list[UserResponse], status_code=status.HTTP_201_CREATED
+)
+async def bulk_register(
+    bulk_data: UserBulkCreate,
+    payload: Annotated[dict[str, Any], Depends(get_current_payload)],
+) -> list[UserResponse]:
+    """
+    Register several user accounts at once.
+
+    Admin only. Passwords are hashed concurrently on the password hash pool
+    and all users are inserted in a single flush; nothing is created if any
+    email is already taken.
+    """
+    emails = [user_data.email for user_data in bulk_data.users]
+    if len(set(emails)) != len(emails):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Duplicate emails in request",
+        )
+
+    from ...db.repositories import UserRepository
+    from ..deps import get_db_session
+
+    async with get_db_session() as session:
+        repo = UserRepository(session)
+
+        admin = await repo.get_by_id(UUID(payload["sub"]))
+        if not admin or not admin.is_admin:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Admin privileges required",
+            )
+
+        existing = await repo.get_existing_emails(emails)
+        if existing:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Users with these emails already exist: {', '.join(sorted(existing))}",
+            )
+
+        password_hashes = await asyncio.gather(
+            *(hash_password_async(user_data.password) for user_data in bulk_data.users)
+        )
+        users = await repo.create_many(
+            [
+                {
+                    "email": user_data.email,
+                    "name": user_data.name,
+                    "password_hash": password_hash,
+                }
+                for user_data, password_hash in zip(bulk_data.users, password_hashes, strict=True)
+            ]
+        )
+
+        return [
+            UserResponse(
+                id=user.id,
+                email=user.email,
+                name=user.name,
+                is_active=user.is_active,
+                is_admin=user.is_admin,
+                created_at=user.created_at,
+                organization_id=user.organization_id,
+            )
+            for user in users
+        ]
 
 
 @router.post("/token", response_model=TokenResponse)
@@ -158,11 +469,11 @@ async def login(
     from ...db.repositories import UserRepository
     from ..deps import get_db_session
 
-    async for session in get_db_session():
+    async with get_db_session() as session:
         repo = UserRepository(session)
         user = await repo.get_by_email(form_data.username)
 
-        if not user or not verify_password(form_data.password, user.password_hash):
+        if not user or not await verify_password_async(form_data.password, user.password_hash):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid email or password",
@@ -175,19 +486,14 @@ async def login(
                 detail="User account is disabled",
             )
 
-        access_token = create_access_token(UUID(str(user.id)), settings)
+        access_token = create_access_token(user.id, settings)
 
         return TokenResponse(
             access_token=access_token,
             token_type="bearer",
-            expires_in=settings.jwt_expiration_hours * 3600,
+            expires_in=settings.jwt_expiration_seconds,
         )
 
-    raise HTTPException(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        detail="Database session unavailable",
-    )
-
 
 @router.post("/login", response_model=TokenResponse)
 async def login_json(
@@ -202,11 +508,11 @@ async def login_json(
     from ...db.repositories import UserRepository
     from ..deps import get_db_session
 
-    async for session in get_db_session():
+    async with get_db_session() as session:
         repo = UserRepository(session)
         user = await repo.get_by_email(credentials.email)
 
-        if not user or not verify_password(credentials.password, user.password_hash):
+        if not user or not await verify_password_async(credentials.password, user.password_hash):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid email or password",
@@ -218,41 +524,34 @@ async def login_json(
                 detail="User account is disabled",
             )
 
-        access_token = create_access_token(UUID(str(user.id)), settings)
+        access_token = create_access_token(user.id, settings)
 
         return TokenResponse(
             access_token=access_token,
             token_type="bearer",
-            expires_in=settings.jwt_expiration_hours * 3600,
+            expires_in=settings.jwt_expiration_seconds,
         )
 
-    raise HTTPException(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        detail="Database session unavailable",
-    )
-
 
 @router.post("/api-keys", response_model=APIKeyResponse, status_code=status.HTTP_201_CREATED)
 async def create_api_key(
     key_data: APIKeyCreate,
-    token: Annotated[str, Depends(oauth2_scheme)],
-    settings: Annotated[APISettings, Depends(get_settings)],
+    payload: Annotated[dict[str, Any], Depends(get_current_payload)],
 ) -> APIKeyResponse:
     """
     Create a new API key for the authenticated user.
 
     The full key is only returned once upon creation.
     """
-    payload = verify_token(token, settings)
     user_id = UUID(payload["sub"])
 
     from ...db.repositories import APIKeyRepository
     from ..deps import get_db_session
 
     key, prefix = generate_api_key()
-    key_hash = hash_password(key)
+    key_hash = hash_api_key(key)
 
-    async for session in get_db_session():
+    async with get_db_session() as session:
         repo = APIKeyRepository(session)
         api_key = await repo.create(
             user_id=user_id,
@@ -263,7 +562,7 @@ async def create_api_key(
         )
 
         return APIKeyResponse(
-            id=UUID(str(api_key.id)),
+            id=api_key.id,
             name=api_key.name,
             key=key,  # Only returned once
             prefix=prefix,
@@ -271,33 +570,26 @@ async def create_api_key(
             expires_at=api_key.expires_at,
         )
 
-    raise HTTPException(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        detail="Database session unavailable",
-    )
-
 
 @router.get("/api-keys", response_model=list[APIKeyListItem])
 async def list_api_keys(
-    token: Annotated[str, Depends(oauth2_scheme)],
-    settings: Annotated[APISettings, Depends(get_settings)],
+    payload: Annotated[dict[str, Any], Depends(get_current_payload)],
 ) -> list[APIKeyListItem]:
     """
     List all API keys for the authenticated user.
     """
-    payload = verify_token(token, settings)
     user_id = UUID(payload["sub"])
 
     from ...db.repositories import APIKeyRepository
     from ..deps import get_db_session
 
-    async for session in get_db_session():
+    async with get_db_session() as session:
         repo = APIKeyRepository(session)
         keys = await repo.list_by_user(user_id)
 
         return [
             APIKeyListItem(
-                id=UUID(str(k.id)),
+                id=k.id,
                 name=k.name,
                 prefix=k.prefix,
                 created_at=k.created_at,
@@ -307,28 +599,21 @@ async def list_api_keys(
             for k in keys
         ]
 
-    raise HTTPException(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        detail="Database session unavailable",
-    )
-
 
 @router.delete("/api-keys/{key_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_api_key(
     key_id: UUID,
-    token: Annotated[str, Depends(oauth2_scheme)],
-    settings: Annotated[APISettings, Depends(get_settings)],
+    payload: Annotated[dict[str, Any], Depends(get_current_payload)],
 ) -> None:
     """
     Delete an API key.
     """
-    payload = verify_token(token, settings)
     user_id = UUID(payload["sub"])
 
     from ...db.repositories import APIKeyRepository
     from ..deps import get_db_session
 
-    async for session in get_db_session():
+    async with get_db_session() as session:
         repo = APIKeyRepository(session)
         deleted = await repo.delete(key_id, user_id)
 
@@ -1,16 +1,19 @@
 """Billing and subscription endpoints."""
 
+import hashlib
+import hmac
 import logging
 import os
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
 from typing import Annotated, Any
 from uuid import UUID
 
+import aiohttp
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, Request, status
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
-from ..config import APISettings, get_settings
-from ..routes.auth import oauth2_scheme
 from ..routes.users import get_current_user
 
 logger = logging.getLogger(__name__)
@@ -24,13 +27,15 @@ router = APIRouter()
 class PlanInfo(BaseModel):
     """Subscription plan information."""
 
+    model_config = ConfigDict(frozen=True)
+
     id: str
     name: str
     price_monthly_usd: float
     audits_per_month: int
     queries_per_audit: int
     concurrent_audits: int
-    features: list[str]
+    features: tuple[str, ...]
 
 
 class SubscriptionStatus(BaseModel):
@@ -73,7 +78,7 @@ PLANS = {
         audits_per_month=5,
         queries_per_audit=10,
         concurrent_audits=1,
-        features=["Basic reports", "Email support"],
+        features=("Basic reports", "Email support"),
     ),
     "starter": PlanInfo(
         id="starter",
@@ -82,12 +87,12 @@ PLANS = {
         audits_per_month=50,
         queries_per_audit=50,
         concurrent_audits=2,
-        features=[
+        features=(
             "All Free features",
             "Priority support",
             "API access",
             "Webhook notifications",
-        ],
+        ),
     ),
     "professional": PlanInfo(
         id="professional",
@@ -96,13 +101,13 @@ PLANS = {
         audits_per_month=200,
         queries_per_audit=100,
         concurrent_audits=5,
-        features=[
+        features=(
             "All Starter features",
             "Advanced analytics",
             "Custom branding",
             "Team management",
             "Dedicated support",
-        ],
+        ),
     ),
     "enterprise": PlanInfo(
         id="enterprise",
@@ -111,17 +116,203 @@ PLANS = {
         audits_per_month=-1,  # Unlimited
         queries_per_audit=100,
         concurrent_audits=20,
-        features=[
+        features=(
             "All Professional features",
             "Unlimited audits",
             "SLA guarantee",
             "Custom integrations",
             "Dedicated account manager",
             "On-premise option",
-        ],
+        ),
     ),
 }
 
+# Plans never change at runtime (PlanInfo is frozen), so the listing and Stripe
+# price lookups are built once and share the same instances. Price IDs are
+# deploy-time configuration read at import.
+_PLANS_LIST: tuple[PlanInfo, ...] = tuple(PLANS.values())
+
+_PLAN_ID_TO_PRICE_ID: dict[str, str] = {
+    "starter": os.getenv("STRIPE_PRICE_STARTER", "price_starter"),
+    "professional": os.getenv("STRIPE_PRICE_PROFESSIONAL", "price_professional"),
+    "enterprise": os.getenv("STRIPE_PRICE_ENTERPRISE", "price_enterprise"),
+}
+
+_PRICE_ID_TO_PLAN: dict[str, PlanInfo] = {
+    price_id: PLANS[plan_id] for plan_id, price_id in _PLAN_ID_TO_PRICE_ID.items()
+}
+
+
+# Stripe subscription state per customer, refreshed at most every TTL seconds
+# and dropped when a subscription webhook arrives for the customer
+_SUBSCRIPTION_CACHE_TTL_SECONDS = 30.0
+_SUBSCRIPTION_CACHE_MAX_SIZE = 10_000
+_subscription_cache: dict[str, tuple[float, SubscriptionStatus]] = {}
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _from_stripe_timestamp(timestamp: int) -> datetime:
+    """Convert a Stripe epoch timestamp to a naive UTC datetime."""
+    return _EPOCH + timedelta(seconds=timestamp)
+
+
+def _subscription_period(subscription: dict[str, Any]) -> tuple[datetime, datetime]:
+    """Return a subscription's current billing period.
+
+    Stripe API versions from 2025-03-31 report the period on each
+    subscription item instead of on the subscription itself.
+    """
+    source = subscription
+    if "current_period_start" not in source:
+        source = subscription["items"]["data"][0]
+    return (
+        _from_stripe_timestamp(source["current_period_start"]),
+        _from_stripe_timestamp(source["current_period_end"]),
+    )
+
+
+def _get_cached_subscription(customer_id: str) -> SubscriptionStatus | None:
+    """Return a fresh cached subscription status for a customer, if any."""
+    entry = _subscription_cache.get(customer_id)
+    if entry is None:
+        return None
+    expires_at, subscription = entry
+    if expires_at <= time.monotonic():
+        _subscription_cache.pop(customer_id, None)
+        return None
+    return subscription
+
+
+def _cache_subscription(customer_id: str, subscription: SubscriptionStatus) -> None:
+    """Cache a customer's subscription status, evicting the oldest entry if full."""
+    _subscription_cache.pop(customer_id, None)
+    _subscription_cache[customer_id] = (
+        time.monotonic() + _SUBSCRIPTION_CACHE_TTL_SECONDS,
+        subscription,
+    )
+    if len(_subscription_cache) > _SUBSCRIPTION_CACHE_MAX_SIZE:
+        _subscription_cache.pop(next(iter(_subscription_cache)))
+
+
+# Maximum age of a webhook signature timestamp, matching the Stripe SDK default
+_STRIPE_SIGNATURE_TOLERANCE_SECONDS = 300
+
+
+class _StripeSignatureError(Exception):
+    """Raised when a Stripe webhook signature cannot be verified."""
+
+
+def _verify_stripe_signature(payload: bytes, header: str | None, secret: str) -> dict[str, Any]:
+    """
+    Verify a Stripe webhook signature and decode the event.
+
+    Implements Stripe's v1 scheme (HMAC-SHA256 over ``"{t}.{payload}"``) with
+    the standard library, so no Stripe SDK call is needed per webhook.
+
+    Raises:
+        _StripeSignatureError: If the header is missing, malformed, stale or does not match
+        ValueError: If the payload is not valid JSON
+    """
+    if not header:
+        raise _StripeSignatureError("Missing signature header")
+
+    timestamp = None
+    signatures = []
+    for item in header.split(","):
+        key, _, value = item.strip().partition("=")
+        if key == "t":
+            timestamp = value
+        elif key == "v1":
+            signatures.append(value)
+
+    if timestamp is None or not (timestamp.isascii() and timestamp.isdigit()) or not signatures:
+        raise _StripeSignatureError("Malformed signature header")
+
+    expected = hmac.new(
+        secret.encode(), timestamp.encode() + b"." + payload, hashlib.sha256
+    ).hexdigest()
+    # Compare bytes: compare_digest rejects str arguments with non-ASCII characters
+    expected_bytes = expected.encode()
+    if not any(hmac.compare_digest(expected_bytes, signature.encode()) for signature in signatures):
+        raise _StripeSignatureError("Signature mismatch")
+
+    if int(timestamp) < time.time() - _STRIPE_SIGNATURE_TOLERANCE_SECONDS:
+        raise _StripeSignatureError("Timestamp outside the tolerance zone")
+
+    event: dict[str, Any] = orjson.loads(payload)
+    return event
+
+
+_STRIPE_API_BASE = "https://api.stripe.com"
+_STRIPE_HTTP_TIMEOUT_SECONDS = 5.0
+# Raw API calls use the account's default version unless one is pinned
+_STRIPE_API_VERSION = "2024-06-20"
+
+# Shared HTTP session for read-only Stripe API calls, created on first use
+_stripe_http: aiohttp.ClientSession | None = None
+
+
+def _get_stripe_http() -> aiohttp.ClientSession:
+    """Get the shared Stripe HTTP session."""
+    global _stripe_http
+
+    if _stripe_http is None or _stripe_http.closed:
+        _stripe_http = aiohttp.ClientSession(
+            base_url=_STRIPE_API_BASE,
+            timeout=aiohttp.ClientTimeout(total=_STRIPE_HTTP_TIMEOUT_SECONDS),
+        )
+    return _stripe_http
+
+
+async def close_stripe_http() -> None:
+    """Close the shared Stripe HTTP session."""
+    global _stripe_http
+
+    if _stripe_http is not None:
+        await _stripe_http.close()
+        _stripe_http = None
+
+
+async def _list_active_subscriptions(customer_id: str) -> list[dict[str, Any]]:
+    """Fetch a customer's active subscription from the Stripe REST API.
+
+    The Stripe SDK is synchronous and wraps every response in StripeObjects,
+    while the subscription endpoint only needs a few scalar fields.
+    """
+    secret_key = os.getenv("STRIPE_SECRET_KEY")
+    if not secret_key:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Billing service not configured",
+        )
+
+    try:
+        async with _get_stripe_http().get(
+            "/v1/subscriptions",
+            params={"customer": customer_id, "status": "active", "limit": "1"},
+            auth=aiohttp.BasicAuth(secret_key, ""),
+            headers={"Stripe-Version": _STRIPE_API_VERSION},
+        ) as response:
+            body = await response.read()
+            response_status = response.status
+    except (aiohttp.ClientError, TimeoutError) as e:
+        logger.error(f"Stripe subscription lookup failed: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="Billing provider unavailable",
+        ) from e
+
+    if response_status != 200:
+        logger.error(f"Stripe subscription lookup returned HTTP {response_status}")
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="Billing provider unavailable",
+        )
+
+    subscriptions: list[dict[str, Any]] = orjson.loads(body)["data"]
+    return subscriptions
+
 
 def get_stripe() -> Any:
     """Get Stripe client."""
@@ -136,28 +327,37 @@ def get_stripe() -> Any:
     return stripe
 
 
+def _free_subscription() -> SubscriptionStatus:
+    """Build the placeholder status for customers without a paid subscription."""
+    now = datetime.utcnow()
+    return SubscriptionStatus(
+        plan=PLANS["free"],
+        status="active",
+        current_period_start=now,
+        current_period_end=now,
+        cancel_at_period_end=False,
+    )
+
+
 @router.get("/plans", response_model=list[PlanInfo])
-async def list_plans() -> list[PlanInfo]:
+async def list_plans() -> tuple[PlanInfo, ...]:
     """
     List available subscription plans.
     """
-    return list(PLANS.values())
+    return _PLANS_LIST
 
 
 @router.get("/subscription", response_model=SubscriptionStatus)
 async def get_subscription(
-    token: Annotated[str, Depends(oauth2_scheme)],
-    settings: Annotated[APISettings, Depends(get_settings)],
+    user: Annotated[Any, Depends(get_current_user)],
 ) -> SubscriptionStatus:
     """
     Get current subscription status.
     """
-    user = await get_current_user(token, settings)
-
     from ...db.repositories import UserRepository  # type: ignore[import-untyped]
     from ..deps import get_db_session
 
-    async for session in get_db_session():
+    async with get_db_session() as session:
         repo = UserRepository(session)
 
         # Get user's Stripe customer ID
@@ -166,57 +366,41 @@ async def get_subscription(
 
         if not stripe_customer_id:
             # Return free plan for users without subscription
-            return SubscriptionStatus(
-                plan=PLANS["free"],
-                status="active",
-                current_period_start=datetime.utcnow(),
-                current_period_end=datetime.utcnow(),
-                cancel_at_period_end=False,
-            )
+            return _free_subscription()
 
-        stripe = get_stripe()
+        cached = _get_cached_subscription(stripe_customer_id)
+        if cached is not None:
+            return cached
 
         # Get active subscription
-        subscriptions = stripe.Subscription.list(
-            customer=stripe_customer_id,
-            status="active",
-            limit=1,
-        )
-
-        if not subscriptions.data:
-            return SubscriptionStatus(
-                plan=PLANS["free"],
-                status="active",
-                current_period_start=datetime.utcnow(),
-                current_period_end=datetime.utcnow(),
-                cancel_at_period_end=False,
+        subscriptions = await _list_active_subscriptions(stripe_customer_id)
+
+        if not subscriptions:
+            result = _free_subscription()
+        else:
+            subscription = subscriptions[0]
+
+            # Map Stripe price to plan
+            price_id = subscription["items"]["data"][0]["price"]["id"]
+            plan = _get_plan_by_price_id(price_id)
+
+            period_start, period_end = _subscription_period(subscription)
+            result = SubscriptionStatus(
+                plan=plan,
+                status=subscription["status"],
+                current_period_start=period_start,
+                current_period_end=period_end,
+                cancel_at_period_end=subscription["cancel_at_period_end"],
             )
 
-        subscription = subscriptions.data[0]
-
-        # Map Stripe price to plan
-        price_id = subscription["items"]["data"][0]["price"]["id"]
-        plan = _get_plan_by_price_id(price_id)
-
-        return SubscriptionStatus(
-            plan=plan,
-            status=subscription["status"],
-            current_period_start=datetime.fromtimestamp(subscription["current_period_start"]),
-            current_period_end=datetime.fromtimestamp(subscription["current_period_end"]),
-            cancel_at_period_end=subscription["cancel_at_period_end"],
-        )
-
-    raise HTTPException(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        detail="Database session unavailable",
-    )
+        _cache_subscription(stripe_customer_id, result)
+        return result
 
 
 @router.post("/checkout", response_model=CheckoutSessionResponse)
 async def create_checkout_session(
     request: CheckoutSessionRequest,
-    token: Annotated[str, Depends(oauth2_scheme)],
-    settings: Annotated[APISettings, Depends(get_settings)],
+    user: Annotated[Any, Depends(get_current_user)],
 ) -> CheckoutSessionResponse:
     """
     Create a Stripe checkout session for subscription.
@@ -233,13 +417,12 @@ async def create_checkout_session(
             detail="Cannot checkout for free plan",
         )
 
-    user = await get_current_user(token, settings)
     stripe = get_stripe()
 
     from ...db.repositories import UserRepository
     from ..deps import get_db_session
 
-    async for session in get_db_session():
+    async with get_db_session() as session:
         repo = UserRepository(session)
         user_data = await repo.get_by_id(user.id)
 
@@ -279,28 +462,21 @@ async def create_checkout_session(
             session_id=checkout_session.id,
         )
 
-    raise HTTPException(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        detail="Database session unavailable",
-    )
-
 
 @router.post("/portal", response_model=PortalSessionResponse)
 async def create_portal_session(
-    token: Annotated[str, Depends(oauth2_scheme)],
-    settings: Annotated[APISettings, Depends(get_settings)],
+    user: Annotated[Any, Depends(get_current_user)],
     return_url: str,
 ) -> PortalSessionResponse:
     """
     Create a Stripe customer portal session for managing subscription.
     """
-    user = await get_current_user(token, settings)
     stripe = get_stripe()
 
     from ...db.repositories import UserRepository
     from ..deps import get_db_session
 
-    async for session in get_db_session():
+    async with get_db_session() as session:
         repo = UserRepository(session)
         user_data = await repo.get_by_id(user.id)
 
@@ -324,18 +500,12 @@ async def create_portal_session(
 
         return PortalSessionResponse(portal_url=portal_session.url)
 
-    raise HTTPException(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        detail="Database session unavailable",
-    )
-
 
 @router.post("/webhook")
 async def stripe_webhook(request: Request) -> dict[str, str]:
     """
     Handle Stripe webhook events.
     """
-    stripe = get_stripe()
     webhook_secret = os.getenv("STRIPE_WEBHOOK_SECRET")
 
     if not webhook_secret:
@@ -348,11 +518,11 @@ async def stripe_webhook(request: Request) -> dict[str, str]:
     sig_header = request.headers.get("stripe-signature")
 
     try:
-        event = stripe.Webhook.construct_event(payload, sig_header, webhook_secret)
+        event = _verify_stripe_signature(payload, sig_header, webhook_secret)
+    except _StripeSignatureError:
+        raise HTTPException(status_code=400, detail="Invalid signature")
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid payload")
-    except stripe.error.SignatureVerificationError:  # type: ignore[attr-defined]
-        raise HTTPException(status_code=400, detail="Invalid signature")
 
     # Handle events
     if event["type"] == "checkout.session.completed":
@@ -369,6 +539,10 @@ async def stripe_webhook(request: Request) -> dict[str, str]:
 
 async def _handle_checkout_completed(session: dict) -> None:
     """Handle successful checkout."""
+    customer_id = session.get("customer")
+    if customer_id:
+        _subscription_cache.pop(customer_id, None)
+
     user_id = session.get("metadata", {}).get("user_id")
     plan_id = session.get("metadata", {}).get("plan_id")
 
@@ -382,7 +556,7 @@ async def _handle_checkout_completed(session: dict) -> None:
     from ...db.repositories import UserRepository
     from ..deps import get_db_session
 
-    async for db_session in get_db_session():
+    async with get_db_session() as db_session:
         repo = UserRepository(db_session)
         await repo.update(UUID(user_id), plan_id=plan_id)
 
@@ -393,6 +567,7 @@ async def _handle_subscription_updated(subscription: dict) -> None:
     status = subscription["status"]
 
     logger.info(f"Subscription updated for customer {customer_id}: {status}")
+    _subscription_cache.pop(customer_id, None)
 
 
 async def _handle_subscription_deleted(subscription: dict) -> None:
@@ -400,6 +575,7 @@ async def _handle_subscription_deleted(subscription: dict) -> None:
     customer_id = subscription["customer"]
 
     logger.info(f"Subscription deleted for customer {customer_id}")
+    _subscription_cache.pop(customer_id, None)
 
     # Downgrade to free plan
     # Note: This would need a method to find user by stripe customer ID
@@ -417,22 +593,9 @@ async def _handle_payment_failed(invoice: dict) -> None:
 
 def _get_price_id_for_plan(plan_id: str) -> str:
     """Get Stripe price ID for a plan."""
-    # In production, these would be actual Stripe price IDs
-    price_mapping = {
-        "starter": os.getenv("STRIPE_PRICE_STARTER", "price_starter"),
-        "professional": os.getenv("STRIPE_PRICE_PROFESSIONAL", "price_professional"),
-        "enterprise": os.getenv("STRIPE_PRICE_ENTERPRISE", "price_enterprise"),
-    }
-    return price_mapping.get(plan_id, "")
+    return _PLAN_ID_TO_PRICE_ID.get(plan_id, "")
 
 
 def _get_plan_by_price_id(price_id: str) -> PlanInfo:
     """Get plan info by Stripe price ID."""
-    # In production, this would map actual Stripe price IDs to plans
-    price_to_plan = {
-        os.getenv("STRIPE_PRICE_STARTER", "price_starter"): "starter",
-        os.getenv("STRIPE_PRICE_PROFESSIONAL", "price_professional"): "professional",
-        os.getenv("STRIPE_PRICE_ENTERPRISE", "price_enterprise"): "enterprise",
-    }
-    plan_id = price_to_plan.get(price_id, "free")
-    return PLANS.get(plan_id, PLANS["free"])
+    return _PRICE_ID_TO_PLAN.get(price_id, PLANS["free"])
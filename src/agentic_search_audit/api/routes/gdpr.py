@@ -1,26 +1,30 @@
 """GDPR compliance endpoints for data export and deletion."""
 
-import json
 import logging
-from datetime import datetime
-from io import BytesIO
+from collections.abc import AsyncIterator
+from datetime import datetime, timedelta, timezone
 from typing import Annotated, Any
 from uuid import UUID
-from zipfile import ZipFile
+from zipfile import ZIP_STORED, ZipFile
 
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
-from ..config import APISettings, get_settings
-from ..routes.auth import oauth2_scheme, verify_password
-from ..routes.users import get_current_user
+from ..routes.auth import verify_password_async
+from ..routes.users import get_current_user, invalidate_cached_user
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
+def _export_json(obj: Any) -> bytes:
+    """Serialize export data as indented JSON; UUIDs and datetimes are native."""
+    return orjson.dumps(obj, default=str, option=orjson.OPT_INDENT_2)
+
+
 class DataExportRequest(BaseModel):
     """Request to export user data."""
 
@@ -64,10 +68,109 @@ class ConsentUpdateRequest(BaseModel):
     third_party_sharing: bool | None = None
 
 
+class _ZipStreamBuffer:
+    """Write-only file object that collects ZIP output until it is drained.
+
+    It has no ``tell``/``seek``, so ZipFile writes entries with data
+    descriptors and never needs to revisit bytes already sent.
+    """
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def _stream_export(
+    user_id: UUID,
+    profile: dict[str, Any],
+    include_audits: bool,
+    include_reports: bool,
+    include_artifacts: bool,
+    export_date: datetime,
+) -> AsyncIterator[bytes]:
+    """Yield the export ZIP archive as it is written, one audit at a time."""
+    from ...db.repositories import AuditRepository  # type: ignore[import-untyped]
+    from ..deps import get_db_session
+
+    # Entries are stored uncompressed: DEFLATE would cost far more CPU than
+    # the bytes it saves on exports, and screenshots/snapshots added as
+    # artifacts are already compressed. If JSON compression is ever wanted,
+    # use ZIP_DEFLATED with compresslevel=1 per entry, not archive-wide.
+    buffer = _ZipStreamBuffer()
+    with ZipFile(buffer, "w", compression=ZIP_STORED) as zip_file:
+        zip_file.writestr("profile.json", _export_json(profile))
+        yield buffer.drain()
+
+        if include_audits:
+            async with get_db_session() as session:
+                audit_repo = AuditRepository(session)
+
+                # audits.jsonl holds one compact JSON object per line
+                with zip_file.open("audits.jsonl", "w", force_zip64=True) as entry:
+                    async for audits in audit_repo.iter_batches_by_user(user_id):
+                        results_by_audit = (
+                            await audit_repo.get_results_for_audits([a.id for a in audits])
+                            if include_reports
+                            else {}
+                        )
+
+                        for audit in audits:
+                            audit_export: dict[str, Any] = {
+                                "id": audit.id,
+                                "site_url": audit.site_url,
+                                "queries": audit.queries,
+                                "status": audit.status,
+                                "created_at": audit.created_at,
+                                "completed_at": audit.completed_at,
+                                "average_score": audit.average_score,
+                            }
+
+                            if include_reports:
+                                audit_export["results"] = [
+                                    {
+                                        "query": r.query_text,
+                                        "items": r.items,
+                                        "score": r.score,
+                                    }
+                                    for r in results_by_audit.get(audit.id, [])
+                                ]
+
+                            entry.write(orjson.dumps(audit_export, default=str))
+                            entry.write(b"\n")
+                            if chunk := buffer.drain():
+                                yield chunk
+
+        metadata = {
+            "export_date": export_date,
+            "user_id": user_id,
+            "include_audits": include_audits,
+            "include_reports": include_reports,
+            "include_artifacts": include_artifacts,
+        }
+        zip_file.writestr("metadata.json", _export_json(metadata))
+
+    yield buffer.drain()
+
+    logger.info(f"Data export generated for user {user_id}")
+
+
 @router.get("/export")
 async def export_user_data(
-    token: Annotated[str, Depends(oauth2_scheme)],
-    settings: Annotated[APISettings, Depends(get_settings)],
+    user: Annotated[Any, Depends(get_current_user)],
     include_audits: bool = True,
     include_reports: bool = True,
     include_artifacts: bool = False,
@@ -77,21 +180,15 @@ async def export_user_data(
 
     Returns a ZIP file containing:
     - User profile information (JSON)
-    - Audit history and results (JSON)
+    - Audit history and results (JSON Lines, one audit per line)
     - Generated reports (if requested)
     - Screenshots and HTML snapshots (if requested)
     """
-    user = await get_current_user(token, settings)
-
-    from ...db.repositories import AuditRepository, UserRepository  # type: ignore[import-untyped]
+    from ...db.repositories import UserRepository  # type: ignore[import-untyped]
     from ..deps import get_db_session
 
-    # Collect data
-    export_data: dict[str, Any] = {}
-
-    async for session in get_db_session():
+    async with get_db_session() as session:
         user_repo = UserRepository(session)
-        audit_repo = AuditRepository(session)
 
         # User profile
         user_data = await user_repo.get_by_id(user.id)
@@ -100,80 +197,22 @@ async def export_user_data(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User data not found",
             )
-        export_data["profile"] = {
-            "id": str(user_data.id),
+        profile = {
+            "id": user_data.id,
             "email": user_data.email,
             "name": user_data.name,
-            "created_at": user_data.created_at.isoformat(),
-            "organization_id": (
-                str(user_data.organization_id) if user_data.organization_id else None
-            ),
+            "created_at": user_data.created_at,
+            "organization_id": user_data.organization_id,
         }
 
-        # Audit data
-        if include_audits:
-            audits, _ = await audit_repo.list_by_user(user.id, page=1, page_size=10000)
-            export_data["audits"] = []
-
-            for audit in audits:
-                audit_export: dict[str, Any] = {
-                    "id": str(audit.id),
-                    "site_url": audit.site_url,
-                    "queries": audit.queries,
-                    "status": audit.status,
-                    "created_at": audit.created_at.isoformat(),
-                    "completed_at": audit.completed_at.isoformat() if audit.completed_at else None,
-                    "average_score": audit.average_score,
-                }
-
-                if include_reports:
-                    results = await audit_repo.get_results(UUID(str(audit.id)))
-                    audit_export["results"] = [
-                        {
-                            "query": r.query_text,
-                            "items": r.items,
-                            "score": r.score,
-                        }
-                        for r in results
-                    ]
-
-                export_data["audits"].append(audit_export)
-
-    # Create ZIP file
-    zip_buffer = BytesIO()
-    with ZipFile(zip_buffer, "w") as zip_file:
-        # Add profile
-        zip_file.writestr(
-            "profile.json",
-            json.dumps(export_data["profile"], indent=2),
-        )
-
-        # Add audits
-        if "audits" in export_data:
-            zip_file.writestr(
-                "audits.json",
-                json.dumps(export_data["audits"], indent=2, default=str),
-            )
-
-        # Add metadata
-        metadata = {
-            "export_date": datetime.utcnow().isoformat(),
-            "user_id": str(user.id),
-            "include_audits": include_audits,
-            "include_reports": include_reports,
-            "include_artifacts": include_artifacts,
-        }
-        zip_file.writestr("metadata.json", json.dumps(metadata, indent=2))
-
-    zip_buffer.seek(0)
-
-    logger.info(f"Data export generated for user {user.id}")
-
+    now = datetime.now(timezone.utc)
     return StreamingResponse(
-        zip_buffer,
+        _stream_export(
+            user.id, profile, include_audits, include_reports, include_artifacts, export_date=now
+        ),
         media_type="application/zip",
         headers={
-            "Content-Disposition": f'attachment; filename="data_export_{datetime.utcnow().strftime("%Y%m%d")}.zip"'
+            "Content-Disposition": f'attachment; filename="data_export_{now.strftime("%Y%m%d")}.zip"'
         },
     )
 
@@ -181,8 +220,7 @@ async def export_user_data(
 @router.post("/delete", response_model=DataDeletionResponse)
 async def request_account_deletion(
     request: DataDeletionRequest,
-    token: Annotated[str, Depends(oauth2_scheme)],
-    settings: Annotated[APISettings, Depends(get_settings)],
+    user: Annotated[Any, Depends(get_current_user)],
 ) -> DataDeletionResponse:
     """
     Request account and data deletion (GDPR Article 17 - Right to erasure).
@@ -201,12 +239,10 @@ async def request_account_deletion(
             detail="Deletion must be confirmed",
         )
 
-    user = await get_current_user(token, settings)
-
     from ...db.repositories import UserRepository
     from ..deps import get_db_session
 
-    async for session in get_db_session():
+    async with get_db_session() as session:
         repo = UserRepository(session)
         user_data = await repo.get_by_id(user.id)
 
@@ -217,16 +253,14 @@ async def request_account_deletion(
             )
 
         # Verify password
-        if not verify_password(request.password, user_data.password_hash):
+        if not await verify_password_async(request.password, user_data.password_hash):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid password",
             )
 
         # Schedule deletion (30-day grace period)
-        from datetime import timedelta
-
-        deletion_date = datetime.utcnow() + timedelta(days=30)
+        deletion_date = datetime.now(timezone.utc) + timedelta(days=30)
 
         # Deactivate account and mark for deletion
         await repo.update(
@@ -236,25 +270,22 @@ async def request_account_deletion(
             deletion_reason=request.reason,
         )
 
-        logger.info(f"Account deletion scheduled for user {user.id} at {deletion_date}")
+    # Drop the cached user once the deactivation is committed
+    await invalidate_cached_user(user.id)
 
-        return DataDeletionResponse(
-            status="scheduled",
-            message="Your account has been deactivated and will be permanently deleted in 30 days. Contact support to cancel.",
-            deletion_scheduled_at=deletion_date,
-        )
+    logger.info(f"Account deletion scheduled for user {user.id} at {deletion_date}")
 
-    raise HTTPException(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        detail="Database session unavailable",
+    return DataDeletionResponse(
+        status="scheduled",
+        message="Your account has been deactivated and will be permanently deleted in 30 days. Contact support to cancel.",
+        deletion_scheduled_at=deletion_date,
     )
 
 
 @router.post("/delete/immediate", response_model=DataDeletionResponse)
 async def immediate_account_deletion(
     request: DataDeletionRequest,
-    token: Annotated[str, Depends(oauth2_scheme)],
-    settings: Annotated[APISettings, Depends(get_settings)],
+    user: Annotated[Any, Depends(get_current_user)],
 ) -> DataDeletionResponse:
     """
     Immediately delete account and all data.
@@ -267,12 +298,10 @@ async def immediate_account_deletion(
             detail="Deletion must be confirmed",
         )
 
-    user = await get_current_user(token, settings)
-
     from ...db.repositories import AuditRepository, UserRepository
     from ..deps import get_db_session
 
-    async for session in get_db_session():
+    async with get_db_session() as session:
         user_repo = UserRepository(session)
         audit_repo = AuditRepository(session)
 
@@ -285,16 +314,14 @@ async def immediate_account_deletion(
             )
 
         # Verify password
-        if not verify_password(request.password, user_data.password_hash):
+        if not await verify_password_async(request.password, user_data.password_hash):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid password",
             )
 
-        # Delete all audits and results
-        audits, _ = await audit_repo.list_by_user(user.id, page=1, page_size=10000)
-        for audit in audits:
-            await audit_repo.delete(UUID(str(audit.id)))
+        # Delete all audits, results and reports
+        await audit_repo.delete_by_user(user.id)
 
         # Delete user (cascades to API keys)
         from sqlalchemy import delete
@@ -303,34 +330,28 @@ async def immediate_account_deletion(
 
         await session.execute(delete(User).where(User.id == user.id))
 
-        logger.info(f"Account immediately deleted for user {user.id}")
+    await invalidate_cached_user(user.id)
 
-        return DataDeletionResponse(
-            status="deleted",
-            message="Your account and all associated data have been permanently deleted.",
-            deletion_scheduled_at=None,
-        )
+    logger.info(f"Account immediately deleted for user {user.id}")
 
-    raise HTTPException(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        detail="Database session unavailable",
+    return DataDeletionResponse(
+        status="deleted",
+        message="Your account and all associated data have been permanently deleted.",
+        deletion_scheduled_at=None,
     )
 
 
 @router.get("/consent", response_model=ConsentStatus)
 async def get_consent_status(
-    token: Annotated[str, Depends(oauth2_scheme)],
-    settings: Annotated[APISettings, Depends(get_settings)],
+    user: Annotated[Any, Depends(get_current_user)],
 ) -> ConsentStatus:
     """
     Get current consent preferences (GDPR Article 7 - Conditions for consent).
     """
-    user = await get_current_user(token, settings)
-
     from ...db.repositories import UserRepository
     from ..deps import get_db_session
 
-    async for session in get_db_session():
+    async with get_db_session() as session:
         repo = UserRepository(session)
         user_data = await repo.get_by_id(user.id)
 
@@ -347,29 +368,23 @@ async def get_consent_status(
             updated_at=user_data.consent_updated_at or user_data.created_at,
         )
 
-    raise HTTPException(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        detail="Database session unavailable",
-    )
-
 
 @router.patch("/consent", response_model=ConsentStatus)
 async def update_consent(
     request: ConsentUpdateRequest,
-    token: Annotated[str, Depends(oauth2_scheme)],
-    settings: Annotated[APISettings, Depends(get_settings)],
+    user: Annotated[Any, Depends(get_current_user)],
 ) -> ConsentStatus:
     """
     Update consent preferences.
 
     Users can withdraw consent at any time (GDPR Article 7.3).
     """
-    user = await get_current_user(token, settings)
-
     from ...db.repositories import UserRepository
     from ..deps import get_db_session
 
-    async for session in get_db_session():
+    now = datetime.now(timezone.utc)
+
+    async with get_db_session() as session:
         repo = UserRepository(session)
 
         updates: dict[str, Any] = {}
@@ -381,12 +396,13 @@ async def update_consent(
             updates["consent_third_party"] = request.third_party_sharing
 
         if updates:
-            updates["consent_updated_at"] = datetime.utcnow()
-            await repo.update(user.id, **updates)
+            updates["consent_updated_at"] = now
+            user_data = await repo.update(user.id, **updates)
+        else:
+            user_data = await repo.get_by_id(user.id)
 
         logger.info(f"Consent updated for user {user.id}: {updates}")
 
-        user_data = await repo.get_by_id(user.id)
         if not user_data:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -397,19 +413,12 @@ async def update_consent(
             marketing_emails=user_data.consent_marketing,
             analytics=user_data.consent_analytics,
             third_party_sharing=user_data.consent_third_party,
-            updated_at=user_data.consent_updated_at or datetime.utcnow(),
+            updated_at=user_data.consent_updated_at or now,
         )
 
-    raise HTTPException(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        detail="Database session unavailable",
-    )
-
 
-@router.get("/access-log")
+@router.get("/access-log", dependencies=[Depends(get_current_user)])
 async def get_access_log(
-    token: Annotated[str, Depends(oauth2_scheme)],
-    settings: Annotated[APISettings, Depends(get_settings)],
     page: int = 1,
     page_size: int = 50,
 ) -> dict:
@@ -418,9 +427,6 @@ async def get_access_log(
 
     Shows who has accessed the user's data and when.
     """
-    # Authenticate user (required for access)
-    _ = await get_current_user(token, settings)
-
     # In a full implementation, this would query an audit log table
     # For now, return a placeholder
     return {
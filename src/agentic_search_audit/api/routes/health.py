@@ -1,5 +1,6 @@
 """Health check endpoints."""
 
+import asyncio
 import time
 from datetime import datetime
 
@@ -17,7 +18,7 @@ async def check_database() -> ComponentHealth:
     try:
         from ..deps import get_db_session
 
-        async for session in get_db_session():
+        async with get_db_session() as session:
             from sqlalchemy import text
 
             await session.execute(text("SELECT 1"))
@@ -27,13 +28,6 @@ async def check_database() -> ComponentHealth:
                 latency_ms=latency,
                 message=None,
             )
-        # Fallback if generator doesn't yield (should never happen)
-        latency = (time.perf_counter() - start) * 1000
-        return ComponentHealth(
-            status="unhealthy",
-            latency_ms=latency,
-            message="Database session not available",
-        )
     except Exception as e:
         latency = (time.perf_counter() - start) * 1000
         return ComponentHealth(
@@ -66,6 +60,32 @@ async def check_redis() -> ComponentHealth:
         )
 
 
+# Probe results are shared for a short window so that frequent load-balancer
+# and kubelet probes collapse into one database/Redis round trip per window
+_HEALTH_CACHE_TTL_SECONDS = 1.0
+_health_cache: tuple[float, ComponentHealth, ComponentHealth] | None = None
+_health_lock = asyncio.Lock()
+
+
+async def _probe_dependencies() -> tuple[ComponentHealth, ComponentHealth]:
+    """Return database and Redis health, probing at most once per cache window."""
+    global _health_cache
+
+    cached = _health_cache
+    if cached is not None and time.monotonic() - cached[0] < _HEALTH_CACHE_TTL_SECONDS:
+        return cached[1], cached[2]
+
+    async with _health_lock:
+        # Another request may have refreshed the cache while we waited
+        cached = _health_cache
+        if cached is not None and time.monotonic() - cached[0] < _HEALTH_CACHE_TTL_SECONDS:
+            return cached[1], cached[2]
+
+        db_health, redis_health = await asyncio.gather(check_database(), check_redis())
+        _health_cache = (time.monotonic(), db_health, redis_health)
+        return db_health, redis_health
+
+
 @router.get("/health", response_model=HealthStatus)
 async def health_check(
     settings: APISettings = Depends(get_settings),
@@ -75,8 +95,7 @@ async def health_check(
 
     Returns the status of all system components.
     """
-    db_health = await check_database()
-    redis_health = await check_redis()
+    db_health, redis_health = await _probe_dependencies()
 
     checks = {
         "database": db_health,
@@ -120,8 +139,7 @@ async def readiness(
     Returns 200 if the application is ready to serve traffic.
     """
     # Check critical dependencies
-    db_health = await check_database()
-    redis_health = await check_redis()
+    db_health, redis_health = await _probe_dependencies()
 
     if db_health.status == "unhealthy":
         return {"status": "not_ready", "reason": "database_unavailable"}
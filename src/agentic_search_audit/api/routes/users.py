@@ -1,12 +1,15 @@
 """User management endpoints."""
 
-from typing import Annotated
+import logging
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Annotated, Any
 from uuid import UUID
 
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, status
 
-from ..config import APISettings, get_settings
-from ..routes.auth import oauth2_scheme, verify_token
+from ..routes.auth import get_current_payload
 from ..schemas import (
     OrganizationCreate,
     OrganizationResponse,
@@ -15,57 +18,146 @@ from ..schemas import (
     UserResponse,
 )
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
+# Authenticated users are cached in Redis for a short time so that most
+# requests skip the users table. Profile changes drop the entry explicitly.
+_USER_CACHE_KEY_PREFIX = "usr:"
+_USER_CACHE_TTL_SECONDS = 30
+
+
+@dataclass(frozen=True, slots=True)
+class CurrentUser:
+    """Profile fields of the authenticated user needed by request handlers."""
+
+    id: UUID
+    email: str
+    name: str | None
+    is_active: bool
+    is_admin: bool
+    created_at: datetime | None
+    organization_id: UUID | None
+
+    @classmethod
+    def from_model(cls, user: Any) -> "CurrentUser":
+        """Copy the cached fields from a ``User`` row."""
+        return cls(
+            id=user.id,
+            email=user.email,
+            name=user.name,
+            is_active=user.is_active,
+            is_admin=user.is_admin,
+            created_at=user.created_at,
+            organization_id=user.organization_id,
+        )
+
+    @classmethod
+    def from_json(cls, data: bytes) -> "CurrentUser":
+        """Rebuild a cached user from its JSON form."""
+        fields = orjson.loads(data)
+        return cls(
+            id=UUID(fields["id"]),
+            email=fields["email"],
+            name=fields["name"],
+            is_active=fields["is_active"],
+            is_admin=fields["is_admin"],
+            created_at=(
+                datetime.fromisoformat(fields["created_at"]) if fields["created_at"] else None
+            ),
+            organization_id=(
+                UUID(fields["organization_id"]) if fields["organization_id"] else None
+            ),
+        )
+
+
+async def _get_cached_user(user_id: UUID) -> CurrentUser | None:
+    """Look up a cached user; cache errors count as a miss."""
+    try:
+        from ..deps import get_redis
+
+        redis = await get_redis()
+        cached = await redis.get(f"{_USER_CACHE_KEY_PREFIX}{user_id}")
+        return CurrentUser.from_json(cached) if cached else None
+    except Exception as e:
+        logger.debug(f"User cache lookup failed: {e}")
+        return None
+
+
+async def _cache_user(user: CurrentUser) -> None:
+    """Cache a user for other requests."""
+    try:
+        from ..deps import get_redis
+
+        redis = await get_redis()
+        await redis.set(
+            f"{_USER_CACHE_KEY_PREFIX}{user.id}",
+            orjson.dumps(asdict(user)),
+            ex=_USER_CACHE_TTL_SECONDS,
+        )
+    except Exception as e:
+        logger.debug(f"Could not cache user: {e}")
+
+
+async def invalidate_cached_user(user_id: UUID) -> None:
+    """Drop a user's cache entry after their profile or status changes."""
+    try:
+        from ..deps import get_redis
+
+        redis = await get_redis()
+        await redis.delete(f"{_USER_CACHE_KEY_PREFIX}{user_id}")
+    except Exception as e:
+        logger.warning(f"Could not invalidate cached user {user_id}: {e}")
+
 
 async def get_current_user(
-    token: Annotated[str, Depends(oauth2_scheme)],
-    settings: Annotated[APISettings, Depends(get_settings)],
-) -> "User":  # type: ignore[name-defined]  # noqa: F821
-    """Get the current authenticated user."""
+    payload: Annotated[dict[str, Any], Depends(get_current_payload)],
+) -> CurrentUser:
+    """Get the current authenticated user.
 
-    payload = verify_token(token, settings)
+    Consumes the per-request token payload, so the JWT is not re-verified.
+    The user row is served from Redis when cached.
+    """
     user_id = UUID(payload["sub"])
 
-    from ...db.repositories import UserRepository  # type: ignore[import-untyped]
-    from ..deps import get_db_session
+    user = await _get_cached_user(user_id)
+    if user is None:
+        from ...db.repositories import UserRepository  # type: ignore[import-untyped]
+        from ..deps import get_db_session
 
-    async for session in get_db_session():
-        repo = UserRepository(session)
-        user = await repo.get_by_id(user_id)
+        async with get_db_session() as session:
+            repo = UserRepository(session)
+            user_row = await repo.get_by_id(user_id)
 
-        if not user:
+        if not user_row:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="User not found",
             )
 
-        if not user.is_active:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="User account is disabled",
-            )
+        user = CurrentUser.from_model(user_row)
+        if user.is_active:
+            await _cache_user(user)
 
-        return user
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User account is disabled",
+        )
 
-    # Should never reach here - get_db_session always yields
-    raise HTTPException(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        detail="Database session unavailable",
-    )
+    return user
 
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_profile(
-    token: Annotated[str, Depends(oauth2_scheme)],
-    settings: Annotated[APISettings, Depends(get_settings)],
+    user: Annotated[Any, Depends(get_current_user)],
 ) -> UserResponse:
     """
     Get the current user's profile.
     """
-    user = await get_current_user(token, settings)
-
-    return UserResponse(
+    # The user was loaded from our own DB, so skip re-validating its fields
+    return UserResponse.model_construct(
         id=user.id,
         email=user.email,
         name=user.name,
@@ -79,16 +171,13 @@ async def get_current_user_profile(
 @router.patch("/me", response_model=UserResponse)
 async def update_current_user(
     updates: dict,
-    token: Annotated[str, Depends(oauth2_scheme)],
-    settings: Annotated[APISettings, Depends(get_settings)],
+    user: Annotated[Any, Depends(get_current_user)],
 ) -> UserResponse:
     """
     Update the current user's profile.
 
     Allowed fields: name
     """
-    user = await get_current_user(token, settings)
-
     from ...db.repositories import UserRepository
     from ..deps import get_db_session
 
@@ -101,7 +190,7 @@ async def update_current_user(
             detail="No valid fields to update",
         )
 
-    async for session in get_db_session():
+    async with get_db_session() as session:
         repo = UserRepository(session)
         updated_user = await repo.update(user.id, **filtered_updates)
         if not updated_user:
@@ -110,38 +199,30 @@ async def update_current_user(
                 detail="User not found",
             )
 
-        return UserResponse(
-            id=UUID(str(updated_user.id)),
-            email=updated_user.email,
-            name=updated_user.name,
-            is_active=updated_user.is_active,
-            is_admin=updated_user.is_admin,
-            created_at=updated_user.created_at,
-            organization_id=(
-                UUID(str(updated_user.organization_id)) if updated_user.organization_id else None
-            ),
-        )
+    await invalidate_cached_user(user.id)
 
-    raise HTTPException(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        detail="Database session unavailable",
+    return UserResponse.model_construct(
+        id=updated_user.id,
+        email=updated_user.email,
+        name=updated_user.name,
+        is_active=updated_user.is_active,
+        is_admin=updated_user.is_admin,
+        created_at=updated_user.created_at,
+        organization_id=updated_user.organization_id,
     )
 
 
 @router.get("/me/usage", response_model=UsageSummary)
 async def get_usage(
-    token: Annotated[str, Depends(oauth2_scheme)],
-    settings: Annotated[APISettings, Depends(get_settings)],
+    user: Annotated[Any, Depends(get_current_user)],
 ) -> UsageSummary:
     """
     Get usage statistics for the current user.
     """
-    user = await get_current_user(token, settings)
-
     from ...db.repositories import UsageRepository
     from ..deps import get_db_session
 
-    async for session in get_db_session():
+    async with get_db_session() as session:
         repo = UsageRepository(session)
         current_period = await repo.get_current_period(user.id)
         all_time = await repo.get_all_time(user.id)
@@ -159,11 +240,6 @@ async def get_usage(
             limits=limits,
         )
 
-    raise HTTPException(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        detail="Database session unavailable",
-    )
-
 
 # Organization endpoints
 
@@ -173,83 +249,66 @@ async def get_usage(
 )
 async def create_organization(
     org_data: OrganizationCreate,
-    token: Annotated[str, Depends(oauth2_scheme)],
-    settings: Annotated[APISettings, Depends(get_settings)],
+    user: Annotated[Any, Depends(get_current_user)],
 ) -> OrganizationResponse:
     """
     Create a new organization.
 
     The creating user becomes the owner.
     """
-    user = await get_current_user(token, settings)
-
     from ...db.repositories import OrganizationRepository
     from ..deps import get_db_session
 
-    async for session in get_db_session():
+    async with get_db_session() as session:
         repo = OrganizationRepository(session)
         org = await repo.create(name=org_data.name, owner_id=user.id)
 
-        return OrganizationResponse(
-            id=UUID(str(org.id)),
-            name=org.name,
-            created_at=org.created_at,
-            member_count=1,
-            audit_count=0,
-        )
+    # The owner's organization_id changed
+    await invalidate_cached_user(user.id)
 
-    raise HTTPException(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        detail="Database session unavailable",
+    return OrganizationResponse.model_construct(
+        id=org.id,
+        name=org.name,
+        created_at=org.created_at,
+        member_count=1,
+        audit_count=0,
     )
 
 
 @router.get("/organizations/{org_id}", response_model=OrganizationResponse)
 async def get_organization(
     org_id: UUID,
-    token: Annotated[str, Depends(oauth2_scheme)],
-    settings: Annotated[APISettings, Depends(get_settings)],
+    user: Annotated[Any, Depends(get_current_user)],
 ) -> OrganizationResponse:
     """
     Get organization details.
 
     User must be a member of the organization.
     """
-    user = await get_current_user(token, settings)
-
     from ...db.repositories import OrganizationRepository
     from ..deps import get_db_session
 
-    async for session in get_db_session():
+    async with get_db_session() as session:
         repo = OrganizationRepository(session)
-        org = await repo.get_by_id(org_id)
-
-        if not org:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Organization not found",
-            )
+        org = await repo.get_detail(org_id, user.id)
 
-        # Check membership
-        is_member = await repo.is_member(org_id, user.id)
-        if not is_member:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not a member of this organization",
-            )
-
-        member_count = await repo.get_member_count(org_id)
-        audit_count = await repo.get_audit_count(org_id)
+    if not org:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Organization not found",
+        )
 
-        return OrganizationResponse(
-            id=UUID(str(org.id)),
-            name=org.name,
-            created_at=org.created_at,
-            member_count=member_count,
-            audit_count=audit_count,
+    # Check membership
+    if not org.is_member:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not a member of this organization",
         )
 
-    raise HTTPException(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        detail="Database session unavailable",
+    return OrganizationResponse.model_construct(
+        id=org.id,
+        name=org.name,
+        created_at=org.created_at,
+        member_count=org.member_count,
+        audit_count=org.audit_count,
     )
@@ -1,57 +1,48 @@
 """API request/response schemas."""
 
+import ipaddress
+import re
 from datetime import datetime
 from enum import Enum
 from typing import Annotated, Any
-from urllib.parse import urlparse
 from uuid import UUID
 
-from pydantic import AfterValidator, BaseModel, Field, HttpUrl
+from pydantic import AfterValidator, BaseModel, Field, HttpUrl, TypeAdapter
 
 from ..core.types import JudgeScore, Query, ResultItem
 
-# Blocked hostnames for webhook URLs (SSRF prevention)
-_WEBHOOK_BLOCKED_HOSTS = {
-    "localhost",
-    "127.0.0.1",
-    "0.0.0.0",  # nosec B104 - not binding, blocking this address
-    "::1",
-    "[::1]",
-}
-
-# Blocked IP prefixes (internal networks)
-_WEBHOOK_BLOCKED_PREFIXES = (
-    "10.",
-    "192.168.",
-    "172.16.",
-    "172.17.",
-    "172.18.",
-    "172.19.",
-    "172.20.",
-    "172.21.",
-    "172.22.",
-    "172.23.",
-    "172.24.",
-    "172.25.",
-    "172.26.",
-    "172.27.",
-    "172.28.",
-    "172.29.",
-    "172.30.",
-    "172.31.",
-    "169.254.",
-)
+# Blocked hostnames for webhook URLs (SSRF prevention); literal IPs are
+# checked by address class instead
+_WEBHOOK_BLOCKED_HOSTS = frozenset({"localhost"})
+
+# Every IPv4/IPv6 literal contains a digit or a colon; plain DNS names
+# without either skip the (comparatively slow) failed ip_address() parse
+_LOOKS_LIKE_IP = re.compile(r"[\d:]")
 
 
 def validate_webhook_url(url: HttpUrl) -> HttpUrl:
     """Validate webhook URL to prevent SSRF attacks."""
-    parsed = urlparse(str(url))
-    hostname = (parsed.hostname or "").lower()
+    # HttpUrl has already parsed and lowercased the host; IPv6 keeps its brackets
+    hostname = (url.host or "").strip("[]")
 
-    if hostname in _WEBHOOK_BLOCKED_HOSTS:
+    if hostname in _WEBHOOK_BLOCKED_HOSTS or hostname.endswith(".localhost"):
         raise ValueError("Webhook URL cannot point to localhost or loopback address")
 
-    if hostname.startswith(_WEBHOOK_BLOCKED_PREFIXES):
+    if not _LOOKS_LIKE_IP.search(hostname):
+        return url
+
+    try:
+        ip = ipaddress.ip_address(hostname)
+    except ValueError:
+        return url
+
+    if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped:
+        ip = ip.ipv4_mapped
+
+    if ip.is_loopback or ip.is_unspecified:
+        raise ValueError("Webhook URL cannot point to localhost or loopback address")
+
+    if ip.is_private or ip.is_link_local or ip.is_multicast or ip.is_reserved:
         raise ValueError("Webhook URL cannot point to internal network addresses")
 
     return url
@@ -60,6 +51,9 @@ def validate_webhook_url(url: HttpUrl) -> HttpUrl:
 # Type alias for validated webhook URL
 SafeWebhookUrl = Annotated[HttpUrl, AfterValidator(validate_webhook_url)]
 
+# Built once; use for webhook URLs validated outside a request model
+WEBHOOK_URL_ADAPTER: TypeAdapter[HttpUrl] = TypeAdapter(SafeWebhookUrl)
+
 
 class AuditStatus(str, Enum):
     """Audit job status."""
@@ -119,12 +113,11 @@ class AuditSummary(BaseModel):
     error_message: str | None
 
 
-class AuditDetail(AuditSummary):
-    """Detailed audit information."""
+class ArtifactLinks(BaseModel):
+    """Links to audit artifacts."""
 
-    queries: list[Query]
-    config: dict[str, Any]
-    results: list["AuditResultItem"] | None
+    screenshot_url: str | None
+    html_snapshot_url: str | None
 
 
 class AuditResultItem(BaseModel):
@@ -133,14 +126,15 @@ class AuditResultItem(BaseModel):
     query: Query
     items: list[ResultItem]
     score: JudgeScore
-    artifacts: "ArtifactLinks"
+    artifacts: ArtifactLinks
 
 
-class ArtifactLinks(BaseModel):
-    """Links to audit artifacts."""
+class AuditDetail(AuditSummary):
+    """Detailed audit information."""
 
-    screenshot_url: str | None
-    html_snapshot_url: str | None
+    queries: list[Query]
+    config: dict[str, Any]
+    results: list[AuditResultItem] | None
 
 
 class AuditCreateResponse(BaseModel):
@@ -156,10 +150,11 @@ class AuditListResponse(BaseModel):
     """Paginated list of audits."""
 
     items: list[AuditSummary]
-    total: int
+    total: int | None  # Only counted on the first page when paging by cursor
     page: int
     page_size: int
-    pages: int
+    pages: int | None
+    next_cursor: str | None = None
 
 
 # User schemas
@@ -178,6 +173,12 @@ class UserCreate(UserBase):
     password: str = Field(min_length=8, description="User password")
 
 
+class UserBulkCreate(BaseModel):
+    """Bulk user creation request."""
+
+    users: list[UserCreate] = Field(min_length=1, max_length=100, description="Users to create")
+
+
 class UserResponse(UserBase):
     """User response model."""
 
@@ -270,14 +271,6 @@ class UsageRecord(BaseModel):
     estimated_cost_usd: float
 
 
-class UsageSummary(BaseModel):
-    """Usage summary response."""
-
-    current_period: UsageRecord
-    all_time: UsageRecord
-    limits: "UsageLimits"
-
-
 class UsageLimits(BaseModel):
     """Usage limits for the plan."""
 
@@ -286,16 +279,15 @@ class UsageLimits(BaseModel):
     concurrent_audits: int
 
 
-# Health check schemas
+class UsageSummary(BaseModel):
+    """Usage summary response."""
 
+    current_period: UsageRecord
+    all_time: UsageRecord
+    limits: UsageLimits
 
-class HealthStatus(BaseModel):
-    """Health check status."""
 
-    status: str = Field(description="Overall status: healthy, degraded, unhealthy")
-    version: str
-    timestamp: datetime
-    checks: dict[str, "ComponentHealth"]
+# Health check schemas
 
 
 class ComponentHealth(BaseModel):
@@ -306,8 +298,10 @@ class ComponentHealth(BaseModel):
     message: str | None
 
 
-# Enable forward references
-AuditDetail.model_rebuild()
-AuditResultItem.model_rebuild()
-UsageSummary.model_rebuild()
-HealthStatus.model_rebuild()
+class HealthStatus(BaseModel):
+    """Health check status."""
+
+    status: str = Field(description="Overall status: healthy, degraded, unhealthy")
+    version: str
+    timestamp: datetime
+    checks: dict[str, ComponentHealth]
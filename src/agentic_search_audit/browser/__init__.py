@@ -1,28 +1,41 @@
 """Browser automation module."""
 
+from typing import TYPE_CHECKING, Any
+
 from .errors import BrowserErrorKind, classify_error, is_retryable
 from .factory import create_browser_client
-from .playwright_client import PlaywrightBrowserClient
+
+if TYPE_CHECKING:
+    from .cdp_client import CDPBrowserClient
+    from .playwright_client import PlaywrightBrowserClient
+    from .undetected_client import UndetectedBrowserClient
 
 __all__ = [
     "BrowserErrorKind",
+    "CDPBrowserClient",
     "PlaywrightBrowserClient",
+    "UndetectedBrowserClient",
     "classify_error",
     "create_browser_client",
     "is_retryable",
 ]
 
-# Optional backends — available only when their dependencies are installed.
-try:
-    from .cdp_client import CDPBrowserClient  # noqa: F401
 
-    __all__.append("CDPBrowserClient")
-except ImportError:
-    pass
+def __getattr__(name: str) -> Any:
+    """Import browser backends on first access (PEP 562).
+
+    Raises ImportError if the backend's dependencies are not installed.
+    """
+    if name == "PlaywrightBrowserClient":
+        from .playwright_client import PlaywrightBrowserClient
+
+        return PlaywrightBrowserClient
+    if name == "CDPBrowserClient":
+        from .cdp_client import CDPBrowserClient
 
-try:
-    from .undetected_client import UndetectedBrowserClient  # noqa: F401
+        return CDPBrowserClient
+    if name == "UndetectedBrowserClient":
+        from .undetected_client import UndetectedBrowserClient
 
-    __all__.append("UndetectedBrowserClient")
-except ImportError:
-    pass
+        return UndetectedBrowserClient
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
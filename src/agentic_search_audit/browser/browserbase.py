@@ -1,5 +1,6 @@
 """Browserbase cloud browser session management."""
 
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
@@ -34,7 +35,17 @@ def get_browserbase_endpoint(api_key: str, project_id: str | None = None) -> str
             create_kwargs["project_id"] = project_id
         session = bb.sessions.create(**create_kwargs)
         ws_url: str = session.connect_url
-        logger.info(f"Created Browserbase session: {session.id}")
+        logger.info("Created Browserbase session: %s", session.id)
         return ws_url
     except Exception as e:
         raise RuntimeError(f"Failed to create Browserbase session: {e}") from e
+
+
+async def get_browserbase_endpoint_async(api_key: str, project_id: str | None = None) -> str:
+    """Create a Browserbase session without blocking the event loop.
+
+    The Browserbase SDK call is a blocking HTTP request, so it runs on a
+    worker thread. Arguments, return value and errors are the same as
+    ``get_browserbase_endpoint``.
+    """
+    return await asyncio.to_thread(get_browserbase_endpoint, api_key, project_id)
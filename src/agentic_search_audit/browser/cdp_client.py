@@ -8,7 +8,6 @@ from playwright.async_api import (
     Browser,
     BrowserContext,
     Page,
-    async_playwright,
 )
 from playwright.async_api import (
     Error as PlaywrightError,
@@ -17,6 +16,8 @@ from playwright.async_api import (
     TimeoutError as PlaywrightTimeoutError,
 )
 
+from .driver import FIRST_ATTRIBUTE_JS, FIRST_TEXT_JS, get_shared_playwright
+
 logger = logging.getLogger(__name__)
 
 
@@ -29,17 +30,23 @@ class CDPBrowserClient:
 
     Unlike ``PlaywrightBrowserClient``, ``disconnect()`` does **not** close
     the external browser process — it only detaches the Playwright connection.
+    The Playwright driver itself is shared by all Playwright-based clients on
+    the event loop and is stopped with ``close_shared_playwright()``.
     """
 
     def __init__(
         self,
-        cdp_endpoint: str,
+        cdp_endpoint: str | None = None,
         viewport_width: int = 1366,
         viewport_height: int = 900,
         click_timeout_ms: int = 5000,
         locale: str = "en-US",
+        browserbase_api_key: str | None = None,
+        browserbase_project_id: str | None = None,
     ):
         self.cdp_endpoint = cdp_endpoint
+        self.browserbase_api_key = browserbase_api_key
+        self.browserbase_project_id = browserbase_project_id
         self.viewport_width = viewport_width
         self.viewport_height = viewport_height
         self.click_timeout_ms = click_timeout_ms
@@ -60,9 +67,23 @@ class CDPBrowserClient:
         await self.disconnect()
 
     async def connect(self) -> None:
-        """Connect to an external browser via CDP."""
-        logger.info(f"Connecting to CDP endpoint: {self.cdp_endpoint}")
-        self._playwright = await async_playwright().start()
+        """Connect to an external browser via CDP.
+
+        Without an explicit endpoint, a Browserbase session is created first;
+        its endpoint is kept so ``reconnect()`` returns to the same session.
+        """
+        if not self.cdp_endpoint and self.browserbase_api_key:
+            from .browserbase import get_browserbase_endpoint_async
+
+            self.cdp_endpoint = await get_browserbase_endpoint_async(
+                api_key=self.browserbase_api_key,
+                project_id=self.browserbase_project_id,
+            )
+        if not self.cdp_endpoint:
+            raise ValueError("CDP backend requires either 'cdp_endpoint' or 'browserbase_api_key'")
+
+        logger.info("Connecting to CDP endpoint: %s", self.cdp_endpoint)
+        self._playwright = await get_shared_playwright()
         self._browser = await self._playwright.chromium.connect_over_cdp(self.cdp_endpoint)
 
         # Reuse existing context if available, otherwise create one
@@ -85,16 +106,19 @@ class CDPBrowserClient:
         else:
             self._page = await self._context.new_page()
 
-        # Apply stealth
-        try:
-            from playwright_stealth import stealth_async  # type: ignore[import-untyped]
-
+        # Apply stealth only to a context we created. A reused context belongs to
+        # the remote browser (e.g. Browserbase applies its own fingerprinting),
+        # and patching navigator a second time can itself be detected.
+        if self._owns_context:
             try:
-                await stealth_async(self._page)
-            except Exception as stealth_err:
-                logger.warning(f"playwright-stealth failed ({stealth_err}), skipping stealth")
-        except ImportError:
-            logger.warning("playwright-stealth not installed, skipping stealth for CDP")
+                from playwright_stealth import stealth_async  # type: ignore[import-untyped]
+
+                try:
+                    await stealth_async(self._page)
+                except Exception as stealth_err:
+                    logger.warning("playwright-stealth failed (%s), skipping stealth", stealth_err)
+            except ImportError:
+                logger.warning("playwright-stealth not installed, skipping stealth for CDP")
 
         self._page.set_default_timeout(60000)
         self._page.set_default_navigation_timeout(60000)
@@ -106,7 +130,7 @@ class CDPBrowserClient:
             try:
                 await self._page.close()
             except Exception as e:
-                logger.warning(f"Failed to close page: {e}")
+                logger.warning("Failed to close page: %s", e)
             finally:
                 self._page = None
 
@@ -115,19 +139,14 @@ class CDPBrowserClient:
             try:
                 await self._context.close()
             except Exception as e:
-                logger.warning(f"Failed to close context: {e}")
+                logger.warning("Failed to close context: %s", e)
 
         self._context = None
         self._owns_context = False
         self._browser = None
 
-        if self._playwright:
-            try:
-                await self._playwright.stop()
-            except Exception as e:
-                logger.warning(f"Failed to stop playwright: {e}")
-            finally:
-                self._playwright = None
+        # The driver is shared with other clients; see close_shared_playwright()
+        self._playwright = None
 
         logger.info("CDP connection closed")
 
@@ -160,13 +179,7 @@ class CDPBrowserClient:
 
     def is_browser_alive(self) -> bool:
         """Check whether the CDP connection is still alive."""
-        if not self._browser:
-            return False
-        try:
-            _ = self._browser.contexts
-            return True
-        except Exception:
-            return False
+        return self._browser is not None and self._browser.is_connected()
 
     async def recover_page(self) -> None:
         """Create a fresh page in the existing browser context."""
@@ -177,7 +190,7 @@ class CDPBrowserClient:
             try:
                 await self._page.close()
             except Exception as e:
-                logger.debug(f"Old page already closed: {e}")
+                logger.debug("Old page already closed: %s", e)
             finally:
                 self._page = None
 
@@ -204,40 +217,42 @@ class CDPBrowserClient:
         if not self._page:
             raise RuntimeError("Browser not connected")
         try:
-            element = await self._page.query_selector(selector)
-            if element:
+            if await self._page.locator(selector).count():
                 return {"exists": True}
             return None
         except (PlaywrightTimeoutError, PlaywrightError):
             raise
         except Exception as e:
-            logger.debug(f"Selector {selector} not found: {e}")
+            logger.debug("Selector %s not found: %s", selector, e)
             return None
 
     async def query_selector_all(self, selector: str) -> list[dict[str, Any]]:
         if not self._page:
             raise RuntimeError("Browser not connected")
         try:
-            elements = await self._page.query_selector_all(selector)
-            return [{"index": i} for i in range(len(elements))]
+            count = await self._page.locator(selector).count()
+            return [{"index": i} for i in range(count)]
         except (PlaywrightTimeoutError, PlaywrightError):
             raise
         except Exception as e:
-            logger.debug(f"Selector {selector} returned no results: {e}")
+            logger.debug("Selector %s returned no results: %s", selector, e)
             return []
 
     async def evaluate(self, expression: str) -> Any:
+        result = await self.evaluate_raw(expression)
+        if result is None:
+            return None
+        return str(result) if not isinstance(result, str) else result
+
+    async def evaluate_raw(self, expression: str) -> Any:
         if not self._page:
             raise RuntimeError("Browser not connected")
         try:
-            result = await self._page.evaluate(expression)
-            if result is None:
-                return None
-            return str(result) if not isinstance(result, str) else result
+            return await self._page.evaluate(expression)
         except (PlaywrightTimeoutError, PlaywrightError):
             raise
         except Exception as e:
-            logger.debug(f"Evaluate failed: {e}")
+            logger.debug("Evaluate failed: %s", e)
             return None
 
     async def click(self, selector: str) -> None:
@@ -281,7 +296,7 @@ class CDPBrowserClient:
             await self._page.wait_for_selector(selector, timeout=timeout, state=state)
             return True
         except Exception as e:
-            logger.debug(f"Timeout waiting for {selector}: {e}")
+            logger.debug("Timeout waiting for %s: %s", selector, e)
             return False
 
     async def wait_for_network_idle(self, timeout: int = 2000) -> None:
@@ -290,32 +305,30 @@ class CDPBrowserClient:
         try:
             await self._page.wait_for_load_state("networkidle", timeout=timeout)
         except Exception as e:
-            logger.debug(f"Network idle timeout: {e}")
+            logger.debug("Network idle timeout: %s", e)
 
     async def get_element_text(self, selector: str) -> str | None:
         if not self._page:
             raise RuntimeError("Browser not connected")
         try:
-            element = await self._page.query_selector(selector)
-            if element:
-                return await element.text_content()
-            return None
+            text: str | None = await self._page.locator(selector).evaluate_all(FIRST_TEXT_JS)
+            return text
         except (PlaywrightTimeoutError, PlaywrightError):
             raise
         except Exception as e:
-            logger.debug(f"Failed to get text for {selector}: {e}")
+            logger.debug("Failed to get text for %s: %s", selector, e)
             return None
 
     async def get_element_attribute(self, selector: str, attribute: str) -> str | None:
         if not self._page:
             raise RuntimeError("Browser not connected")
         try:
-            element = await self._page.query_selector(selector)
-            if element:
-                return await element.get_attribute(attribute)
-            return None
+            value: str | None = await self._page.locator(selector).evaluate_all(
+                FIRST_ATTRIBUTE_JS, attribute
+            )
+            return value
         except (PlaywrightTimeoutError, PlaywrightError):
             raise
         except Exception as e:
-            logger.debug(f"Failed to get attribute {attribute} for {selector}: {e}")
+            logger.debug("Failed to get attribute %s for %s: %s", attribute, selector, e)
             return None
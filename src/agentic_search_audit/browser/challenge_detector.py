@@ -5,6 +5,7 @@ so the orchestrator can avoid extracting garbage results and instead retry with
 increased backoff.
 """
 
+import json
 import logging
 from dataclasses import dataclass
 
@@ -70,7 +71,49 @@ BLOCK_KEYWORDS: list[str] = [
 ]
 
 
-@dataclass
+# Pages with more visible text than this are treated as real content: only
+# the title is checked, since embedded widgets (e.g. a newsletter reCAPTCHA)
+# would otherwise be reported as challenges
+_CONTENT_PAGE_MIN_CHARS = 5000
+
+# One selector list so the browser matches the DOM in a single pass
+_FUSED_CHALLENGE_SELECTOR = ", ".join(CHALLENGE_SELECTORS)
+
+# Collects everything detect_challenge needs in a single evaluate round-trip
+# instead of one per heuristic (and one per selector).
+_CHALLENGE_PROBE_JS = (
+    "(function() {"
+    f"  var selectors = {json.dumps(CHALLENGE_SELECTORS)};"
+    f"  var patterns = {json.dumps(CAPTCHA_IFRAME_PATTERNS)};"
+    "  var text = document.body ? (document.body.innerText || '') : '';"
+    f"  var content = text.length > {_CONTENT_PAGE_MIN_CHARS};"
+    "  var selector = '';"
+    "  var iframe = '';"
+    "  if (!content) {"
+    f"    var hit = document.querySelector({json.dumps(_FUSED_CHALLENGE_SELECTOR)});"
+    "    for (var i = 0; hit && i < selectors.length && !selector; i++) {"
+    "      if (hit.matches(selectors[i])) selector = selectors[i];"
+    "    }"
+    "    var iframes = document.querySelectorAll('iframe');"
+    "    for (var i = 0; i < iframes.length && !iframe; i++) {"
+    "      var src = (iframes[i].src || '').toLowerCase();"
+    "      for (var j = 0; j < patterns.length; j++) {"
+    "        if (src.indexOf(patterns[j]) !== -1) { iframe = patterns[j]; break; }"
+    "      }"
+    "    }"
+    "  }"
+    "  return {"
+    "    title: document.title || '',"
+    "    selector: selector,"
+    "    iframe: iframe,"
+    "    len: text.length,"
+    "    text: text.substring(0, 1000)"
+    "  };"
+    "})()"
+)
+
+
+@dataclass(frozen=True, slots=True)
 class ChallengeDetection:
     """Result of challenge page detection."""
 
@@ -79,6 +122,14 @@ class ChallengeDetection:
     message: str
 
 
+# Shared result for the common case; ChallengeDetection is immutable
+_NO_CHALLENGE = ChallengeDetection(
+    detected=False,
+    challenge_type="none",
+    message="No challenge detected",
+)
+
+
 class ChallengeDetectedError(Exception):
     """Raised when a bot-detection challenge page is detected."""
 
@@ -96,112 +147,77 @@ async def detect_challenge(client: BrowserClient) -> ChallengeDetection:
     3. CAPTCHA iframes present
     4. Short body with block keywords
 
+    The page is probed once; all matching happens in Python. Checks 2-4 are
+    skipped for pages with more than 5000 characters of visible text.
+
     Args:
         client: Active browser client with a loaded page.
 
     Returns:
         ChallengeDetection with detection result.
     """
-    # 1. Check page title
     try:
-        title = await client.evaluate("document.title")
-        if title:
-            title_lower = str(title).lower()
-            for pattern in CHALLENGE_TITLE_PATTERNS:
-                if pattern in title_lower:
-                    msg = f"Challenge page detected via title: '{title}'"
-                    logger.warning(msg)
-                    return ChallengeDetection(
-                        detected=True,
-                        challenge_type="title_match",
-                        message=msg,
-                    )
+        info = await client.evaluate_raw(_CHALLENGE_PROBE_JS)
+        if not isinstance(info, dict):
+            raise TypeError(f"unexpected probe result {type(info).__name__}")
+        title = str(info.get("title") or "")
+        selector = str(info.get("selector") or "")
+        iframe = str(info.get("iframe") or "").strip()
+        body_len = int(info.get("len") or 0)
+        body_text = str(info.get("text") or "").lower()
     except Exception as e:
-        logger.debug(f"Title check failed: {e}")
-
-    # 2. Check for known challenge selectors
-    for selector in CHALLENGE_SELECTORS:
-        try:
-            el = await client.query_selector(selector)
-            if el:
-                msg = f"Challenge page detected via selector: {selector}"
-                logger.warning(msg)
-                return ChallengeDetection(
-                    detected=True,
-                    challenge_type="selector_match",
-                    message=msg,
-                )
-        except Exception:
-            continue
+        logger.debug("Challenge probe failed: %s", e)
+        return _NO_CHALLENGE
 
-    # 3. Check for CAPTCHA iframes
-    try:
-        patterns_json = str(CAPTCHA_IFRAME_PATTERNS).replace("'", '"')
-        iframe_check_js = (
-            "(function() {"
-            "  var iframes = document.querySelectorAll('iframe');"
-            "  for (var i = 0; i < iframes.length; i++) {"
-            "    var src = (iframes[i].src || '').toLowerCase();"
-            f"    var patterns = {patterns_json};"
-            "    for (var j = 0; j < patterns.length; j++) {"
-            "      if (src.indexOf(patterns[j]) !== -1) {"
-            "        return patterns[j];"
-            "      }"
-            "    }"
-            "  }"
-            "  return '';"
-            "})()"
-        )
-        result = await client.evaluate(iframe_check_js)
-        if result and str(result).strip():
-            msg = f"CAPTCHA iframe detected: {result}"
+    # 1. Check page title
+    title_lower = title.lower()
+    for pattern in CHALLENGE_TITLE_PATTERNS:
+        if pattern in title_lower:
+            msg = f"Challenge page detected via title: '{title}'"
             logger.warning(msg)
             return ChallengeDetection(
                 detected=True,
-                challenge_type="captcha_iframe",
+                challenge_type="title_match",
                 message=msg,
             )
-    except Exception as e:
-        logger.debug(f"Iframe check failed: {e}")
 
-    # 4. Short body with block keywords
-    try:
-        body_info = await client.evaluate(
-            "(function() {"
-            "  var body = document.body;"
-            "  if (!body) return JSON.stringify({len: 0, text: ''});"
-            "  var text = body.innerText || '';"
-            "  return JSON.stringify({len: text.length, text: text.substring(0, 1000)});"
-            "})()"
+    # Long pages are real content; the probe skipped the DOM checks for them
+    if body_len > _CONTENT_PAGE_MIN_CHARS:
+        return _NO_CHALLENGE
+
+    # 2. Check for known challenge selectors
+    if selector:
+        msg = f"Challenge page detected via selector: {selector}"
+        logger.warning(msg)
+        return ChallengeDetection(
+            detected=True,
+            challenge_type="selector_match",
+            message=msg,
         )
-        if body_info:
-            import json
-
-            try:
-                info = json.loads(str(body_info))
-                body_len = info.get("len", 0)
-                body_text = info.get("text", "").lower()
-
-                if body_len < 500:
-                    for keyword in BLOCK_KEYWORDS:
-                        if keyword in body_text:
-                            msg = (
-                                f"Possible block page: body length {body_len} chars "
-                                f"with keyword '{keyword}'"
-                            )
-                            logger.warning(msg)
-                            return ChallengeDetection(
-                                detected=True,
-                                challenge_type="short_body_block",
-                                message=msg,
-                            )
-            except (json.JSONDecodeError, TypeError):
-                pass
-    except Exception as e:
-        logger.debug(f"Body text check failed: {e}")
 
-    return ChallengeDetection(
-        detected=False,
-        challenge_type="none",
-        message="No challenge detected",
-    )
+    # 3. Check for CAPTCHA iframes
+    if iframe:
+        msg = f"CAPTCHA iframe detected: {iframe}"
+        logger.warning(msg)
+        return ChallengeDetection(
+            detected=True,
+            challenge_type="captcha_iframe",
+            message=msg,
+        )
+
+    # 4. Short body with block keywords
+    if body_len < 500:
+        for keyword in BLOCK_KEYWORDS:
+            if keyword in body_text:
+                msg = (
+                    f"Possible block page: body length {body_len} chars "
+                    f"with keyword '{keyword}'"
+                )
+                logger.warning(msg)
+                return ChallengeDetection(
+                    detected=True,
+                    challenge_type="short_body_block",
+                    message=msg,
+                )
+
+    return _NO_CHALLENGE
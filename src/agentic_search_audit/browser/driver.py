@@ -0,0 +1,54 @@
+"""Playwright driver and page scripts shared by the Playwright-based browser clients."""
+
+import asyncio
+import logging
+
+from playwright.async_api import Playwright, async_playwright
+
+logger = logging.getLogger(__name__)
+
+# Selector queries count matches in the page (Locator.count()) and read from
+# the first match with one evaluate_all() call, so no element handles are
+# transferred. These scripts return null when nothing matches.
+FIRST_TEXT_JS = "els => els.length ? els[0].textContent : null"
+FIRST_ATTRIBUTE_JS = "(els, name) => els.length ? els[0].getAttribute(name) : null"
+
+# One Playwright driver (a Node.js subprocess) serves every client on the same
+# event loop; it cannot be used from another loop, so it is scoped to one.
+_shared_playwright: Playwright | None = None
+_shared_playwright_loop: asyncio.AbstractEventLoop | None = None
+_shared_playwright_lock: asyncio.Lock | None = None
+
+
+async def get_shared_playwright() -> Playwright:
+    """Return the event loop's shared Playwright driver, starting it on first use."""
+    global _shared_playwright, _shared_playwright_loop, _shared_playwright_lock
+
+    loop = asyncio.get_running_loop()
+    if _shared_playwright_loop is not loop or _shared_playwright_lock is None:
+        # A driver started on an earlier event loop cannot be used from this one
+        _shared_playwright = None
+        _shared_playwright_loop = loop
+        _shared_playwright_lock = asyncio.Lock()
+
+    async with _shared_playwright_lock:
+        if _shared_playwright is None:
+            _shared_playwright = await async_playwright().start()
+        return _shared_playwright
+
+
+async def close_shared_playwright() -> None:
+    """Stop the shared Playwright driver, if one was started on this event loop.
+
+    Stopping the driver also ends every browser it launched, including idle
+    pooled ones, so this is the only browser cleanup needed at shutdown.
+    """
+    global _shared_playwright
+
+    if _shared_playwright is None or _shared_playwright_loop is not asyncio.get_running_loop():
+        return
+    playwright, _shared_playwright = _shared_playwright, None
+    try:
+        await playwright.stop()
+    except Exception as e:
+        logger.warning("Failed to stop playwright: %s", e)
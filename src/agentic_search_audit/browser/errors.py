@@ -1,6 +1,7 @@
 """Error classification for Playwright browser automation."""
 
 from enum import Enum
+from functools import cache
 
 
 class BrowserErrorKind(str, Enum):
@@ -14,46 +15,65 @@ class BrowserErrorKind(str, Enum):
     PERMANENT = "permanent"
 
 
-def classify_error(exc: BaseException) -> BrowserErrorKind:
-    """Classify a Playwright exception into an error kind.
+_RETRYABLE_KINDS = frozenset(
+    {
+        BrowserErrorKind.TIMEOUT,
+        BrowserErrorKind.PAGE_CLOSED,
+        BrowserErrorKind.BROWSER_DEAD,
+        BrowserErrorKind.TRANSIENT,
+    }
+)
+
+_MessageRules = tuple[tuple[str, BrowserErrorKind], ...]
+
+# Lowercased message fragments, checked in order; the first match wins
+_PLAYWRIGHT_MESSAGE_RULES: _MessageRules = (
+    ("browser has been closed", BrowserErrorKind.BROWSER_DEAD),
+    ("browser.newcontext", BrowserErrorKind.BROWSER_DEAD),
+    ("context has been closed", BrowserErrorKind.BROWSER_DEAD),
+    ("context.newpage", BrowserErrorKind.BROWSER_DEAD),
+    ("page has been closed", BrowserErrorKind.PAGE_CLOSED),
+    ("page closed", BrowserErrorKind.PAGE_CLOSED),
+    ("navigation", BrowserErrorKind.TRANSIENT),
+    ("net::", BrowserErrorKind.TRANSIENT),
+)
+
+_WEBDRIVER_MESSAGE_RULES: _MessageRules = (
+    ("chrome not reachable", BrowserErrorKind.BROWSER_DEAD),
+    ("unable to connect", BrowserErrorKind.BROWSER_DEAD),
+    ("no such window", BrowserErrorKind.PAGE_CLOSED),
+    ("window was already closed", BrowserErrorKind.PAGE_CLOSED),
+    ("net::", BrowserErrorKind.TRANSIENT),
+    ("timeout", BrowserErrorKind.TRANSIENT),
+    ("connection", BrowserErrorKind.TRANSIENT),
+)
+
+
+def _classify_message(exc: BaseException, rules: _MessageRules) -> BrowserErrorKind:
+    """Return the kind of the first rule whose fragment occurs in the message."""
+    msg = str(exc).lower()
+    for fragment, kind in rules:
+        if fragment in msg:
+            return kind
+    return BrowserErrorKind.PERMANENT
 
-    Uses isinstance checks against Playwright exception types first,
-    then falls back to message parsing for closed-state errors.
 
-    Args:
-        exc: The exception to classify.
+@cache
+def _type_table() -> dict[type, BrowserErrorKind | _MessageRules]:
+    """Map exception classes to a kind, or to message rules for generic base errors.
 
-    Returns:
-        The corresponding BrowserErrorKind.
+    Built once from whichever browser packages are installed.
     """
-    # Import lazily to avoid hard dependency at module level
+    table: dict[type, BrowserErrorKind | _MessageRules] = {}
     try:
         from playwright.async_api import Error as PlaywrightError
         from playwright.async_api import TimeoutError as PlaywrightTimeoutError
     except ImportError:
-        return BrowserErrorKind.PERMANENT
-
-    if isinstance(exc, PlaywrightTimeoutError):
-        return BrowserErrorKind.TIMEOUT
-
-    if isinstance(exc, PlaywrightError):
-        msg = str(exc).lower()
-        if "browser has been closed" in msg or "browser.newcontext" in msg:
-            return BrowserErrorKind.BROWSER_DEAD
-        if "context has been closed" in msg or "context.newpage" in msg:
-            return BrowserErrorKind.BROWSER_DEAD
-        if "page has been closed" in msg or "page closed" in msg:
-            return BrowserErrorKind.PAGE_CLOSED
-        if "target page, context or browser has been closed" in msg:
-            return BrowserErrorKind.BROWSER_DEAD
-        if "navigation" in msg or "net::" in msg:
-            return BrowserErrorKind.TRANSIENT
-        return BrowserErrorKind.PERMANENT
-
-    if isinstance(exc, RuntimeError) and "not connected" in str(exc).lower():
-        return BrowserErrorKind.NOT_CONNECTED
+        pass
+    else:
+        table[PlaywrightTimeoutError] = BrowserErrorKind.TIMEOUT
+        table[PlaywrightError] = _PLAYWRIGHT_MESSAGE_RULES
 
-    # Selenium / undetected-chromedriver exceptions
     try:
         from selenium.common.exceptions import (  # type: ignore[import-not-found]
             InvalidSessionIdException,
@@ -63,23 +83,40 @@ def classify_error(exc: BaseException) -> BrowserErrorKind:
             WebDriverException,
         )
     except ImportError:
-        return BrowserErrorKind.PERMANENT
-
-    if isinstance(exc, TimeoutException):
-        return BrowserErrorKind.TIMEOUT
-    if isinstance(exc, InvalidSessionIdException | SessionNotCreatedException):
-        return BrowserErrorKind.BROWSER_DEAD
-    if isinstance(exc, NoSuchWindowException):
-        return BrowserErrorKind.PAGE_CLOSED
-    if isinstance(exc, WebDriverException):
-        msg = str(exc).lower()
-        if "chrome not reachable" in msg or "unable to connect" in msg:
-            return BrowserErrorKind.BROWSER_DEAD
-        if "no such window" in msg or "window was already closed" in msg:
-            return BrowserErrorKind.PAGE_CLOSED
-        if "net::" in msg or "timeout" in msg or "connection" in msg:
-            return BrowserErrorKind.TRANSIENT
-        return BrowserErrorKind.PERMANENT
+        pass
+    else:
+        table[TimeoutException] = BrowserErrorKind.TIMEOUT
+        table[InvalidSessionIdException] = BrowserErrorKind.BROWSER_DEAD
+        table[SessionNotCreatedException] = BrowserErrorKind.BROWSER_DEAD
+        table[NoSuchWindowException] = BrowserErrorKind.PAGE_CLOSED
+        table[WebDriverException] = _WEBDRIVER_MESSAGE_RULES
+    return table
+
+
+def classify_error(exc: BaseException) -> BrowserErrorKind:
+    """Classify a browser exception into an error kind.
+
+    Walks the exception's MRO against a table of Playwright and Selenium
+    exception types, so the most specific registered class wins. Generic
+    base errors and ``RuntimeError`` fall back to message parsing.
+
+    Args:
+        exc: The exception to classify.
+
+    Returns:
+        The corresponding BrowserErrorKind.
+    """
+    table = _type_table()
+    for cls in type(exc).__mro__:
+        entry = table.get(cls)
+        if entry is None:
+            continue
+        if isinstance(entry, BrowserErrorKind):
+            return entry
+        return _classify_message(exc, entry)
+
+    if isinstance(exc, RuntimeError) and "not connected" in str(exc).lower():
+        return BrowserErrorKind.NOT_CONNECTED
 
     return BrowserErrorKind.PERMANENT
 
@@ -93,9 +130,4 @@ def is_retryable(kind: BrowserErrorKind) -> bool:
     Returns:
         True for TIMEOUT, PAGE_CLOSED, BROWSER_DEAD, and TRANSIENT.
     """
-    return kind in {
-        BrowserErrorKind.TIMEOUT,
-        BrowserErrorKind.PAGE_CLOSED,
-        BrowserErrorKind.BROWSER_DEAD,
-        BrowserErrorKind.TRANSIENT,
-    }
+    return kind in _RETRYABLE_KINDS
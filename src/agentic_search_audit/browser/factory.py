@@ -1,12 +1,89 @@
 """Factory for creating browser clients based on configuration."""
 
 import logging
+from collections.abc import Callable
 
 from ..core.types import BrowserBackend, BrowserClient, RunConfig
 
 logger = logging.getLogger(__name__)
 
 
+def _build_playwright(config: RunConfig, locale: str) -> BrowserClient:
+    """Build a local Playwright client."""
+    from .playwright_client import PlaywrightBrowserClient
+
+    logger.info("Using Playwright browser backend (locale=%s)", locale)
+    return PlaywrightBrowserClient(
+        headless=config.headless,
+        viewport_width=config.viewport_width,
+        viewport_height=config.viewport_height,
+        click_timeout_ms=config.click_timeout_ms,
+        locale=locale,
+        proxy_url=config.proxy_url,
+    )
+
+
+def _build_cdp(config: RunConfig, locale: str) -> BrowserClient:
+    """Build a CDP client for an external or Browserbase-hosted browser."""
+    from .cdp_client import CDPBrowserClient
+
+    endpoint = config.cdp_endpoint
+    if not endpoint and not config.browserbase_api_key:
+        raise ValueError("CDP backend requires either 'cdp_endpoint' or 'browserbase_api_key'")
+
+    if config.proxy_url:
+        logger.warning(
+            "Proxy URL is set but CDP backend connects to an external browser. "
+            "Ensure the external browser was launched with proxy settings."
+        )
+    logger.info(
+        "Using CDP browser backend (endpoint: %s, locale=%s)",
+        endpoint or "Browserbase session",
+        locale,
+    )
+    # Without an explicit endpoint the client creates the Browserbase
+    # session itself when it connects, off the event loop
+    return CDPBrowserClient(
+        cdp_endpoint=endpoint,
+        browserbase_api_key=None if endpoint else config.browserbase_api_key,
+        browserbase_project_id=config.browserbase_project_id,
+        viewport_width=config.viewport_width,
+        viewport_height=config.viewport_height,
+        click_timeout_ms=config.click_timeout_ms,
+        locale=locale,
+    )
+
+
+def _build_undetected(config: RunConfig, locale: str) -> BrowserClient:
+    """Build an undetected-chromedriver client."""
+    try:
+        import undetected_chromedriver  # type: ignore[import-not-found,import-untyped]  # noqa: F401
+    except ImportError:
+        raise ImportError(
+            "undetected-chromedriver not installed. "
+            "Install with: pip install 'agentic-search-audit[undetected]'"
+        )
+
+    from .undetected_client import UndetectedBrowserClient
+
+    logger.info("Using undetected-chromedriver browser backend (locale=%s)", locale)
+    return UndetectedBrowserClient(
+        headless=config.headless,
+        viewport_width=config.viewport_width,
+        viewport_height=config.viewport_height,
+        click_timeout_ms=config.click_timeout_ms,
+        locale=locale,
+        proxy_url=config.proxy_url,
+    )
+
+
+_BACKEND_BUILDERS: dict[BrowserBackend, Callable[[RunConfig, str], BrowserClient]] = {
+    BrowserBackend.PLAYWRIGHT: _build_playwright,
+    BrowserBackend.CDP: _build_cdp,
+    BrowserBackend.UNDETECTED: _build_undetected,
+}
+
+
 def create_browser_client(config: RunConfig, locale: str = "en-US") -> BrowserClient:
     """Create a browser client based on the configured backend.
 
@@ -22,67 +99,7 @@ def create_browser_client(config: RunConfig, locale: str = "en-US") -> BrowserCl
         ValueError: If the backend is unknown or misconfigured.
     """
     backend = config.browser_backend
-
-    if backend == BrowserBackend.PLAYWRIGHT:
-        from .playwright_client import PlaywrightBrowserClient
-
-        logger.info("Using Playwright browser backend (locale=%s)", locale)
-        return PlaywrightBrowserClient(
-            headless=config.headless,
-            viewport_width=config.viewport_width,
-            viewport_height=config.viewport_height,
-            click_timeout_ms=config.click_timeout_ms,
-            locale=locale,
-            proxy_url=config.proxy_url,
-        )
-
-    if backend == BrowserBackend.CDP:
-        from .cdp_client import CDPBrowserClient
-
-        endpoint = config.cdp_endpoint
-        if not endpoint and config.browserbase_api_key:
-            from .browserbase import get_browserbase_endpoint
-
-            endpoint = get_browserbase_endpoint(
-                api_key=config.browserbase_api_key,
-                project_id=config.browserbase_project_id,
-            )
-        if not endpoint:
-            raise ValueError("CDP backend requires either 'cdp_endpoint' or 'browserbase_api_key'")
-
-        if config.proxy_url:
-            logger.warning(
-                "Proxy URL is set but CDP backend connects to an external browser. "
-                "Ensure the external browser was launched with proxy settings."
-            )
-        logger.info("Using CDP browser backend (endpoint: %s, locale=%s)", endpoint, locale)
-        return CDPBrowserClient(
-            cdp_endpoint=endpoint,
-            viewport_width=config.viewport_width,
-            viewport_height=config.viewport_height,
-            click_timeout_ms=config.click_timeout_ms,
-            locale=locale,
-        )
-
-    if backend == BrowserBackend.UNDETECTED:
-        try:
-            import undetected_chromedriver  # type: ignore[import-not-found,import-untyped]  # noqa: F401
-        except ImportError:
-            raise ImportError(
-                "undetected-chromedriver not installed. "
-                "Install with: pip install 'agentic-search-audit[undetected]'"
-            )
-
-        from .undetected_client import UndetectedBrowserClient
-
-        logger.info("Using undetected-chromedriver browser backend (locale=%s)", locale)
-        return UndetectedBrowserClient(
-            headless=config.headless,
-            viewport_width=config.viewport_width,
-            viewport_height=config.viewport_height,
-            click_timeout_ms=config.click_timeout_ms,
-            locale=locale,
-            proxy_url=config.proxy_url,
-        )
-
-    raise ValueError(f"Unknown browser backend: {backend}")
+    builder = _BACKEND_BUILDERS.get(backend)
+    if builder is None:
+        raise ValueError(f"Unknown browser backend: {backend}")
+    return builder(config, locale)
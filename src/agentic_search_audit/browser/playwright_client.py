@@ -2,6 +2,7 @@
 
 import asyncio
 import logging
+import os
 from pathlib import Path
 from typing import Any, Literal
 
@@ -9,7 +10,7 @@ from playwright.async_api import (
     Browser,
     BrowserContext,
     Page,
-    async_playwright,
+    Playwright,
 )
 from playwright.async_api import (
     Error as PlaywrightError,
@@ -18,6 +19,7 @@ from playwright.async_api import (
     TimeoutError as PlaywrightTimeoutError,
 )
 
+from .driver import FIRST_ATTRIBUTE_JS, FIRST_TEXT_JS, get_shared_playwright
 from .stealth import (
     build_stealth_js,
     get_client_hints_headers,
@@ -29,12 +31,67 @@ from .stealth import (
 
 logger = logging.getLogger(__name__)
 
+# Launched browsers are kept after disconnect() and handed to the next client
+# with the same launch options, so batch audits start Chromium once. Browsers
+# belong to the shared driver that launched them and end when it is stopped
+# with close_shared_playwright(), so the driver is part of the pool key.
+BROWSER_POOL_SIZE_ENV = "AUDIT_BROWSER_POOL_SIZE"
+_DEFAULT_BROWSER_POOL_SIZE = 1
+
+_PoolKey = tuple[Playwright, bool, str | None]
+
+_idle_browsers: dict[_PoolKey, list[Browser]] = {}
+
+
+def _browser_pool_size() -> int:
+    """Return how many idle browsers to keep per launch configuration."""
+    try:
+        return max(0, int(os.environ.get(BROWSER_POOL_SIZE_ENV, _DEFAULT_BROWSER_POOL_SIZE)))
+    except ValueError:
+        return _DEFAULT_BROWSER_POOL_SIZE
+
+
+def _drop_stale_browsers(playwright: Playwright) -> None:
+    """Forget idle browsers launched by any driver other than ``playwright``."""
+    stale = [key for key in _idle_browsers if key[0] is not playwright]
+    # Browsers of a stopped driver are already gone; live ones belong to a
+    # driver on an earlier event loop and cannot be closed from this one
+    alive = sum(browser.is_connected() for key in stale for browser in _idle_browsers.pop(key))
+    if alive:
+        logger.warning(
+            "Dropping %d pooled browser(s) from a previous event loop; "
+            "call close_shared_playwright() before the loop ends",
+            alive,
+        )
+
+
+def _take_idle_browser(key: _PoolKey) -> Browser | None:
+    """Pop a still-connected idle browser launched with ``key``, if any."""
+    _drop_stale_browsers(key[0])
+    idle = _idle_browsers.get(key)
+    while idle:
+        browser = idle.pop()
+        if browser.is_connected():
+            return browser
+    return None
+
+
+def _has_pool_room(key: _PoolKey, browser: Browser) -> bool:
+    """Check whether ``browser`` can be returned to the pool."""
+    return browser.is_connected() and len(_idle_browsers.get(key, ())) < _browser_pool_size()
+
 
 class PlaywrightBrowserClient:
     """Client for browser automation using Playwright.
 
     This class provides a clean interface for browser automation tasks
     like navigation, DOM querying, and screenshots using Playwright.
+
+    Each client gets its own context and page. ``disconnect()`` returns the
+    browser process to a per-event-loop pool (sized by the
+    ``AUDIT_BROWSER_POOL_SIZE`` environment variable, default 1; 0 disables
+    pooling) for reuse by the next client with the same headless and proxy
+    settings. Call ``close_shared_playwright()`` before the event loop ends.
     """
 
     def __init__(
@@ -64,6 +121,7 @@ class PlaywrightBrowserClient:
         self.proxy_url = proxy_url
         self._playwright: Any = None
         self._browser: Browser | None = None
+        self._pool_key: _PoolKey | None = None
         self._context: BrowserContext | None = None
         self._page: Page | None = None
 
@@ -76,12 +134,10 @@ class PlaywrightBrowserClient:
         """Async context manager exit."""
         await self.disconnect()
 
-    async def connect(self) -> None:
-        """Launch browser and create page."""
+    async def _launch_browser(self, playwright: Playwright) -> Browser:
+        """Launch a new Chromium process with this client's options."""
         logger.info("Launching Playwright browser...")
 
-        self._playwright = await async_playwright().start()
-
         launch_kwargs: dict[str, Any] = {
             "headless": self.headless,
             "args": [
@@ -103,7 +159,18 @@ class PlaywrightBrowserClient:
             launch_kwargs["proxy"] = {"server": self.proxy_url}
             logger.info("Using proxy: %s", self.proxy_url)
 
-        self._browser = await self._playwright.chromium.launch(**launch_kwargs)
+        return await playwright.chromium.launch(**launch_kwargs)
+
+    async def connect(self) -> None:
+        """Launch (or reuse a pooled) browser and create a fresh context and page."""
+        playwright = await get_shared_playwright()
+        self._playwright = playwright
+        self._pool_key = (playwright, self.headless, self.proxy_url)
+        self._browser = _take_idle_browser(self._pool_key)
+        if self._browser is not None:
+            logger.info("Reusing pooled Playwright browser")
+        else:
+            self._browser = await self._launch_browser(playwright)
         ua = random_user_agent()
         tz = timezone_for_locale(self.locale)
         logger.debug("Selected user-agent: %s, timezone: %s", ua, tz)
@@ -138,43 +205,54 @@ class PlaywrightBrowserClient:
 
         logger.info("Playwright browser launched")
 
-    async def disconnect(self) -> None:
-        """Close browser and cleanup.
-
-        Each resource is closed independently so a failure in one
-        does not prevent cleanup of the others.
-        """
-        if self._page:
-            try:
-                await self._page.close()
-            except Exception as e:
-                logger.warning(f"Failed to close page: {e}")
-            finally:
-                self._page = None
+    async def disconnect(self, release_to_pool: bool = True) -> None:
+        """Close this client's context and release the browser.
 
-        if self._context:
-            try:
-                await self._context.close()
-            except Exception as e:
-                logger.warning(f"Failed to close context: {e}")
-            finally:
-                self._context = None
+        The browser goes back to the pool when there is room; otherwise it is
+        closed, which also closes its contexts and pages in one call. Each step
+        is independent so a failure in one does not prevent the rest.
 
-        if self._browser:
-            try:
-                await self._browser.close()
-            except Exception as e:
-                logger.warning(f"Failed to close browser: {e}")
-            finally:
-                self._browser = None
+        Args:
+            release_to_pool: Set to False to always close the browser, e.g. when
+                it is suspected to be broken.
+        """
+        browser = self._browser
+        pool_key = self._pool_key
+        keep_browser = (
+            release_to_pool
+            and browser is not None
+            and pool_key is not None
+            and _has_pool_room(pool_key, browser)
+        )
 
-        if self._playwright:
-            try:
-                await self._playwright.stop()
-            except Exception as e:
-                logger.warning(f"Failed to stop playwright: {e}")
-            finally:
-                self._playwright = None
+        if browser is None or keep_browser:
+            if self._context:
+                try:
+                    await self._context.close()
+                except Exception as e:
+                    logger.warning(f"Failed to close context: {e}")
+                    keep_browser = False
+            elif self._page:
+                try:
+                    await self._page.close()
+                except Exception as e:
+                    logger.warning(f"Failed to close page: {e}")
+
+        if browser is not None:
+            if keep_browser and pool_key is not None:
+                _idle_browsers.setdefault(pool_key, []).append(browser)
+            else:
+                try:
+                    await browser.close()
+                except Exception as e:
+                    logger.warning(f"Failed to close browser: {e}")
+
+        self._browser = None
+        self._pool_key = None
+        self._page = None
+        self._context = None
+        # The driver is shared with other clients; see close_shared_playwright()
+        self._playwright = None
 
         logger.info("Playwright browser closed")
 
@@ -214,8 +292,7 @@ class PlaywrightBrowserClient:
             raise RuntimeError("Browser not connected")
 
         try:
-            element = await self._page.query_selector(selector)
-            if element:
+            if await self._page.locator(selector).count():
                 return {"exists": True}
             return None
         except (PlaywrightTimeoutError, PlaywrightError):
@@ -237,8 +314,8 @@ class PlaywrightBrowserClient:
             raise RuntimeError("Browser not connected")
 
         try:
-            elements = await self._page.query_selector_all(selector)
-            return [{"index": i} for i in range(len(elements))]
+            count = await self._page.locator(selector).count()
+            return [{"index": i} for i in range(count)]
         except (PlaywrightTimeoutError, PlaywrightError):
             raise
         except Exception as e:
@@ -252,17 +329,31 @@ class PlaywrightBrowserClient:
             expression: JavaScript expression to evaluate
 
         Returns:
-            Result of evaluation
+            Result of evaluation, converted to a string
+        """
+        result = await self.evaluate_raw(expression)
+        # Convert to string for compatibility with existing code
+        if result is None:
+            return None
+        return str(result) if not isinstance(result, str) else result
+
+    async def evaluate_raw(self, expression: str) -> Any:
+        """Evaluate JavaScript and return the result as Playwright decodes it.
+
+        Objects and arrays come back as dicts and lists, so callers that need
+        structured data do not have to round-trip it through a string.
+
+        Args:
+            expression: JavaScript expression to evaluate
+
+        Returns:
+            Result of evaluation, or None on failure
         """
         if not self._page:
             raise RuntimeError("Browser not connected")
 
         try:
-            result = await self._page.evaluate(expression)
-            # Convert to string for compatibility with existing code
-            if result is None:
-                return None
-            return str(result) if not isinstance(result, str) else result
+            return await self._page.evaluate(expression)
         except (PlaywrightTimeoutError, PlaywrightError):
             raise
         except Exception as e:
@@ -405,10 +496,8 @@ class PlaywrightBrowserClient:
             raise RuntimeError("Browser not connected")
 
         try:
-            element = await self._page.query_selector(selector)
-            if element:
-                return await element.text_content()
-            return None
+            text: str | None = await self._page.locator(selector).evaluate_all(FIRST_TEXT_JS)
+            return text
         except (PlaywrightTimeoutError, PlaywrightError):
             raise
         except Exception as e:
@@ -445,21 +534,17 @@ class PlaywrightBrowserClient:
     def is_browser_alive(self) -> bool:
         """Check whether the browser process is still running.
 
-        Probes the browser's contexts property; if the process has died,
-        accessing it will raise.
+        ``Browser.is_connected()`` flips to False as soon as Playwright sees
+        the browser disconnect, without a protocol round trip.
         """
-        if not self._browser:
-            return False
-        try:
-            _ = self._browser.contexts
-            return True
-        except Exception:
-            return False
+        return self._browser is not None and self._browser.is_connected()
 
     async def reconnect(self) -> None:
         """Full browser restart: disconnect then connect."""
         logger.warning("Reconnecting browser -- full restart")
-        await self.disconnect()
+        # The old process may still report connected while broken, so never
+        # hand it back to the pool (connect() would take it straight out again)
+        await self.disconnect(release_to_pool=False)
         await self.connect()
 
     async def set_user_agent(self, ua: str) -> None:
@@ -535,8 +620,8 @@ class PlaywrightBrowserClient:
     async def wait_for_page_stable(self, timeout: int = 5000) -> None:
         """Wait for the page to be visually stable.
 
-        Combines network idle waiting with a requestAnimationFrame callback
-        to ensure the page has painted.
+        Combines network idle waiting with a double requestAnimationFrame
+        callback: the second frame only starts once the first has painted.
         """
         if not self._page:
             raise RuntimeError("Browser not connected")
@@ -548,7 +633,7 @@ class PlaywrightBrowserClient:
 
         try:
             await self._page.evaluate(
-                "new Promise(resolve => requestAnimationFrame(() => resolve()))"
+                "new Promise(resolve => requestAnimationFrame(() => requestAnimationFrame(resolve)))"
             )
         except Exception:
             pass
@@ -567,10 +652,10 @@ class PlaywrightBrowserClient:
             raise RuntimeError("Browser not connected")
 
         try:
-            element = await self._page.query_selector(selector)
-            if element:
-                return await element.get_attribute(attribute)
-            return None
+            value: str | None = await self._page.locator(selector).evaluate_all(
+                FIRST_ATTRIBUTE_JS, attribute
+            )
+            return value
         except (PlaywrightTimeoutError, PlaywrightError):
             raise
         except Exception as e:
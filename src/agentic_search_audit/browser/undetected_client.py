@@ -283,14 +283,17 @@ class UndetectedBrowserClient:
         return await asyncio.to_thread(_query_all)
 
     async def evaluate(self, expression: str) -> Any:
+        result = await self.evaluate_raw(expression)
+        if result is None:
+            return None
+        return str(result) if not isinstance(result, str) else result
+
+    async def evaluate_raw(self, expression: str) -> Any:
         if not self._driver:
             raise RuntimeError("Browser not connected")
 
         def _eval() -> Any:
-            result = self._driver.execute_script(f"return {expression.strip()}")
-            if result is None:
-                return None
-            return str(result) if not isinstance(result, str) else result
+            return self._driver.execute_script(f"return {expression.strip()}")
 
         try:
             return await asyncio.to_thread(_eval)
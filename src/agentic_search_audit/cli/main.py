@@ -644,6 +644,11 @@ async def main_async() -> int:
         logger.error(f"Audit failed: {e}", exc_info=True)
         return 1
 
+    finally:
+        from ..browser.driver import close_shared_playwright
+
+        await close_shared_playwright()
+
 
 def main() -> None:
     """Main CLI entrypoint."""
@@ -51,6 +51,10 @@ class BrowserClient(Protocol):
         """Evaluate JavaScript in the page context."""
         ...
 
+    async def evaluate_raw(self, expression: str) -> Any:
+        """Evaluate JavaScript and return the result without string coercion."""
+        ...
+
     async def click(self, selector: str) -> None:
         """Click an element."""
         ...
@@ -1,5 +1,6 @@
 """SQLAlchemy database models."""
 
+import uuid
 from datetime import datetime
 from typing import Any
 from uuid import uuid4
@@ -30,8 +31,9 @@ class User(Base):
     """User account model."""
 
     __tablename__ = "users"
+    __table_args__ = (Index("ix_users_organization", "organization_id"),)
 
-    id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
     email: Mapped[str] = mapped_column(String(255), unique=True, nullable=False, index=True)
     name: Mapped[str | None] = mapped_column(String(255), nullable=True)
     password_hash: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -39,7 +41,7 @@ class User(Base):
     is_admin: Mapped[bool] = mapped_column(Boolean, default=False)
     stripe_customer_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
     plan_id: Mapped[str | None] = mapped_column(String(50), nullable=True)
-    organization_id: Mapped[UUID | None] = mapped_column(
+    organization_id: Mapped[uuid.UUID | None] = mapped_column(
         UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=True
     )
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
@@ -80,9 +82,9 @@ class Organization(Base):
 
     __tablename__ = "organizations"
 
-    id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
-    owner_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    owner_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
@@ -95,8 +97,8 @@ class APIKey(Base):
 
     __tablename__ = "api_keys"
 
-    id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
-    user_id: Mapped[UUID] = mapped_column(
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    user_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("users.id"), nullable=False
     )
     name: Mapped[str] = mapped_column(String(100), nullable=False)
@@ -115,15 +117,17 @@ class Audit(Base):
 
     __tablename__ = "audits"
     __table_args__ = (
-        Index("ix_audits_user_created", "user_id", "created_at"),
+        # Serves per-user listings ordered by (created_at, id) DESC and keyset seeks
+        Index("ix_audits_user_created_id", "user_id", "created_at", "id"),
         Index("ix_audits_status", "status"),
+        Index("ix_audits_organization", "organization_id"),
     )
 
-    id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
-    user_id: Mapped[UUID] = mapped_column(
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    user_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("users.id"), nullable=False
     )
-    organization_id: Mapped[UUID | None] = mapped_column(
+    organization_id: Mapped[uuid.UUID | None] = mapped_column(
         UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=True
     )
     site_url: Mapped[str] = mapped_column(String(2048), nullable=False)
@@ -162,8 +166,8 @@ class AuditResult(Base):
 
     __tablename__ = "audit_results"
 
-    id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
-    audit_id: Mapped[UUID] = mapped_column(
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    audit_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("audits.id"), nullable=False
     )
     query_text: Mapped[str] = mapped_column(String(1000), nullable=False)
@@ -183,8 +187,8 @@ class AuditReport(Base):
 
     __tablename__ = "audit_reports"
 
-    id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
-    audit_id: Mapped[UUID] = mapped_column(
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    audit_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("audits.id"), nullable=False
     )
     format: Mapped[str] = mapped_column(String(10), nullable=False)  # html, md, json
@@ -203,8 +207,8 @@ class UsageRecord(Base):
     __tablename__ = "usage_records"
     __table_args__ = (Index("ix_usage_user_period", "user_id", "period_start"),)
 
-    id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
-    user_id: Mapped[UUID] = mapped_column(
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    user_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("users.id"), nullable=False
     )
     period_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -1,16 +1,56 @@
 """Repository classes for database operations."""
 
+import base64
+import binascii
+from collections import defaultdict
+from collections.abc import AsyncIterator
 from datetime import datetime, timedelta
 from typing import Any
 from uuid import UUID
 
-from sqlalchemy import delete, func, select, update
+from sqlalchemy import Row, delete, func, select, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..api.schemas import UsageRecord as UsageRecordSchema
 from .models import APIKey, Audit, AuditReport, AuditResult, Organization, UsageRecord, User
 
 
+def _audit_summary_columns() -> tuple[Any, ...]:
+    """Columns projected for audit list rows, matching ``AuditSummary``."""
+    return (
+        Audit.id,
+        Audit.site_url,
+        Audit.status,
+        func.json_array_length(Audit.queries).label("query_count"),
+        Audit.completed_queries,
+        Audit.average_score,
+        Audit.created_at,
+        Audit.started_at,
+        Audit.completed_at,
+        Audit.error_message,
+    )
+
+
+def encode_audit_cursor(created_at: datetime, audit_id: Any) -> str:
+    """Encode an audit's sort key as an opaque pagination cursor."""
+    raw = f"{created_at.isoformat()}|{audit_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_audit_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Decode a pagination cursor into ``(created_at, id)``.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, audit_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), UUID(audit_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError("Invalid pagination cursor") from e
+
+
 class UserRepository:
     """Repository for user operations."""
 
@@ -33,6 +73,16 @@ class UserRepository:
         await self.session.flush()
         return user
 
+    async def create_many(self, users: list[dict[str, Any]]) -> list[User]:
+        """Create several users in one flush.
+
+        Each item holds ``email``, ``password_hash`` and optionally ``name``.
+        """
+        rows = [User(**data) for data in users]
+        self.session.add_all(rows)
+        await self.session.flush()
+        return rows
+
     async def get_by_id(self, user_id: UUID) -> User | None:
         """Get user by ID."""
         result = await self.session.execute(select(User).where(User.id == user_id))
@@ -45,11 +95,21 @@ class UserRepository:
         row: User | None = result.scalar_one_or_none()
         return row
 
+    async def get_existing_emails(self, emails: list[str]) -> set[str]:
+        """Return which of the given emails already belong to a user."""
+        result = await self.session.execute(select(User.email).where(User.email.in_(emails)))
+        return set(result.scalars().all())
+
     async def update(self, user_id: UUID, **kwargs: Any) -> User | None:
-        """Update user attributes."""
-        await self.session.execute(update(User).where(User.id == user_id).values(**kwargs))
-        await self.session.flush()
-        return await self.get_by_id(user_id)
+        """Update user attributes and return the updated user.
+
+        Uses ``UPDATE ... RETURNING`` so the fresh row comes back in the same
+        round trip.
+        """
+        result = await self.session.execute(
+            update(User).where(User.id == user_id).values(**kwargs).returning(User)
+        )
+        return result.scalar_one_or_none()
 
 
 class OrganizationRepository:
@@ -77,6 +137,43 @@ class OrganizationRepository:
         row: Organization | None = result.scalar_one_or_none()
         return row
 
+    async def get_detail(self, org_id: UUID, user_id: UUID) -> Row[Any] | None:
+        """Get an organization with its counts and the user's membership in one query.
+
+        Returns:
+            Row with ``id``, ``name``, ``created_at``, ``member_count``,
+            ``audit_count`` and ``is_member``, or None if the organization
+            does not exist
+        """
+        member_count = (
+            select(func.count())
+            .select_from(User)
+            .where(User.organization_id == Organization.id)
+            .scalar_subquery()
+        )
+        audit_count = (
+            select(func.count())
+            .select_from(Audit)
+            .where(Audit.organization_id == Organization.id)
+            .scalar_subquery()
+        )
+        is_member = (
+            select(User.id)
+            .where(User.id == user_id, User.organization_id == Organization.id)
+            .exists()
+        )
+        result = await self.session.execute(
+            select(
+                Organization.id,
+                Organization.name,
+                Organization.created_at,
+                member_count.label("member_count"),
+                audit_count.label("audit_count"),
+                is_member.label("is_member"),
+            ).where(Organization.id == org_id)
+        )
+        return result.one_or_none()
+
     async def is_member(self, org_id: UUID, user_id: UUID) -> bool:
         """Check if user is member of organization."""
         result = await self.session.execute(
@@ -217,7 +314,7 @@ class AuditRepository:
         total = count_result.scalar() or 0
 
         # Get paginated results
-        query = query.order_by(Audit.created_at.desc())
+        query = query.order_by(Audit.created_at.desc(), Audit.id.desc())
         query = query.offset((page - 1) * page_size).limit(page_size)
 
         result = await self.session.execute(query)
@@ -225,6 +322,125 @@ class AuditRepository:
 
         return audits, total
 
+    async def iter_batches_by_user(
+        self, user_id: UUID, batch_size: int = 500
+    ) -> AsyncIterator[list[Audit]]:
+        """Yield all of a user's audits, newest first, in keyset-paginated batches.
+
+        Only one batch of ORM objects is loaded at a time, so callers can walk
+        every audit without a row limit or an up-front full fetch.
+        """
+        filters = [Audit.user_id == user_id]
+        while True:
+            result = await self.session.execute(
+                select(Audit)
+                .where(*filters)
+                .order_by(Audit.created_at.desc(), Audit.id.desc())
+                .limit(batch_size)
+            )
+            audits = list(result.scalars().all())
+            if not audits:
+                return
+
+            yield audits
+
+            if len(audits) < batch_size:
+                return
+            last = audits[-1]
+            filters = [
+                Audit.user_id == user_id,
+                tuple_(Audit.created_at, Audit.id) < tuple_(last.created_at, last.id),
+            ]
+
+    async def list_summaries_by_user(
+        self,
+        user_id: UUID,
+        page: int = 1,
+        page_size: int = 20,
+        status: str | None = None,
+    ) -> tuple[list[Row[Any]], int]:
+        """List audit summary rows for a user with pagination.
+
+        Projects only the columns needed for ``AuditSummary`` and computes the
+        query count and total in the database, so a page costs one round trip.
+        """
+        filters = [Audit.user_id == user_id]
+        if status:
+            filters.append(Audit.status == status)
+
+        query = (
+            select(*_audit_summary_columns(), func.count().over().label("total"))
+            .where(*filters)
+            .order_by(Audit.created_at.desc(), Audit.id.desc())
+            .offset((page - 1) * page_size)
+            .limit(page_size)
+        )
+
+        result = await self.session.execute(query)
+        rows = list(result.all())
+        if rows:
+            return rows, rows[0].total
+
+        # Past the last page the window count has no row to ride on
+        if page == 1:
+            return rows, 0
+        count_result = await self.session.execute(
+            select(func.count()).select_from(Audit).where(*filters)
+        )
+        return rows, count_result.scalar() or 0
+
+    async def list_by_user_keyset(
+        self,
+        user_id: UUID,
+        cursor: str | None = None,
+        limit: int = 20,
+        status: str | None = None,
+    ) -> tuple[list[Row[Any]], str | None, int | None]:
+        """List audit summary rows for a user after a keyset cursor.
+
+        Seeks on ``(created_at, id)`` instead of skipping rows with OFFSET,
+        so every page costs the same regardless of depth. The total is only
+        counted on the first page.
+
+        Returns:
+            Tuple of (rows, next_cursor, total)
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        filters = [Audit.user_id == user_id]
+        if status:
+            filters.append(Audit.status == status)
+        if cursor is not None:
+            created_at, audit_id = decode_audit_cursor(cursor)
+            filters.append(tuple_(Audit.created_at, Audit.id) < tuple_(created_at, audit_id))
+
+        columns = _audit_summary_columns()
+        if cursor is None:
+            columns += (func.count().over().label("total"),)
+
+        # Fetch one extra row to learn whether another page follows
+        query = (
+            select(*columns)
+            .where(*filters)
+            .order_by(Audit.created_at.desc(), Audit.id.desc())
+            .limit(limit + 1)
+        )
+
+        result = await self.session.execute(query)
+        rows = list(result.all())
+
+        total = None
+        if cursor is None:
+            total = rows[0].total if rows else 0
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_audit_cursor(rows[-1].created_at, rows[-1].id)
+
+        return rows, next_cursor, total
+
     async def update_status(
         self,
         audit_id: UUID,
@@ -289,6 +505,21 @@ class AuditRepository:
         )
         return list(result.scalars().all())
 
+    async def get_results_for_audits(self, audit_ids: list[UUID]) -> dict[UUID, list[AuditResult]]:
+        """Get results for several audits in one query, grouped by audit ID."""
+        grouped: dict[UUID, list[AuditResult]] = defaultdict(list)
+        if not audit_ids:
+            return grouped
+
+        result = await self.session.execute(
+            select(AuditResult)
+            .where(AuditResult.audit_id.in_(audit_ids))
+            .order_by(AuditResult.created_at)
+        )
+        for audit_result in result.scalars():
+            grouped[audit_result.audit_id].append(audit_result)
+        return grouped
+
     async def add_report(
         self,
         audit_id: UUID,
@@ -318,7 +549,31 @@ class AuditRepository:
 
     async def delete(self, audit_id: UUID) -> None:
         """Delete an audit and all related data."""
-        await self.session.execute(delete(Audit).where(Audit.id == audit_id))
+        await self.delete_many([audit_id])
+
+    async def delete_by_user(self, user_id: UUID) -> None:
+        """Delete all of a user's audits and their related data without loading them."""
+        user_audit_ids = select(Audit.id).where(Audit.user_id == user_id)
+        await self.session.execute(
+            delete(AuditResult).where(AuditResult.audit_id.in_(user_audit_ids))
+        )
+        await self.session.execute(
+            delete(AuditReport).where(AuditReport.audit_id.in_(user_audit_ids))
+        )
+        await self.session.execute(delete(Audit).where(Audit.user_id == user_id))
+
+    async def delete_many(self, audit_ids: list[UUID]) -> None:
+        """Delete several audits and all related data.
+
+        Bulk deletes bypass ORM cascades and the foreign keys have no
+        ``ON DELETE CASCADE``, so results and reports are removed first.
+        """
+        if not audit_ids:
+            return
+
+        await self.session.execute(delete(AuditResult).where(AuditResult.audit_id.in_(audit_ids)))
+        await self.session.execute(delete(AuditReport).where(AuditReport.audit_id.in_(audit_ids)))
+        await self.session.execute(delete(Audit).where(Audit.id.in_(audit_ids)))
 
 
 class UsageRepository:
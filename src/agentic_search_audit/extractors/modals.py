@@ -680,17 +680,13 @@ class ModalHandler:
             """
 
             try:
-                result = await self.client.evaluate(script)
-                if result and isinstance(result, str):
-                    import json
-
-                    data = json.loads(result)
-                    if data:
-                        logger.debug(
-                            f"Found close button: {data['selector']}[{data['index']}]"
-                            f" with text '{data['text']}'"
-                        )
-                        return (data["selector"], data["index"])
+                data = await self.client.evaluate_raw(script)
+                if data and isinstance(data, dict):
+                    logger.debug(
+                        f"Found close button: {data['selector']}[{data['index']}]"
+                        f" with text '{data['text']}'"
+                    )
+                    return (data["selector"], data["index"])
             except Exception as e:
                 logger.debug(f"Error evaluating script for {base_selector}: {e}")
                 continue
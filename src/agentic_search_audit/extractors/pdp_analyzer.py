@@ -328,7 +328,7 @@ class PdpAnalyzer:
             }};
         }})()
         """
-        result = await self.client.evaluate(js)
+        result = await self.client.evaluate_raw(js)
         if result and isinstance(result, dict) and result.get("found") == "true":
             return dict(result)
         return None
@@ -399,7 +399,7 @@ class PdpAnalyzer:
                 }};
             }})()
             """
-            result = await self.client.evaluate(js)
+            result = await self.client.evaluate_raw(js)
             if result and isinstance(result, dict) and result.get("found") == "true":
                 return dict(result)
         except Exception as e:
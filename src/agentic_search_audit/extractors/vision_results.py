@@ -183,7 +183,7 @@ class VisionResultsExtractor:
             page_url = await self.client.evaluate("window.location.href") or ""
 
             # Find all <a> elements with href and visible text, return title→href mapping
-            result = await self.client.evaluate(f"""
+            mapping = await self.client.evaluate_raw(f"""
                 (function() {{
                     var titles = {titles_json};
                     var mapping = {{}};
@@ -240,12 +240,11 @@ class VisionResultsExtractor:
                             mapping[t.toString()] = bestHref;
                         }}
                     }}
-                    return JSON.stringify(mapping);
+                    return mapping;
                 }})()
             """)
 
-            if result and result not in ("null", "undefined", "{}"):
-                mapping = _json.loads(result) if isinstance(result, str) else result
+            if mapping and isinstance(mapping, dict):
                 enriched = 0
                 for idx_str, href in mapping.items():
                     idx = int(idx_str)
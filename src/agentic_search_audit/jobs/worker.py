@@ -6,84 +6,33 @@ import logging
 import signal
 from datetime import datetime
 from typing import Any
-from urllib.parse import urlparse
 from uuid import UUID
 
 logger = logging.getLogger(__name__)
 
-# Allowed schemes for webhook URLs
-WEBHOOK_ALLOWED_SCHEMES = {"http", "https"}
-
-# Blocked hostnames for webhook URLs (SSRF prevention)
-WEBHOOK_BLOCKED_HOSTS = {
-    "localhost",
-    "127.0.0.1",
-    "0.0.0.0",  # nosec B104 - not binding, blocking this address
-    "::1",
-    "[::1]",
-}
-
-# Blocked IP prefixes (internal networks)
-WEBHOOK_BLOCKED_PREFIXES = (
-    "10.",
-    "192.168.",
-    "172.16.",
-    "172.17.",
-    "172.18.",
-    "172.19.",
-    "172.20.",
-    "172.21.",
-    "172.22.",
-    "172.23.",
-    "172.24.",
-    "172.25.",
-    "172.26.",
-    "172.27.",
-    "172.28.",
-    "172.29.",
-    "172.30.",
-    "172.31.",
-    "169.254.",
-)
-
 
 def validate_webhook_url(url: str) -> bool:
     """Validate webhook URL to prevent SSRF attacks.
 
+    Applies the same rules as the API's webhook_url field, so URLs stored
+    before those rules tightened are re-checked at send time.
+
     Args:
         url: Webhook URL to validate
 
     Returns:
         True if URL is safe to call, False otherwise
     """
-    try:
-        parsed = urlparse(url)
-
-        # Check scheme
-        if parsed.scheme.lower() not in WEBHOOK_ALLOWED_SCHEMES:
-            logger.warning(f"Webhook URL blocked: invalid scheme '{parsed.scheme}'")
-            return False
-
-        # Check host
-        hostname = (parsed.hostname or "").lower()
-
-        if hostname in WEBHOOK_BLOCKED_HOSTS:
-            logger.warning("Webhook URL blocked: localhost/loopback address")
-            return False
+    from pydantic import ValidationError
 
-        if hostname.startswith(WEBHOOK_BLOCKED_PREFIXES):
-            logger.warning("Webhook URL blocked: internal network address")
-            return False
-
-        # Check for IPv6 loopback
-        if hostname.startswith("[") and "::1" in hostname:
-            logger.warning("Webhook URL blocked: IPv6 loopback")
-            return False
+    from ..api.schemas import WEBHOOK_URL_ADAPTER
 
+    try:
+        WEBHOOK_URL_ADAPTER.validate_python(url)
         return True
-
-    except Exception as e:
-        logger.warning(f"Webhook URL validation error: {e}")
+    except ValidationError as e:
+        reason = e.errors()[0]["msg"] if e.errors() else str(e)
+        logger.warning(f"Webhook URL blocked: {reason}")
         return False
 
 
@@ -153,6 +102,10 @@ class AuditWorker:
             await self._pubsub.unsubscribe()
             await self._redis.close()
 
+            from ..browser.driver import close_shared_playwright
+
+            await close_shared_playwright()
+
             logger.info("Worker stopped")
 
     async def stop(self) -> None:
@@ -5,7 +5,8 @@ import asyncio
 # Mock environment variables before importing app
 import os
 from collections.abc import AsyncGenerator, Generator
-from unittest.mock import AsyncMock, MagicMock, patch
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, patch
 from uuid import uuid4
 
 import pytest
@@ -66,6 +67,16 @@ def clear_prometheus_registry():
     yield
 
 
+@pytest.fixture(autouse=True)
+def clear_health_cache():
+    """Reset cached health probe results so each test probes afresh."""
+    from agentic_search_audit.api.routes import health
+
+    health._health_cache = None
+    yield
+    health._health_cache = None
+
+
 @pytest.fixture
 def mock_db_session():
     """Mock database session."""
@@ -87,11 +98,9 @@ def mock_redis():
     redis.hset = AsyncMock(return_value=True)
     redis.lpush = AsyncMock(return_value=1)
     redis.expire = AsyncMock(return_value=True)
-    redis.zremrangebyscore = AsyncMock(return_value=0)
-    redis.zcard = AsyncMock(return_value=0)
-    redis.zadd = AsyncMock(return_value=1)
-    redis.pipeline = MagicMock()
-    redis.pipeline.return_value.execute = AsyncMock(return_value=[0, 0, 1, True])
+    # Rate limiter script returns [current_window_count, previous_window_count]
+    redis.script_load = AsyncMock(return_value="ratelimit-sha")
+    redis.evalsha = AsyncMock(return_value=[1, 0])
     return redis
 
 
@@ -141,15 +150,25 @@ def app_with_mocks(mock_db_session, mock_redis, mock_user):
         patch("agentic_search_audit.api.deps.get_db_session") as mock_get_db,
     ):
 
+        @asynccontextmanager
         async def mock_db_generator():
             yield mock_db_session
 
         mock_get_db.return_value = mock_db_generator()
         mock_factory.return_value.__aenter__.return_value = mock_db_session
 
+        from fastapi import Depends
+
         from agentic_search_audit.api.main import create_app
+        from agentic_search_audit.api.routes.auth import get_current_payload
+        from agentic_search_audit.api.routes.users import get_current_user
+
+        async def mock_current_user(payload: dict = Depends(get_current_payload)):
+            # Token is still verified; only the DB user lookup is mocked
+            return mock_user
 
         app = create_app()
+        app.dependency_overrides[get_current_user] = mock_current_user
         yield app
 
 
@@ -1,5 +1,6 @@
 """Tests for audit endpoints."""
 
+from contextlib import asynccontextmanager
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
@@ -40,6 +41,7 @@ class TestCreateAudit:
             mock_usage.audit_count = 5
             mock_usage_repo.get_current_period = AsyncMock(return_value=mock_usage)
 
+            @asynccontextmanager
             async def mock_db_gen():
                 yield mock_db_session
 
@@ -84,6 +86,7 @@ class TestCreateAudit:
             mock_usage_repo = MagicMock()
             mock_usage_repo.get_current_period = AsyncMock(return_value=mock_usage)
 
+            @asynccontextmanager
             async def mock_db_gen():
                 yield mock_db_session
 
@@ -108,7 +111,7 @@ class TestListAudits:
     def test_list_audits_empty(self, client, auth_headers, mock_db_session):
         """Test listing audits when none exist."""
         with (
-            patch("agentic_search_audit.api.routes.audits.verify_token") as mock_verify,
+            patch("agentic_search_audit.api.routes.auth.verify_token") as mock_verify,
             patch(DB_SESSION_PATCH) as mock_get_db,
         ):
 
@@ -116,8 +119,9 @@ class TestListAudits:
             mock_verify.return_value = {"sub": str(user_id)}
 
             mock_repo = MagicMock()
-            mock_repo.list_by_user = AsyncMock(return_value=([], 0))
+            mock_repo.list_by_user_keyset = AsyncMock(return_value=([], None, 0))
 
+            @asynccontextmanager
             async def mock_db_gen():
                 yield mock_db_session
 
@@ -134,7 +138,7 @@ class TestListAudits:
     def test_list_audits_with_pagination(self, client, auth_headers, mock_db_session):
         """Test listing audits with pagination."""
         with (
-            patch("agentic_search_audit.api.routes.audits.verify_token") as mock_verify,
+            patch("agentic_search_audit.api.routes.auth.verify_token") as mock_verify,
             patch(DB_SESSION_PATCH) as mock_get_db,
         ):
 
@@ -145,7 +149,7 @@ class TestListAudits:
             mock_audit.id = uuid4()
             mock_audit.site_url = "https://example.com"
             mock_audit.status = "completed"
-            mock_audit.queries = ["q1", "q2"]
+            mock_audit.query_count = 2
             mock_audit.completed_queries = 2
             mock_audit.average_score = 4.5
             mock_audit.created_at = datetime.utcnow()
@@ -154,20 +158,90 @@ class TestListAudits:
             mock_audit.error_message = None
 
             mock_repo = MagicMock()
-            mock_repo.list_by_user = AsyncMock(return_value=([mock_audit], 1))
+            mock_repo.list_by_user_keyset = AsyncMock(return_value=([mock_audit], None, 1))
 
+            @asynccontextmanager
             async def mock_db_gen():
                 yield mock_db_session
 
             mock_get_db.return_value = mock_db_gen()
 
             with patch(AUDIT_REPO_PATCH, return_value=mock_repo):
-                _ = client.get(
+                response = client.get(
                     "/audits?page=1&page_size=10",
                     headers=auth_headers,
                 )
 
-            # Would return 200 with paginated results
+            assert response.status_code == 200
+            body = response.json()
+            assert body["total"] == 1
+            assert body["pages"] == 1
+            assert body["next_cursor"] is None
+            item = body["items"][0]
+            assert item["id"] == str(mock_audit.id)
+            assert item["status"] == "completed"
+            assert item["query_count"] == 2
+            assert item["created_at"] == mock_audit.created_at.isoformat()
+
+            # The hand-encoded page still matches the documented response schema
+            from agentic_search_audit.api.schemas import AuditListResponse
+
+            assert AuditListResponse.model_validate(body).items[0].id == mock_audit.id
+
+    def test_list_audits_with_cursor(self, client, auth_headers, mock_db_session):
+        """Test listing audits by cursor skips the total count."""
+        with (
+            patch("agentic_search_audit.api.routes.auth.verify_token") as mock_verify,
+            patch(DB_SESSION_PATCH) as mock_get_db,
+        ):
+
+            user_id = uuid4()
+            mock_verify.return_value = {"sub": str(user_id)}
+
+            mock_repo = MagicMock()
+            mock_repo.list_by_user_keyset = AsyncMock(return_value=([], "next", None))
+
+            @asynccontextmanager
+            async def mock_db_gen():
+                yield mock_db_session
+
+            mock_get_db.return_value = mock_db_gen()
+
+            with patch(AUDIT_REPO_PATCH, return_value=mock_repo):
+                response = client.get(
+                    "/audits?cursor=abc&page_size=10",
+                    headers=auth_headers,
+                )
+
+            assert response.status_code == 200
+            body = response.json()
+            assert body["total"] is None
+            assert body["pages"] is None
+            assert body["next_cursor"] == "next"
+            assert mock_repo.list_by_user_keyset.call_args.kwargs["cursor"] == "abc"
+
+    def test_list_audits_invalid_cursor(self, client, auth_headers, mock_db_session):
+        """Test listing audits with a malformed cursor."""
+        with (
+            patch("agentic_search_audit.api.routes.auth.verify_token") as mock_verify,
+            patch(DB_SESSION_PATCH) as mock_get_db,
+        ):
+
+            mock_verify.return_value = {"sub": str(uuid4())}
+
+            mock_repo = MagicMock()
+            mock_repo.list_by_user_keyset = AsyncMock(side_effect=ValueError("bad cursor"))
+
+            @asynccontextmanager
+            async def mock_db_gen():
+                yield mock_db_session
+
+            mock_get_db.return_value = mock_db_gen()
+
+            with patch(AUDIT_REPO_PATCH, return_value=mock_repo):
+                response = client.get("/audits?cursor=garbage", headers=auth_headers)
+
+            assert response.status_code == 400
 
 
 class TestGetAudit:
@@ -179,7 +253,7 @@ class TestGetAudit:
         user_id = uuid4()
 
         with (
-            patch("agentic_search_audit.api.routes.audits.verify_token") as mock_verify,
+            patch("agentic_search_audit.api.routes.auth.verify_token") as mock_verify,
             patch(DB_SESSION_PATCH) as mock_get_db,
         ):
 
@@ -203,18 +277,25 @@ class TestGetAudit:
             mock_repo.get_by_id = AsyncMock(return_value=mock_audit)
             mock_repo.get_results = AsyncMock(return_value=[])
 
+            @asynccontextmanager
             async def mock_db_gen():
                 yield mock_db_session
 
             mock_get_db.return_value = mock_db_gen()
 
             with patch(AUDIT_REPO_PATCH, return_value=mock_repo):
-                _ = client.get(
+                response = client.get(
                     f"/audits/{audit_id}",
                     headers=auth_headers,
                 )
 
-            # Would return 200 with audit details
+            assert response.status_code == 200
+            body = response.json()
+            assert body["id"] == str(audit_id)
+            assert body["status"] == "completed"
+            assert body["queries"][0]["text"] == "test query"
+            assert body["config"] == {}
+            assert body["results"] is None
 
     def test_get_audit_not_found(self, client, auth_headers, mock_db_session):
         """Test getting non-existent audit."""
@@ -222,7 +303,7 @@ class TestGetAudit:
         user_id = uuid4()
 
         with (
-            patch("agentic_search_audit.api.routes.audits.verify_token") as mock_verify,
+            patch("agentic_search_audit.api.routes.auth.verify_token") as mock_verify,
             patch(DB_SESSION_PATCH) as mock_get_db,
         ):
 
@@ -231,6 +312,7 @@ class TestGetAudit:
             mock_repo = MagicMock()
             mock_repo.get_by_id = AsyncMock(return_value=None)
 
+            @asynccontextmanager
             async def mock_db_gen():
                 yield mock_db_session
 
@@ -251,7 +333,7 @@ class TestGetAudit:
         other_user_id = uuid4()
 
         with (
-            patch("agentic_search_audit.api.routes.audits.verify_token") as mock_verify,
+            patch("agentic_search_audit.api.routes.auth.verify_token") as mock_verify,
             patch(DB_SESSION_PATCH) as mock_get_db,
         ):
 
@@ -264,6 +346,7 @@ class TestGetAudit:
             mock_repo = MagicMock()
             mock_repo.get_by_id = AsyncMock(return_value=mock_audit)
 
+            @asynccontextmanager
             async def mock_db_gen():
                 yield mock_db_session
 
@@ -287,7 +370,7 @@ class TestCancelAudit:
         user_id = uuid4()
 
         with (
-            patch("agentic_search_audit.api.routes.audits.verify_token") as mock_verify,
+            patch("agentic_search_audit.api.routes.auth.verify_token") as mock_verify,
             patch(DB_SESSION_PATCH) as mock_get_db,
             patch("agentic_search_audit.jobs.tasks.cancel_audit_job") as mock_cancel,
         ):
@@ -305,6 +388,7 @@ class TestCancelAudit:
 
             mock_cancel.return_value = True
 
+            @asynccontextmanager
             async def mock_db_gen():
                 yield mock_db_session
 
@@ -325,7 +409,7 @@ class TestCancelAudit:
         user_id = uuid4()
 
         with (
-            patch("agentic_search_audit.api.routes.audits.verify_token") as mock_verify,
+            patch("agentic_search_audit.api.routes.auth.verify_token") as mock_verify,
             patch(DB_SESSION_PATCH) as mock_get_db,
         ):
 
@@ -339,6 +423,7 @@ class TestCancelAudit:
             mock_repo = MagicMock()
             mock_repo.get_by_id = AsyncMock(return_value=mock_audit)
 
+            @asynccontextmanager
             async def mock_db_gen():
                 yield mock_db_session
 
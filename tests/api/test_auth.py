@@ -1,5 +1,6 @@
 """Tests for authentication endpoints."""
 
+from contextlib import asynccontextmanager
 from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
@@ -29,6 +30,7 @@ class TestRegistration:
 
             mock_repo.create = AsyncMock(return_value=mock_user)
 
+            @asynccontextmanager
             async def mock_db_gen():
                 yield mock_db_session
 
@@ -53,6 +55,7 @@ class TestRegistration:
             mock_repo = MagicMock()
             mock_repo.get_by_email = AsyncMock(return_value=mock_user)
 
+            @asynccontextmanager
             async def mock_db_gen():
                 yield mock_db_session
 
@@ -71,6 +74,119 @@ class TestRegistration:
             # Would return 409 Conflict
 
 
+class TestBulkRegistration:
+    """Test suite for bulk user registration."""
+
+    USERS = [
+        {"email": "a@example.com", "password": "password-a1", "name": "A"},
+        {"email": "b@example.com", "password": "password-b1", "name": "B"},
+    ]
+
+    def _mock_db(self, mock_get_db, mock_db_session):
+        @asynccontextmanager
+        async def mock_db_gen():
+            yield mock_db_session
+
+        mock_get_db.return_value = mock_db_gen()
+
+    def _created_user(self, email):
+        user = MagicMock()
+        user.id = uuid4()
+        user.email = email
+        user.name = email[0].upper()
+        user.is_active = True
+        user.is_admin = False
+        user.organization_id = None
+        user.created_at = "2024-01-01T00:00:00"
+        return user
+
+    def test_bulk_register_success(self, client, auth_headers, mock_db_session, mock_user):
+        """Test admins can create several users with concurrently hashed passwords."""
+        mock_user.is_admin = True
+        mock_repo = MagicMock()
+        mock_repo.get_by_id = AsyncMock(return_value=mock_user)
+        mock_repo.get_existing_emails = AsyncMock(return_value=set())
+        mock_repo.create_many = AsyncMock(
+            return_value=[self._created_user(u["email"]) for u in self.USERS]
+        )
+
+        with (
+            patch(DB_SESSION_PATCH) as mock_get_db,
+            patch(USER_REPO_PATCH, return_value=mock_repo),
+            patch(
+                "agentic_search_audit.api.routes.auth.hash_password",
+                side_effect=lambda pw: f"hashed:{pw}",
+            ),
+        ):
+            self._mock_db(mock_get_db, mock_db_session)
+            response = client.post(
+                "/auth/register/bulk", json={"users": self.USERS}, headers=auth_headers
+            )
+
+        assert response.status_code == 201
+        assert [u["email"] for u in response.json()] == ["a@example.com", "b@example.com"]
+        created = mock_repo.create_many.call_args.args[0]
+        assert [u["password_hash"] for u in created] == [
+            "hashed:password-a1",
+            "hashed:password-b1",
+        ]
+
+    def test_bulk_register_requires_admin(self, client, auth_headers, mock_db_session, mock_user):
+        """Test non-admins cannot bulk register users."""
+        mock_repo = MagicMock()
+        mock_repo.get_by_id = AsyncMock(return_value=mock_user)
+        mock_repo.create_many = AsyncMock()
+
+        with (
+            patch(DB_SESSION_PATCH) as mock_get_db,
+            patch(USER_REPO_PATCH, return_value=mock_repo),
+        ):
+            self._mock_db(mock_get_db, mock_db_session)
+            response = client.post(
+                "/auth/register/bulk", json={"users": self.USERS}, headers=auth_headers
+            )
+
+        assert response.status_code == 403
+        mock_repo.create_many.assert_not_called()
+
+    def test_bulk_register_existing_email(self, client, auth_headers, mock_db_session, mock_user):
+        """Test nothing is created when an email is already registered."""
+        mock_user.is_admin = True
+        mock_repo = MagicMock()
+        mock_repo.get_by_id = AsyncMock(return_value=mock_user)
+        mock_repo.get_existing_emails = AsyncMock(return_value={"b@example.com"})
+        mock_repo.create_many = AsyncMock()
+
+        with (
+            patch(DB_SESSION_PATCH) as mock_get_db,
+            patch(USER_REPO_PATCH, return_value=mock_repo),
+        ):
+            self._mock_db(mock_get_db, mock_db_session)
+            response = client.post(
+                "/auth/register/bulk", json={"users": self.USERS}, headers=auth_headers
+            )
+
+        assert response.status_code == 409
+        assert "b@example.com" in response.json()["detail"]
+        mock_repo.create_many.assert_not_called()
+
+    def test_bulk_register_duplicate_in_request(self, client, auth_headers):
+        """Test duplicate emails within one request are rejected."""
+        response = client.post(
+            "/auth/register/bulk",
+            json={"users": [self.USERS[0], self.USERS[0]]},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 400
+
+    def test_bulk_register_requires_auth(self, client):
+        """Test bulk registration requires authentication."""
+        response = client.post("/auth/register/bulk", json={"users": self.USERS})
+
+        assert response.status_code == 401
+
+
 class TestLogin:
     """Test suite for user login."""
 
@@ -84,6 +200,7 @@ class TestLogin:
             mock_repo = MagicMock()
             mock_repo.get_by_email = AsyncMock(return_value=mock_user)
 
+            @asynccontextmanager
             async def mock_db_gen():
                 yield mock_db_session
 
@@ -110,6 +227,7 @@ class TestLogin:
             mock_repo = MagicMock()
             mock_repo.get_by_email = AsyncMock(return_value=mock_user)
 
+            @asynccontextmanager
             async def mock_db_gen():
                 yield mock_db_session
 
@@ -132,6 +250,7 @@ class TestLogin:
             mock_repo = MagicMock()
             mock_repo.get_by_email = AsyncMock(return_value=None)
 
+            @asynccontextmanager
             async def mock_db_gen():
                 yield mock_db_session
 
@@ -171,6 +290,7 @@ class TestAPIKeys:
             mock_repo = MagicMock()
             mock_repo.create = AsyncMock(return_value=mock_key)
 
+            @asynccontextmanager
             async def mock_db_gen():
                 yield mock_db_session
 
@@ -197,6 +317,7 @@ class TestAPIKeys:
             mock_repo = MagicMock()
             mock_repo.list_by_user = AsyncMock(return_value=[])
 
+            @asynccontextmanager
             async def mock_db_gen():
                 yield mock_db_session
 
@@ -209,3 +330,326 @@ class TestAPIKeys:
                 )
 
             # Would return 200 with list of keys
+
+    def test_list_api_keys_returns_ids(self, client, auth_headers, mock_db_session):
+        """Test listed API keys carry the stored UUIDs."""
+        from datetime import datetime
+
+        with patch(DB_SESSION_PATCH) as mock_get_db:
+            key = MagicMock()
+            key.id = uuid4()
+            key.name = "CI"
+            key.prefix = "abcd1234"
+            key.created_at = datetime(2024, 1, 1)
+            key.expires_at = None
+            key.last_used_at = None
+
+            mock_repo = MagicMock()
+            mock_repo.list_by_user = AsyncMock(return_value=[key])
+
+            @asynccontextmanager
+            async def mock_db_gen():
+                yield mock_db_session
+
+            mock_get_db.return_value = mock_db_gen()
+
+            with patch(APIKEY_REPO_PATCH, return_value=mock_repo):
+                response = client.get("/auth/api-keys", headers=auth_headers)
+
+            assert response.status_code == 200
+            assert response.json()[0]["id"] == str(key.id)
+
+
+class TestCreateAccessToken:
+    """Test suite for access token creation."""
+
+    def test_exp_and_iat_share_one_timestamp(self):
+        """Test token expiry is derived from the same instant as issued-at."""
+        import jwt
+
+        from agentic_search_audit.api.config import get_settings
+        from agentic_search_audit.api.routes.auth import create_access_token
+
+        settings = get_settings()
+        token = create_access_token(uuid4(), settings)
+        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.jwt_algorithm])
+
+        assert payload["exp"] - payload["iat"] == settings.jwt_expiration_seconds
+
+
+class TestORJSONJWT:
+    """Test suite for orjson-backed JWT claim serialization."""
+
+    KEY = "test-signing-key-that-is-at-least-32-bytes"
+
+    def test_tokens_interoperate_with_pyjwt(self):
+        """Test tokens round-trip with stock PyJWT in both directions."""
+        import jwt
+
+        from agentic_search_audit.api.routes.auth import _jwt
+
+        claims = {"sub": "user", "type": "access", "n": 1}
+
+        ours = _jwt.encode(claims, self.KEY, algorithm="HS256")
+        assert ours == jwt.encode(claims, self.KEY, algorithm="HS256")
+        assert jwt.decode(ours, self.KEY, algorithms=["HS256"]) == claims
+        theirs = jwt.encode(claims, self.KEY, algorithm="HS256")
+        assert _jwt.decode(theirs, self.KEY, algorithms=["HS256"]) == claims
+
+    def test_non_object_payload_rejected(self):
+        """Test a signed non-object payload is rejected as invalid."""
+        import jwt
+        import pytest
+
+        from agentic_search_audit.api.routes.auth import _jwt
+
+        token = jwt.api_jws.encode(b"[1, 2]", self.KEY, algorithm="HS256")
+
+        with pytest.raises(jwt.DecodeError):
+            _jwt.decode(token, self.KEY, algorithms=["HS256"])
+
+
+class TestVerifyToken:
+    """Test suite for JWT verification caching."""
+
+    def test_verified_payload_is_cached(self):
+        """Test a verified token is decoded only once."""
+        from agentic_search_audit.api.config import get_settings
+        from agentic_search_audit.api.routes.auth import (
+            _jwt,
+            _token_payload_cache,
+            create_access_token,
+            verify_token,
+        )
+
+        _token_payload_cache.clear()
+        settings = get_settings()
+        token = create_access_token(uuid4(), settings)
+
+        with patch.object(_jwt, "decode", wraps=_jwt.decode) as mock_decode:
+            first = verify_token(token, settings)
+            second = verify_token(token, settings)
+
+        assert first == second
+        assert mock_decode.call_count == 1
+        _token_payload_cache.clear()
+
+    def test_invalid_token_not_cached(self):
+        """Test failed verification is never cached."""
+        from fastapi import HTTPException
+
+        from agentic_search_audit.api.config import get_settings
+        from agentic_search_audit.api.routes.auth import _token_payload_cache, verify_token
+
+        _token_payload_cache.clear()
+
+        for _ in range(2):
+            try:
+                verify_token("not-a-jwt", get_settings())
+            except HTTPException as e:
+                assert e.status_code == 401
+
+        assert len(_token_payload_cache) == 0
+
+    def test_cache_respects_token_expiry(self):
+        """Test cached payloads expire with the token."""
+        import time
+
+        from agentic_search_audit.api.config import get_settings
+        from agentic_search_audit.api.routes.auth import _TokenPayloadCache
+
+        settings = get_settings()
+        cache = _TokenPayloadCache(ttl=300)
+        cache.set("token", settings, {"sub": "user", "exp": time.time() - 1})
+
+        assert cache.get("token", settings) is None
+
+    def test_cache_keyed_by_secret(self):
+        """Test cached payloads are not shared across signing secrets."""
+        from agentic_search_audit.api.config import get_settings
+        from agentic_search_audit.api.routes.auth import _TokenPayloadCache
+
+        settings = get_settings()
+        other = settings.model_copy(update={"secret_key": "another-secret"})
+        cache = _TokenPayloadCache()
+        cache.set("token", settings, {"sub": "user"})
+
+        assert cache.get("token", settings) == {"sub": "user"}
+        assert cache.get("token", other) is None
+
+
+class TestAPIKeyHashing:
+    """Test suite for API key hashing."""
+
+    def test_hash_api_key_is_sha256(self):
+        """Test API keys are hashed with a single SHA-256 digest."""
+        import hashlib
+
+        from agentic_search_audit.api.routes.auth import hash_api_key
+
+        assert hash_api_key("key") == hashlib.sha256(b"key").hexdigest()
+
+    def test_verify_api_key(self):
+        """Test verifying API keys against stored hashes."""
+        from agentic_search_audit.api.routes.auth import (
+            generate_api_key,
+            hash_api_key,
+            verify_api_key,
+        )
+
+        key, _ = generate_api_key()
+        stored = hash_api_key(key)
+
+        assert verify_api_key(key, stored)
+        assert not verify_api_key(key + "x", stored)
+
+    def test_create_api_key_does_not_use_bcrypt(self, client, auth_headers, mock_db_session):
+        """Test API key creation stores a SHA-256 hash instead of bcrypt."""
+        with (
+            patch(DB_SESSION_PATCH) as mock_get_db,
+            patch("agentic_search_audit.api.routes.auth.hash_password") as mock_bcrypt,
+        ):
+            mock_api_key = MagicMock()
+            mock_api_key.id = uuid4()
+            mock_api_key.name = "Test Key"
+            mock_api_key.created_at = "2024-01-01T00:00:00"
+            mock_api_key.expires_at = None
+
+            mock_repo = MagicMock()
+            mock_repo.create = AsyncMock(return_value=mock_api_key)
+
+            @asynccontextmanager
+            async def mock_db_gen():
+                yield mock_db_session
+
+            mock_get_db.return_value = mock_db_gen()
+
+            with patch(APIKEY_REPO_PATCH, return_value=mock_repo):
+                response = client.post(
+                    "/auth/api-keys",
+                    json={"name": "Test Key"},
+                    headers=auth_headers,
+                )
+
+            assert response.status_code == 201
+            mock_bcrypt.assert_not_called()
+            key_hash = mock_repo.create.call_args.kwargs["key_hash"]
+            assert len(key_hash) == 64
+            assert not key_hash.startswith("$2")
+
+
+class TestVerifyPassword:
+    """Test suite for password verification."""
+
+    def test_verify_password(self):
+        """Test verifying passwords against Argon2 hashes."""
+        from agentic_search_audit.api.routes.auth import hash_password, verify_password
+
+        hashed = hash_password("correct-password")
+
+        assert hashed.startswith("$argon2id$")
+        assert verify_password("correct-password", hashed)
+        assert verify_password("correct-password", hashed.encode())
+        assert not verify_password("wrong-password", hashed)
+
+    def test_verify_legacy_bcrypt_password(self):
+        """Test bcrypt hashes created before the Argon2 switch still verify."""
+        import bcrypt
+
+        from agentic_search_audit.api.routes.auth import verify_password
+
+        hashed = bcrypt.hashpw(b"correct-password", bcrypt.gensalt(rounds=4)).decode()
+
+        assert verify_password("correct-password", hashed)
+        assert not verify_password("wrong-password", hashed)
+
+    def test_verify_password_malformed_argon2_hash(self):
+        """Test a corrupt Argon2 hash fails verification instead of raising."""
+        from agentic_search_audit.api.routes.auth import verify_password
+
+        assert not verify_password("password", "$argon2id$garbage")
+
+    def test_repeated_failure_skips_bcrypt(self):
+        """Test a recently rejected password is not re-checked with bcrypt."""
+        import bcrypt
+
+        from agentic_search_audit.api.routes.auth import (
+            _failed_password_cache,
+            verify_password,
+        )
+
+        _failed_password_cache.clear()
+        hashed = bcrypt.hashpw(b"correct-password", bcrypt.gensalt(rounds=4)).decode()
+
+        with patch("bcrypt.checkpw", wraps=bcrypt.checkpw) as mock_checkpw:
+            assert not verify_password("wrong-password", hashed)
+            assert not verify_password("wrong-password", hashed)
+            assert verify_password("correct-password", hashed)
+            assert verify_password("correct-password", hashed)
+
+        # One call for the failure, then every success is verified
+        assert mock_checkpw.call_count == 3
+        _failed_password_cache.clear()
+
+    def test_failed_password_cache_expires(self):
+        """Test failed verifications are only remembered for the TTL."""
+        from agentic_search_audit.api.routes.auth import _FailedPasswordCache
+
+        cache = _FailedPasswordCache(ttl=0)
+        cache.add(b"password", b"hash")
+
+        assert (b"password", b"hash") not in cache
+
+    def test_failed_password_cache_bounded(self):
+        """Test the failed verification cache evicts the oldest entries."""
+        from agentic_search_audit.api.routes.auth import _FailedPasswordCache
+
+        cache = _FailedPasswordCache(maxsize=2)
+        for password in (b"a", b"b", b"c"):
+            cache.add(password, b"hash")
+
+        assert len(cache) == 2
+        assert (b"a", b"hash") not in cache
+        assert (b"c", b"hash") in cache
+
+
+class TestPasswordHashPool:
+    """Test suite for off-loop password hashing."""
+
+    async def test_hash_and_verify_async(self):
+        """Test async wrappers hash and verify on the password hash pool."""
+        import threading
+
+        from agentic_search_audit.api.routes import auth
+
+        loop_thread = threading.get_ident()
+        threads = []
+
+        def record_thread(*args):
+            threads.append(threading.get_ident())
+            return True
+
+        hashed = await auth.hash_password_async("correct-password")
+
+        with patch.object(auth, "verify_password", side_effect=record_thread):
+            assert await auth.verify_password_async("correct-password", hashed)
+
+        assert threads and threads[0] != loop_thread
+        assert await auth.verify_password_async("correct-password", hashed)
+        assert not await auth.verify_password_async("wrong-password", hashed)
+
+    def test_hasher_uses_configured_cost(self):
+        """Test Argon2 parameters come from settings."""
+        from agentic_search_audit.api.config import APISettings
+        from agentic_search_audit.api.routes import auth
+
+        settings = APISettings(password_hash_time_cost=3, password_hash_memory_kib=1024)
+        auth._get_password_hasher.cache_clear()
+        try:
+            with patch.object(auth, "get_settings", return_value=settings):
+                hashed = auth.hash_password("password")
+        finally:
+            auth._get_password_hasher.cache_clear()
+
+        assert "$m=1024,t=3,p=1$" in hashed
+        assert auth.verify_password("password", hashed)
@@ -1,5 +1,7 @@
 """Tests for billing and subscription endpoints."""
 
+import pytest
+
 
 class TestListPlans:
     """Test suite for GET /billing/plans endpoint."""
@@ -35,6 +37,39 @@ class TestListPlans:
             assert "audits_per_month" in plan
             assert "features" in plan
 
+    def test_plans_are_frozen(self):
+        """Test plan definitions cannot be mutated and are shared by reference."""
+        from pydantic import ValidationError
+
+        from agentic_search_audit.api.routes.billing import (
+            PLANS,
+            SubscriptionStatus,
+            _get_plan_by_price_id,
+            _get_price_id_for_plan,
+        )
+
+        with pytest.raises(ValidationError):
+            PLANS["free"].audits_per_month = 1000
+        assert isinstance(PLANS["starter"].features, tuple)
+        assert _get_plan_by_price_id(_get_price_id_for_plan("starter")) is PLANS["starter"]
+        assert hash(PLANS["starter"]) == hash(PLANS["starter"])
+
+        status = SubscriptionStatus(
+            plan=PLANS["free"],
+            status="active",
+            current_period_start="2024-01-01T00:00:00",
+            current_period_end="2024-01-01T00:00:00",
+            cancel_at_period_end=False,
+        )
+        assert status.plan is PLANS["free"]
+
+    def test_list_plans_features_serialized_as_list(self, client):
+        """Test tuple features still serialize as JSON arrays."""
+        response = client.get("/billing/plans")
+
+        assert response.status_code == 200
+        assert all(isinstance(plan["features"], list) for plan in response.json())
+
     def test_list_plans_no_auth_required(self, client):
         """Test plans listing doesn't require auth."""
         response = client.get("/billing/plans")
@@ -131,12 +166,105 @@ class TestCreatePortalSession:
 
 
 class TestStripeWebhook:
-    """Test suite for POST /billing/webhook endpoint.
+    """Test suite for POST /billing/webhook endpoint."""
+
+    SECRET = "whsec_test"
 
-    Note: Most webhook tests require stripe module to be installed.
-    """
+    def _sign(self, payload: bytes, timestamp: int | None = None, secret: str = SECRET) -> str:
+        import hashlib
+        import hmac
+        import time
+
+        ts = str(timestamp if timestamp is not None else int(time.time()))
+        signature = hmac.new(secret.encode(), f"{ts}.".encode() + payload, hashlib.sha256)
+        return f"t={ts},v1={signature.hexdigest()}"
+
+    def _post(self, client, payload: bytes, signature: str | None):
+        import os
+        from unittest.mock import patch
+
+        headers = {"stripe-signature": signature} if signature else {}
+        with patch.dict(os.environ, {"STRIPE_WEBHOOK_SECRET": self.SECRET}):
+            return client.post("/billing/webhook", content=payload, headers=headers)
+
+    def test_webhook_not_configured(self, client):
+        """Test webhook without a configured secret."""
+        import os
+        from unittest.mock import patch
+
+        with patch.dict(os.environ, {}, clear=False):
+            os.environ.pop("STRIPE_WEBHOOK_SECRET", None)
+            response = client.post("/billing/webhook", content=b"{}")
+
+        assert response.status_code == 503
+
+    def test_webhook_valid_signature(self, client):
+        """Test a correctly signed event is dispatched to its handler."""
+        from unittest.mock import AsyncMock, patch
+
+        payload = b'{"type": "customer.subscription.updated", "data": {"object": {"customer": "cus_1", "status": "active"}}}'
+
+        with patch(
+            "agentic_search_audit.api.routes.billing._handle_subscription_updated",
+            new_callable=AsyncMock,
+        ) as mock_handler:
+            response = self._post(client, payload, self._sign(payload))
+
+        assert response.status_code == 200
+        assert response.json() == {"status": "ok"}
+        mock_handler.assert_awaited_once_with({"customer": "cus_1", "status": "active"})
 
-    pass  # Webhook tests require stripe module
+    def test_webhook_invalid_signature(self, client):
+        """Test an event signed with the wrong secret is rejected."""
+        payload = b'{"type": "invoice.paid"}'
+
+        response = self._post(client, payload, self._sign(payload, secret="whsec_other"))
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Invalid signature"
+
+    def test_webhook_non_ascii_signature(self, client):
+        """Test a signature header with non-ASCII characters is rejected, not a 500."""
+        import os
+        from unittest.mock import patch
+
+        payload = b'{"type": "invoice.paid"}'
+        timestamp = self._sign(payload).split(",")[0]
+        header = f"{timestamp},v1=\u00e9\u00e9".encode()
+
+        with patch.dict(os.environ, {"STRIPE_WEBHOOK_SECRET": self.SECRET}):
+            response = client.post(
+                "/billing/webhook", content=payload, headers={"stripe-signature": header}
+            )
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Invalid signature"
+
+    def test_webhook_missing_signature(self, client):
+        """Test an event without a signature header is rejected."""
+        response = self._post(client, b'{"type": "invoice.paid"}', None)
+
+        assert response.status_code == 400
+
+    def test_webhook_stale_timestamp(self, client):
+        """Test replayed events outside the tolerance window are rejected."""
+        import time
+
+        payload = b'{"type": "invoice.paid"}'
+        signature = self._sign(payload, timestamp=int(time.time()) - 3600)
+
+        response = self._post(client, payload, signature)
+
+        assert response.status_code == 400
+
+    def test_webhook_invalid_payload(self, client):
+        """Test a signed but malformed payload is rejected."""
+        payload = b"not json"
+
+        response = self._post(client, payload, self._sign(payload))
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Invalid payload"
 
 
 class TestPlanPricing:
@@ -177,6 +305,29 @@ class TestPlanPricing:
         enterprise_plan = next(p for p in data if p["id"] == "enterprise")
         assert enterprise_plan["audits_per_month"] == -1
 
+    def test_price_id_round_trip(self):
+        """Test plan and Stripe price ID lookups agree for every paid plan."""
+        from agentic_search_audit.api.routes.billing import (
+            PLANS,
+            _get_plan_by_price_id,
+            _get_price_id_for_plan,
+        )
+
+        for plan_id in ("starter", "professional", "enterprise"):
+            price_id = _get_price_id_for_plan(plan_id)
+            assert _get_plan_by_price_id(price_id) is PLANS[plan_id]
+
+    def test_unknown_price_id_maps_to_free(self):
+        """Test unknown Stripe price IDs fall back to the free plan."""
+        from agentic_search_audit.api.routes.billing import (
+            PLANS,
+            _get_plan_by_price_id,
+            _get_price_id_for_plan,
+        )
+
+        assert _get_plan_by_price_id("price_unknown") is PLANS["free"]
+        assert _get_price_id_for_plan("free") == ""
+
 
 class TestEndpointRouting:
     """Test that billing endpoints are properly routed."""
@@ -208,3 +359,242 @@ class TestEndpointRouting:
         """Test /billing/portal route exists."""
         response = client.post("/billing/portal?return_url=https://example.com")
         assert response.status_code == 401
+
+
+class TestSubscriptionCache:
+    """Test caching of Stripe subscription lookups."""
+
+    def _subscribed_user(self, mock_db_session, customer_id):
+        from contextlib import asynccontextmanager
+        from unittest.mock import AsyncMock, MagicMock
+
+        user_data = MagicMock()
+        user_data.stripe_customer_id = customer_id
+        repo = MagicMock()
+        repo.get_by_id = AsyncMock(return_value=user_data)
+
+        @asynccontextmanager
+        async def mock_db_gen():
+            yield mock_db_session
+
+        return repo, mock_db_gen
+
+    def _subscriptions(self):
+        return [
+            {
+                "items": {"data": [{"price": {"id": "price_starter"}}]},
+                "status": "active",
+                "current_period_start": 1_700_000_000,
+                "current_period_end": 1_702_592_000,
+                "cancel_at_period_end": False,
+            }
+        ]
+
+    def test_subscription_fetched_once_within_ttl(self, client, auth_headers, mock_db_session):
+        """Test repeated subscription requests reuse the cached Stripe result."""
+        from unittest.mock import patch
+
+        from agentic_search_audit.api.routes.billing import _subscription_cache
+
+        _subscription_cache.clear()
+        repo, mock_db_gen = self._subscribed_user(mock_db_session, "cus_cached")
+        from unittest.mock import AsyncMock
+
+        list_subscriptions = AsyncMock(return_value=self._subscriptions())
+
+        with (
+            patch("agentic_search_audit.api.deps.get_db_session", side_effect=mock_db_gen),
+            patch("agentic_search_audit.db.repositories.UserRepository", return_value=repo),
+            patch(
+                "agentic_search_audit.api.routes.billing._list_active_subscriptions",
+                list_subscriptions,
+            ),
+        ):
+            first = client.get("/billing/subscription", headers=auth_headers)
+            second = client.get("/billing/subscription", headers=auth_headers)
+
+        assert first.status_code == 200
+        assert first.json() == second.json()
+        assert first.json()["plan"]["id"] == "starter"
+        assert first.json()["current_period_start"] == "2023-11-14T22:13:20"
+        list_subscriptions.assert_awaited_once_with("cus_cached")
+        _subscription_cache.clear()
+
+    def test_free_plan_without_customer(self, client, auth_headers, mock_db_session):
+        """Test users without a Stripe customer get a free plan with one timestamp."""
+        from unittest.mock import AsyncMock, patch
+
+        repo, mock_db_gen = self._subscribed_user(mock_db_session, None)
+        list_subscriptions = AsyncMock()
+
+        with (
+            patch("agentic_search_audit.api.deps.get_db_session", side_effect=mock_db_gen),
+            patch("agentic_search_audit.db.repositories.UserRepository", return_value=repo),
+            patch(
+                "agentic_search_audit.api.routes.billing._list_active_subscriptions",
+                list_subscriptions,
+            ),
+        ):
+            response = client.get("/billing/subscription", headers=auth_headers)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["plan"]["id"] == "free"
+        assert data["current_period_start"] == data["current_period_end"]
+        list_subscriptions.assert_not_called()
+
+    def test_period_read_from_subscription_item(self, client, auth_headers, mock_db_session):
+        """Test API versions without top-level period fields use the first item's period."""
+        from unittest.mock import AsyncMock, patch
+
+        from agentic_search_audit.api.routes.billing import _subscription_cache
+
+        _subscription_cache.clear()
+        repo, mock_db_gen = self._subscribed_user(mock_db_session, "cus_items")
+        subscription = self._subscriptions()[0]
+        item = subscription["items"]["data"][0]
+        item["current_period_start"] = subscription.pop("current_period_start")
+        item["current_period_end"] = subscription.pop("current_period_end")
+
+        with (
+            patch("agentic_search_audit.api.deps.get_db_session", side_effect=mock_db_gen),
+            patch("agentic_search_audit.db.repositories.UserRepository", return_value=repo),
+            patch(
+                "agentic_search_audit.api.routes.billing._list_active_subscriptions",
+                AsyncMock(return_value=[subscription]),
+            ),
+        ):
+            response = client.get("/billing/subscription", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.json()["current_period_start"] == "2023-11-14T22:13:20"
+        assert response.json()["current_period_end"] == "2023-12-14T22:13:20"
+        _subscription_cache.clear()
+
+    async def test_webhook_invalidates_cached_subscription(self):
+        """Test subscription webhooks drop the customer's cached status."""
+        from agentic_search_audit.api.routes.billing import (
+            PLANS,
+            SubscriptionStatus,
+            _cache_subscription,
+            _get_cached_subscription,
+            _handle_subscription_deleted,
+            _handle_subscription_updated,
+        )
+
+        status = SubscriptionStatus(
+            plan=PLANS["starter"],
+            status="active",
+            current_period_start="2024-01-01T00:00:00",
+            current_period_end="2024-02-01T00:00:00",
+            cancel_at_period_end=False,
+        )
+
+        _cache_subscription("cus_1", status)
+        await _handle_subscription_updated({"customer": "cus_1", "status": "past_due"})
+        assert _get_cached_subscription("cus_1") is None
+
+        _cache_subscription("cus_1", status)
+        await _handle_subscription_deleted({"customer": "cus_1"})
+        assert _get_cached_subscription("cus_1") is None
+
+    def test_cached_subscription_expires(self):
+        """Test cached subscription statuses expire after the TTL."""
+        from unittest.mock import MagicMock, patch
+
+        from agentic_search_audit.api.routes import billing
+
+        billing._cache_subscription("cus_2", MagicMock())
+        with patch.object(billing, "_SUBSCRIPTION_CACHE_TTL_SECONDS", -1.0):
+            billing._cache_subscription("cus_3", MagicMock())
+
+        assert billing._get_cached_subscription("cus_2") is not None
+        assert billing._get_cached_subscription("cus_3") is None
+        billing._subscription_cache.clear()
+
+
+class TestStripeSubscriptionLookup:
+    """Test the direct Stripe REST lookup for active subscriptions."""
+
+    def _http(self, status_code, body):
+        from contextlib import asynccontextmanager
+        from unittest.mock import AsyncMock, MagicMock
+
+        response = MagicMock()
+        response.status = status_code
+        response.read = AsyncMock(return_value=body)
+
+        http = MagicMock()
+
+        @asynccontextmanager
+        async def get(*args, **kwargs):
+            yield response
+
+        http.get = MagicMock(side_effect=get)
+        return http
+
+    async def test_returns_subscription_data(self):
+        """Test the REST response is decoded without the Stripe SDK."""
+        from unittest.mock import patch
+
+        from agentic_search_audit.api.routes.billing import _list_active_subscriptions
+
+        http = self._http(200, b'{"object": "list", "data": [{"status": "active"}]}')
+
+        with (
+            patch.dict("os.environ", {"STRIPE_SECRET_KEY": "sk_test_123"}),
+            patch("agentic_search_audit.api.routes.billing._get_stripe_http", return_value=http),
+        ):
+            result = await _list_active_subscriptions("cus_123")
+
+        assert result == [{"status": "active"}]
+        args, kwargs = http.get.call_args
+        assert args == ("/v1/subscriptions",)
+        assert kwargs["params"] == {"customer": "cus_123", "status": "active", "limit": "1"}
+        assert kwargs["auth"].login == "sk_test_123"
+        assert kwargs["headers"] == {"Stripe-Version": "2024-06-20"}
+
+    async def test_error_status_raises_bad_gateway(self):
+        """Test non-200 Stripe responses surface as 502."""
+        from unittest.mock import patch
+
+        from fastapi import HTTPException
+
+        from agentic_search_audit.api.routes.billing import _list_active_subscriptions
+
+        http = self._http(401, b'{"error": {"message": "Invalid API Key"}}')
+
+        with (
+            patch.dict("os.environ", {"STRIPE_SECRET_KEY": "sk_test_123"}),
+            patch("agentic_search_audit.api.routes.billing._get_stripe_http", return_value=http),
+            pytest.raises(HTTPException) as exc_info,
+        ):
+            await _list_active_subscriptions("cus_123")
+
+        assert exc_info.value.status_code == 502
+
+    async def test_not_configured(self):
+        """Test a missing Stripe key is reported as unavailable."""
+        from unittest.mock import patch
+
+        from fastapi import HTTPException
+
+        from agentic_search_audit.api.routes.billing import _list_active_subscriptions
+
+        with (
+            patch.dict("os.environ", {}, clear=True),
+            pytest.raises(HTTPException) as exc_info,
+        ):
+            await _list_active_subscriptions("cus_123")
+
+        assert exc_info.value.status_code == 503
+
+    async def test_http_session_is_shared(self):
+        """Test the Stripe HTTP session is reused until closed."""
+        from agentic_search_audit.api.routes.billing import _get_stripe_http, close_stripe_http
+
+        first = _get_stripe_http()
+        assert _get_stripe_http() is first
+
+        await close_stripe_http()
+        assert first.closed
@@ -23,6 +23,137 @@ class TestDataExport:
         # 401 confirms route exists and accepts params
         assert response.status_code == 401
 
+    def test_export_data_contents(self, client, auth_headers, mock_db_session, mock_user):
+        """Test exported JSON files contain native UUID and datetime values."""
+        import json
+        from contextlib import asynccontextmanager
+        from datetime import datetime
+        from io import BytesIO
+        from unittest.mock import AsyncMock, MagicMock, patch
+        from uuid import uuid4
+        from zipfile import ZIP_STORED, ZipFile
+
+        audit = MagicMock()
+        audit.id = uuid4()
+        audit.site_url = "https://example.com"
+        audit.queries = ["shoes"]
+        audit.status = "completed"
+        audit.created_at = datetime(2024, 1, 1, 12, 0, 0)
+        audit.completed_at = None
+        audit.average_score = 4.5
+
+        result = MagicMock()
+        result.query_text = "shoes"
+        result.items = [{"title": "Shoe", "rank": 1}]
+        result.score = {"overall": 4.5}
+
+        user_repo = MagicMock()
+        user_repo.get_by_id = AsyncMock(return_value=mock_user)
+        audit_repo = MagicMock()
+
+        async def iter_batches(user_id):
+            yield [audit]
+
+        audit_repo.iter_batches_by_user = iter_batches
+        audit_repo.get_results_for_audits = AsyncMock(return_value={audit.id: [result]})
+
+        @asynccontextmanager
+        async def mock_db_gen():
+            yield mock_db_session
+
+        with (
+            patch("agentic_search_audit.api.deps.get_db_session", side_effect=mock_db_gen),
+            patch("agentic_search_audit.db.repositories.UserRepository", return_value=user_repo),
+            patch("agentic_search_audit.db.repositories.AuditRepository", return_value=audit_repo),
+        ):
+            response = client.get("/gdpr/export", headers=auth_headers)
+
+        assert response.status_code == 200
+        with ZipFile(BytesIO(response.content)) as zip_file:
+            assert all(info.compress_type == ZIP_STORED for info in zip_file.infolist())
+            profile = json.loads(zip_file.read("profile.json"))
+            audits = [json.loads(line) for line in zip_file.read("audits.jsonl").splitlines()]
+            metadata = json.loads(zip_file.read("metadata.json"))
+
+        assert profile["id"] == str(mock_user.id)
+        assert profile["organization_id"] is None
+        assert audits[0]["id"] == str(audit.id)
+        assert audits[0]["created_at"] == "2024-01-01T12:00:00"
+        assert audits[0]["completed_at"] is None
+        assert audits[0]["results"] == [
+            {"query": "shoes", "items": [{"title": "Shoe", "rank": 1}], "score": {"overall": 4.5}}
+        ]
+        assert metadata["user_id"] == str(mock_user.id)
+        audit_repo.get_results_for_audits.assert_awaited_once_with([audit.id])
+
+    async def test_export_is_streamed_per_audit(self, mock_db_session):
+        """Test the archive is yielded incrementally and remains a valid ZIP."""
+        import json
+        from contextlib import asynccontextmanager
+        from datetime import datetime, timezone
+        from io import BytesIO
+        from unittest.mock import MagicMock, patch
+        from uuid import uuid4
+        from zipfile import ZipFile
+
+        from agentic_search_audit.api.routes.gdpr import _stream_export
+
+        audits = []
+        for i in range(3):
+            audit = MagicMock()
+            audit.id = uuid4()
+            audit.site_url = f"https://example{i}.com"
+            audit.queries = []
+            audit.status = "completed"
+            audit.created_at = datetime(2024, 1, 1)
+            audit.completed_at = None
+            audit.average_score = None
+            audits.append(audit)
+
+        audit_repo = MagicMock()
+
+        async def iter_batches(user_id):
+            yield audits[:2]
+            yield audits[2:]
+
+        audit_repo.iter_batches_by_user = iter_batches
+
+        @asynccontextmanager
+        async def mock_db_gen():
+            yield mock_db_session
+
+        user_id = uuid4()
+        with (
+            patch("agentic_search_audit.api.deps.get_db_session", side_effect=mock_db_gen),
+            patch("agentic_search_audit.db.repositories.AuditRepository", return_value=audit_repo),
+        ):
+            chunks = [
+                chunk
+                async for chunk in _stream_export(
+                    user_id,
+                    {"id": user_id},
+                    include_audits=True,
+                    include_reports=False,
+                    include_artifacts=False,
+                    export_date=datetime(2024, 6, 1, tzinfo=timezone.utc),
+                )
+            ]
+
+        # profile, one chunk per audit, then the trailing entries/central directory
+        assert len(chunks) == 5
+        with ZipFile(BytesIO(b"".join(chunks))) as zip_file:
+            lines = zip_file.read("audits.jsonl").decode().splitlines()
+            metadata = json.loads(zip_file.read("metadata.json"))
+            assert zip_file.testzip() is None
+
+        assert metadata["export_date"] == "2024-06-01T00:00:00+00:00"
+
+        # JSON Lines: one compact object per line, no enclosing array
+        assert len(lines) == len(audits)
+        exported = [json.loads(line) for line in lines]
+        assert [a["site_url"] for a in exported] == [a.site_url for a in audits]
+        assert "results" not in exported[0]
+
 
 class TestAccountDeletion:
     """Test suite for POST /gdpr/delete endpoint."""
@@ -94,6 +225,42 @@ class TestImmediateDeletion:
         )
         assert response.status_code == 422
 
+    def test_immediate_delete_removes_audits_by_user(
+        self, client, auth_headers, mock_db_session, mock_user
+    ):
+        """Test audits are deleted by user without being loaded first."""
+        from contextlib import asynccontextmanager
+        from unittest.mock import AsyncMock, MagicMock, patch
+
+        user_repo = MagicMock()
+        user_repo.get_by_id = AsyncMock(return_value=mock_user)
+        audit_repo = MagicMock()
+        audit_repo.delete_by_user = AsyncMock()
+
+        @asynccontextmanager
+        async def mock_db_gen():
+            yield mock_db_session
+
+        with (
+            patch("agentic_search_audit.api.deps.get_db_session", side_effect=mock_db_gen),
+            patch("agentic_search_audit.db.repositories.UserRepository", return_value=user_repo),
+            patch("agentic_search_audit.db.repositories.AuditRepository", return_value=audit_repo),
+            patch(
+                "agentic_search_audit.api.routes.gdpr.verify_password_async",
+                AsyncMock(return_value=True),
+            ),
+        ):
+            response = client.post(
+                "/gdpr/delete/immediate",
+                json={"password": "password123", "confirm": True},
+                headers=auth_headers,
+            )
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "deleted"
+        audit_repo.delete_by_user.assert_awaited_once_with(mock_user.id)
+        audit_repo.list_by_user.assert_not_called()
+
 
 class TestConsentStatus:
     """Test suite for GET /gdpr/consent endpoint."""
@@ -132,6 +299,41 @@ class TestUpdateConsent:
         # Without auth, should return 401
         assert response.status_code == 401
 
+    def test_update_consent_single_round_trip(
+        self, client, auth_headers, mock_db_session, mock_user
+    ):
+        """Test the updated consent comes back from the update without a re-read."""
+        from contextlib import asynccontextmanager
+        from datetime import datetime, timezone
+        from unittest.mock import AsyncMock, MagicMock, patch
+
+        updated = MagicMock()
+        updated.consent_marketing = True
+        updated.consent_analytics = True
+        updated.consent_third_party = False
+        updated.consent_updated_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        repo = MagicMock()
+        repo.update = AsyncMock(return_value=updated)
+        repo.get_by_id = AsyncMock()
+
+        @asynccontextmanager
+        async def mock_db_gen():
+            yield mock_db_session
+
+        with (
+            patch("agentic_search_audit.api.deps.get_db_session", side_effect=mock_db_gen),
+            patch("agentic_search_audit.db.repositories.UserRepository", return_value=repo),
+        ):
+            response = client.patch(
+                "/gdpr/consent", json={"marketing_emails": True}, headers=auth_headers
+            )
+
+        assert response.status_code == 200
+        assert response.json()["marketing_emails"] is True
+        repo.update.assert_awaited_once()
+        assert repo.update.call_args.kwargs["consent_marketing"] is True
+        repo.get_by_id.assert_not_called()
+
 
 class TestAccessLog:
     """Test suite for GET /gdpr/access-log endpoint."""
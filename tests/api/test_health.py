@@ -79,6 +79,79 @@ class TestHealthEndpoints:
 
             assert data["status"] == "unhealthy"
 
+    async def test_probes_run_concurrently(self):
+        """Test database and Redis probes overlap instead of running back to back."""
+        import asyncio
+        import time
+
+        from agentic_search_audit.api.config import get_settings
+        from agentic_search_audit.api.routes.health import health_check
+        from agentic_search_audit.api.schemas import ComponentHealth
+
+        async def slow_probe():
+            await asyncio.sleep(0.2)
+            return ComponentHealth(status="healthy", latency_ms=200.0, message=None)
+
+        with (
+            patch("agentic_search_audit.api.routes.health.check_database", side_effect=slow_probe),
+            patch("agentic_search_audit.api.routes.health.check_redis", side_effect=slow_probe),
+        ):
+            start = time.perf_counter()
+            result = await health_check(get_settings())
+            elapsed = time.perf_counter() - start
+
+        assert result.status == "healthy"
+        assert elapsed < 0.35
+
+    async def test_probe_results_shared_within_ttl(self):
+        """Test concurrent and back-to-back probes share one backend check."""
+        import asyncio
+
+        from agentic_search_audit.api.config import get_settings
+        from agentic_search_audit.api.routes.health import health_check, readiness
+        from agentic_search_audit.api.schemas import ComponentHealth
+
+        async def probe():
+            await asyncio.sleep(0.05)
+            return ComponentHealth(status="healthy", latency_ms=50.0, message=None)
+
+        with (
+            patch(
+                "agentic_search_audit.api.routes.health.check_database", side_effect=probe
+            ) as mock_db,
+            patch("agentic_search_audit.api.routes.health.check_redis", side_effect=probe),
+        ):
+            settings = get_settings()
+            results = await asyncio.gather(*(health_check(settings) for _ in range(5)))
+            ready = await readiness(settings)
+
+        assert all(r.status == "healthy" for r in results)
+        assert ready == {"status": "ready"}
+        assert mock_db.call_count == 1
+
+    async def test_probe_results_expire(self):
+        """Test probes run again once the cache window has passed."""
+        import time
+
+        from agentic_search_audit.api.config import get_settings
+        from agentic_search_audit.api.routes import health
+        from agentic_search_audit.api.schemas import ComponentHealth
+
+        healthy = ComponentHealth(status="healthy", latency_ms=1.0, message=None)
+        unhealthy = ComponentHealth(status="unhealthy", latency_ms=1.0, message="down")
+        health._health_cache = (time.monotonic() - 2.0, unhealthy, unhealthy)
+
+        with (
+            patch(
+                "agentic_search_audit.api.routes.health.check_database", return_value=healthy
+            ) as mock_db,
+            patch("agentic_search_audit.api.routes.health.check_redis", return_value=healthy),
+        ):
+            result = await health.health_check(get_settings())
+
+        assert result.status == "healthy"
+        assert mock_db.call_count == 1
+
 
 class TestMetricsEndpoint:
     """Test suite for Prometheus metrics endpoint."""
@@ -1,5 +1,9 @@
 """Tests for API middleware."""
 
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
 
 class TestRateLimiting:
     """Test rate limiting middleware."""
@@ -18,6 +22,357 @@ class TestRateLimiting:
             assert response.status_code == 200
 
 
+class TestRateLimitCheck:
+    """Test the Redis window-counter rate limit check."""
+
+    async def _check(self, mock_redis, max_requests=10, window=60, now=1_000_020.0):
+        from agentic_search_audit.api.middleware import RateLimitMiddleware
+
+        middleware = RateLimitMiddleware(app=MagicMock())
+        with (
+            patch("agentic_search_audit.api.deps._redis_client", mock_redis),
+            patch("agentic_search_audit.api.middleware.time.time", return_value=now),
+            patch("agentic_search_audit.api.middleware._rate_limit_script_sha", None),
+        ):
+            return await middleware._check_rate_limit("user:1", max_requests, window)
+
+    async def test_allows_within_limit(self, mock_redis):
+        """Test a request under the limit is allowed with counter keys per window."""
+        mock_redis.evalsha = AsyncMock(return_value=[3, 0])
+
+        is_allowed, remaining, reset_at = await self._check(mock_redis)
+
+        assert is_allowed is True
+        assert remaining == 7
+        # 1_000_020 falls in bucket 16667 of a 60s window
+        assert reset_at == 16668 * 60
+        args = mock_redis.evalsha.await_args.args
+        assert args[:4] == ("ratelimit-sha", 2, "rl:user:1:16667", "rl:user:1:16666")
+
+    async def test_denies_over_limit(self, mock_redis):
+        """Test a request beyond the limit is denied."""
+        mock_redis.evalsha = AsyncMock(return_value=[11, 0])
+
+        is_allowed, remaining, _ = await self._check(mock_redis)
+
+        assert is_allowed is False
+        assert remaining == 0
+
+    async def test_previous_window_is_weighted(self, mock_redis):
+        """Test the previous window counts in proportion to its overlap."""
+        # 1_000_020 is 0s into its window, so the previous window fully overlaps
+        mock_redis.evalsha = AsyncMock(return_value=[1, 10])
+        is_allowed, _, _ = await self._check(mock_redis, now=1_000_020.0)
+        assert is_allowed is False
+
+        # Halfway through the window only half of the previous count applies
+        is_allowed, remaining, _ = await self._check(mock_redis, now=1_000_050.0)
+        assert is_allowed is True
+        assert remaining == 4
+
+    async def test_loads_script_once(self, mock_redis):
+        """Test the script is registered lazily and then reused via EVALSHA."""
+        from agentic_search_audit.api.middleware import RateLimitMiddleware
+
+        middleware = RateLimitMiddleware(app=MagicMock())
+        with (
+            patch("agentic_search_audit.api.deps._redis_client", mock_redis),
+            patch("agentic_search_audit.api.middleware._rate_limit_script_sha", None),
+        ):
+            await middleware._check_rate_limit("user:1", 10, 60)
+            await middleware._check_rate_limit("user:1", 10, 60)
+
+        mock_redis.script_load.assert_awaited_once()
+        assert mock_redis.evalsha.await_count == 2
+
+    async def test_reloads_script_on_noscript(self, mock_redis):
+        """Test a NOSCRIPT error re-registers the script and retries."""
+        from redis.exceptions import NoScriptError
+
+        mock_redis.evalsha = AsyncMock(side_effect=[NoScriptError("NOSCRIPT"), [1, 0]])
+
+        is_allowed, _, _ = await self._check(mock_redis)
+
+        assert is_allowed is True
+        assert mock_redis.script_load.await_count == 2
+        assert mock_redis.evalsha.await_count == 2
+
+    async def test_fails_closed_on_redis_error(self, mock_redis):
+        """Test Redis failures deny the request."""
+        mock_redis.evalsha = AsyncMock(side_effect=ConnectionError("down"))
+
+        is_allowed, remaining, _ = await self._check(mock_redis)
+
+        assert is_allowed is False
+        assert remaining == 0
+
+
+class TestRateLimitExceededResponse:
+    """Test the 429 response sent when a client is over its limit."""
+
+    def test_rate_limited_request_returns_429(self, client, mock_redis):
+        """Test the pre-encoded body matches the documented error payload."""
+        mock_redis.evalsha = AsyncMock(return_value=[1_000_000, 0])
+
+        response = client.get("/billing/plans")
+
+        assert response.status_code == 429
+        assert response.headers["content-type"] == "application/json"
+        body = response.json()
+        assert body["error"] == "rate_limit_exceeded"
+        assert body["message"] == "Too many requests. Please try again later."
+        assert body["retry_after"] == int(response.headers["Retry-After"])
+        assert response.headers["X-RateLimit-Remaining"] == "0"
+
+
+class TestRateLimitBatcher:
+    """Test coalescing of concurrent rate-limit checks."""
+
+    async def test_concurrent_checks_share_one_pipeline(self, mock_redis):
+        """Test checks issued in the same tick are sent as one pipeline."""
+        from agentic_search_audit.api.middleware import _RateLimitBatcher
+
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[[1, 0], [2, 0], [3, 0]])
+        mock_redis.pipeline = MagicMock(return_value=pipe)
+
+        batcher = _RateLimitBatcher()
+        results = await asyncio.gather(
+            *(batcher.evalsha(mock_redis, "sha", 2, f"k{i}", "p", 60) for i in range(3))
+        )
+
+        assert results == [[1, 0], [2, 0], [3, 0]]
+        mock_redis.pipeline.assert_called_once_with(transaction=False)
+        assert pipe.evalsha.call_count == 3
+        mock_redis.evalsha.assert_not_awaited()
+
+    async def test_single_check_skips_pipeline(self, mock_redis):
+        """Test a lone check is sent as a plain EVAL."""
+        from agentic_search_audit.api.middleware import _RateLimitBatcher
+
+        mock_redis.pipeline = MagicMock()
+        result = await _RateLimitBatcher().evalsha(mock_redis, "sha", 2, "k", "p", 60)
+
+        assert result == [1, 0]
+        mock_redis.pipeline.assert_not_called()
+
+    async def test_errors_propagate_to_each_caller(self, mock_redis):
+        """Test a failed pipeline fails every queued check."""
+        from agentic_search_audit.api.middleware import _RateLimitBatcher
+
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(side_effect=ConnectionError("down"))
+        mock_redis.pipeline = MagicMock(return_value=pipe)
+
+        batcher = _RateLimitBatcher()
+        results = await asyncio.gather(
+            batcher.evalsha(mock_redis, "sha"),
+            batcher.evalsha(mock_redis, "sha"),
+            return_exceptions=True,
+        )
+
+        assert len(results) == 2
+        assert all(isinstance(r, ConnectionError) for r in results)
+
+
+class TestTokenIdentifierCache:
+    """Test the JWT-to-identifier cache used by the rate limiter."""
+
+    def test_get_returns_cached_identifier(self):
+        """Test a stored identifier is returned for the same token."""
+        from agentic_search_audit.api.middleware import _TokenIdentifierCache
+
+        cache = _TokenIdentifierCache()
+        cache.set("token-a", "user:a")
+        assert cache.get("token-a") == "user:a"
+        assert cache.get("token-b") is None
+
+    def test_entry_expires_with_token(self):
+        """Test entries never outlive the token's exp claim."""
+        from agentic_search_audit.api.middleware import _TokenIdentifierCache
+
+        cache = _TokenIdentifierCache(ttl=60)
+        cache.set("token-a", "user:a", token_exp=time.time() - 1)
+        assert cache.get("token-a") is None
+        assert len(cache) == 0
+
+    def test_evicts_least_recently_used(self):
+        """Test the cache stays within maxsize."""
+        from agentic_search_audit.api.middleware import _TokenIdentifierCache
+
+        cache = _TokenIdentifierCache(maxsize=2)
+        cache.set("token-a", "user:a")
+        cache.set("token-b", "user:b")
+        cache.get("token-a")
+        cache.set("token-c", "user:c")
+        assert len(cache) == 2
+        assert cache.get("token-b") is None
+        assert cache.get("token-a") == "user:a"
+
+    async def test_get_identifier_verifies_token_once(self):
+        """Test repeated requests with the same token skip JWT verification."""
+        from agentic_search_audit.api.middleware import (
+            RateLimitMiddleware,
+            _token_identifier_cache,
+        )
+
+        _token_identifier_cache.clear()
+        middleware = RateLimitMiddleware(app=MagicMock())
+        scope = {
+            "type": "http",
+            "headers": [(b"authorization", b"Bearer cached-token")],
+            "client": ("127.0.0.1", 1234),
+        }
+
+        with patch(
+            "agentic_search_audit.api.routes.auth.verify_token",
+            return_value={"sub": "user-1", "exp": time.time() + 3600},
+        ) as mock_verify:
+            assert await middleware._get_identifier(scope) == "user:user-1"
+            assert await middleware._get_identifier(scope) == "user:user-1"
+
+        mock_verify.assert_called_once()
+        _token_identifier_cache.clear()
+
+
+class TestRateLimitSettings:
+    """Test the rate limiter resolves settings once at construction."""
+
+    async def test_uses_settings_passed_at_construction(self, mock_redis):
+        """Test per-request handling reuses the captured settings."""
+        from agentic_search_audit.api.config import APISettings
+        from agentic_search_audit.api.middleware import RateLimitMiddleware
+
+        async def app(scope, receive, send):
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b""})
+
+        middleware = RateLimitMiddleware(app, settings=APISettings(rate_limit_requests=5))
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {"type": "http", "path": "/audits", "headers": [], "client": ("1.2.3.4", 1)}
+        with (
+            patch("agentic_search_audit.api.deps._redis_client", mock_redis),
+            patch("agentic_search_audit.api.middleware.get_settings") as mock_get_settings,
+        ):
+            await middleware(scope, AsyncMock(), send)
+
+        mock_get_settings.assert_not_called()
+        headers = dict(sent[0]["headers"])
+        assert headers[b"x-ratelimit-limit"] == b"5"
+        assert headers[b"x-ratelimit-remaining"] == b"4"
+
+
+class TestRateLimitIdentifier:
+    """Test rate-limit identifier extraction from the ASGI scope."""
+
+    async def test_uses_client_address(self):
+        """Test anonymous requests are keyed by peer address."""
+        from agentic_search_audit.api.middleware import RateLimitMiddleware
+
+        middleware = RateLimitMiddleware(app=MagicMock())
+        scope = {"type": "http", "headers": [], "client": ("10.0.0.1", 1234)}
+        assert await middleware._get_identifier(scope) == "ip:10.0.0.1"
+
+    async def test_prefers_forwarded_for(self):
+        """Test the first X-Forwarded-For hop overrides the peer address."""
+        from agentic_search_audit.api.middleware import RateLimitMiddleware
+
+        middleware = RateLimitMiddleware(app=MagicMock())
+        scope = {
+            "type": "http",
+            "headers": [(b"x-forwarded-for", b"203.0.113.7, 10.0.0.1")],
+            "client": ("10.0.0.1", 1234),
+        }
+        assert await middleware._get_identifier(scope) == "ip:203.0.113.7"
+
+    async def test_invalid_token_falls_back_to_ip(self):
+        """Test an unverifiable bearer token is keyed by address."""
+        from agentic_search_audit.api.middleware import RateLimitMiddleware
+
+        middleware = RateLimitMiddleware(app=MagicMock())
+        scope = {
+            "type": "http",
+            "headers": [(b"authorization", b"Bearer not-a-jwt")],
+            "client": None,
+        }
+        assert await middleware._get_identifier(scope) == "ip:unknown"
+
+    def test_headers_added_to_response(self, client, auth_headers):
+        """Test allowed responses carry rate limit headers."""
+        response = client.get("/billing/plans", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.headers["X-RateLimit-Limit"] == "100"
+        assert response.headers["X-RateLimit-Remaining"] == "99"
+        assert "X-RateLimit-Reset" in response.headers
+
+
+class TestSharedTokenIdentifier:
+    """Test identifiers shared across workers through Redis."""
+
+    async def test_uses_identifier_verified_by_another_worker(self, mock_redis):
+        """Test a Redis hit skips JWT verification."""
+        import orjson
+
+        from agentic_search_audit.api.middleware import (
+            RateLimitMiddleware,
+            _token_identifier_cache,
+        )
+
+        _token_identifier_cache.clear()
+        mock_redis.get = AsyncMock(
+            return_value=orjson.dumps({"ident": "user:shared", "exp": time.time() + 600})
+        )
+        middleware = RateLimitMiddleware(app=MagicMock())
+        scope = {
+            "type": "http",
+            "headers": [(b"authorization", b"Bearer shared-token")],
+            "client": None,
+        }
+
+        with (
+            patch("agentic_search_audit.api.deps._redis_client", mock_redis),
+            patch("agentic_search_audit.api.routes.auth.verify_token") as mock_verify,
+        ):
+            assert await middleware._get_identifier(scope) == "user:shared"
+
+        mock_verify.assert_not_called()
+        assert mock_redis.get.await_args.args[0].startswith("jwt:")
+        _token_identifier_cache.clear()
+
+    async def test_verified_identifier_is_shared_until_expiry(self, mock_redis):
+        """Test a freshly verified token is stored with its remaining lifetime."""
+        from agentic_search_audit.api.middleware import (
+            RateLimitMiddleware,
+            _token_identifier_cache,
+        )
+
+        _token_identifier_cache.clear()
+        middleware = RateLimitMiddleware(app=MagicMock())
+        scope = {
+            "type": "http",
+            "headers": [(b"authorization", b"Bearer fresh-token")],
+            "client": None,
+        }
+
+        with (
+            patch("agentic_search_audit.api.deps._redis_client", mock_redis),
+            patch(
+                "agentic_search_audit.api.routes.auth.verify_token",
+                return_value={"sub": "user-2", "exp": time.time() + 600},
+            ),
+        ):
+            assert await middleware._get_identifier(scope) == "user:user-2"
+
+        mock_redis.set.assert_awaited_once()
+        assert 590 <= mock_redis.set.await_args.kwargs["ex"] <= 600
+        _token_identifier_cache.clear()
+
+
 class TestRequestLogging:
     """Test request logging middleware."""
 
@@ -26,6 +381,37 @@ class TestRequestLogging:
         response = client.get("/health/live")
         assert response.status_code == 200
 
+    def test_queued_logging_swaps_and_restores_handlers(self):
+        """Test root handlers move behind a QueueListener and are restored."""
+        import logging
+        from logging.handlers import QueueHandler
+
+        from agentic_search_audit.api.main import start_queued_logging, stop_queued_logging
+
+        root = logging.getLogger()
+        original = list(root.handlers)
+        records = []
+
+        class CollectingHandler(logging.Handler):
+            def emit(self, record):
+                records.append(record.getMessage())
+
+        collector = CollectingHandler()
+        root.handlers = [collector]
+        try:
+            listener = start_queued_logging()
+            assert listener is not None
+            assert len(root.handlers) == 1
+            assert isinstance(root.handlers[0], QueueHandler)
+
+            root.warning("queued %s", "message")
+            stop_queued_logging(listener)
+
+            assert records == ["queued message"]
+            assert root.handlers == [collector]
+        finally:
+            root.handlers = original
+
     def test_error_requests_logged(self, client):
         """Test error responses are logged."""
         response = client.get("/nonexistent-endpoint")
@@ -85,6 +471,25 @@ class TestSecurityHeaders:
         response = client.get("/health/live")
         assert "content-type" in response.headers
 
+    def test_default_response_class_is_orjson(self, client):
+        """Test routes serialize responses with orjson by default."""
+        from agentic_search_audit.api.main import ORJSONResponse
+
+        assert client.app.router.default_response_class.value is ORJSONResponse
+        response = client.get("/billing/plans")
+        assert response.status_code == 200
+        assert response.json()[0]["id"] == "free"
+
+    def test_orjson_response_renders_compact_json(self):
+        """Test the orjson response class encodes datetimes and compacts output."""
+        from datetime import datetime
+
+        from agentic_search_audit.api.main import ORJSONResponse
+
+        response = ORJSONResponse({"at": datetime(2024, 1, 2, 3, 4, 5), 1: "x"})
+        assert response.body == b'{"at":"2024-01-02T03:04:05","1":"x"}'
+        assert response.media_type == "application/json"
+
     def test_json_content_type(self, client):
         """Test JSON endpoints return JSON content type."""
         response = client.get("/health/live")
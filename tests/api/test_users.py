@@ -1,7 +1,14 @@
 """Tests for user management endpoints."""
 
+import dataclasses
+from contextlib import asynccontextmanager
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
+import orjson
+import pytest
+
 
 class TestGetCurrentUserProfile:
     """Test suite for GET /users/me endpoint."""
@@ -19,6 +26,17 @@ class TestGetCurrentUserProfile:
         )
         assert response.status_code == 401
 
+    def test_get_profile_success(self, client, auth_headers, mock_user):
+        """Test the profile is serialized from the authenticated user."""
+        response = client.get("/users/me", headers=auth_headers)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["id"] == str(mock_user.id)
+        assert data["email"] == mock_user.email
+        assert data["organization_id"] is None
+        assert data["created_at"] == mock_user.created_at.isoformat()
+
 
 class TestUpdateCurrentUser:
     """Test suite for PATCH /users/me endpoint."""
@@ -102,6 +120,60 @@ class TestGetOrganization:
         )
         assert response.status_code == 422
 
+    def _get_with_detail(self, client, auth_headers, mock_db_session, detail):
+        @asynccontextmanager
+        async def mock_db_gen():
+            yield mock_db_session
+
+        mock_repo = MagicMock()
+        mock_repo.get_detail = AsyncMock(return_value=detail)
+
+        with (
+            patch("agentic_search_audit.api.deps.get_db_session", side_effect=mock_db_gen),
+            patch(
+                "agentic_search_audit.db.repositories.OrganizationRepository",
+                return_value=mock_repo,
+            ),
+        ):
+            response = client.get(f"/users/organizations/{uuid4()}", headers=auth_headers)
+        return response, mock_repo
+
+    def test_get_organization_single_query(self, client, auth_headers, mock_db_session):
+        """Test organization details and counts come from one repository call."""
+        detail = MagicMock(
+            id=uuid4(),
+            member_count=3,
+            audit_count=7,
+            is_member=True,
+            created_at=datetime(2024, 1, 1),
+        )
+        detail.name = "Acme"
+
+        response, mock_repo = self._get_with_detail(client, auth_headers, mock_db_session, detail)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["name"] == "Acme"
+        assert data["member_count"] == 3
+        assert data["audit_count"] == 7
+        assert data["created_at"] == "2024-01-01T00:00:00"
+        mock_repo.get_detail.assert_awaited_once()
+        mock_repo.get_member_count.assert_not_called()
+
+    def test_get_organization_not_member(self, client, auth_headers, mock_db_session):
+        """Test non-members are refused."""
+        detail = MagicMock(is_member=False)
+
+        response, _ = self._get_with_detail(client, auth_headers, mock_db_session, detail)
+
+        assert response.status_code == 403
+
+    def test_get_organization_not_found(self, client, auth_headers, mock_db_session):
+        """Test unknown organizations return 404."""
+        response, _ = self._get_with_detail(client, auth_headers, mock_db_session, None)
+
+        assert response.status_code == 404
+
 
 class TestEndpointRouting:
     """Test that endpoints are properly routed."""
@@ -126,3 +198,110 @@ class TestEndpointRouting:
         """Test PATCH /users/me route exists."""
         response = client.patch("/users/me", json={"name": "Test"})
         assert response.status_code == 401
+
+
+class TestGetCurrentUserDependency:
+    """Test the get_current_user dependency."""
+
+    async def test_uses_payload_without_reverifying_token(self, mock_db_session, mock_user):
+        """Test that the user lookup consumes the decoded payload directly."""
+        from agentic_search_audit.api.routes.users import get_current_user
+
+        @asynccontextmanager
+        async def mock_db_gen():
+            yield mock_db_session
+
+        mock_repo = MagicMock()
+        mock_repo.get_by_id = AsyncMock(return_value=mock_user)
+
+        with (
+            patch("agentic_search_audit.api.deps.get_db_session", return_value=mock_db_gen()),
+            patch("agentic_search_audit.db.repositories.UserRepository", return_value=mock_repo),
+            patch("agentic_search_audit.api.routes.auth.verify_token") as mock_verify,
+        ):
+            user = await get_current_user({"sub": str(mock_user.id)})
+
+        assert user.id == mock_user.id
+        assert user.email == mock_user.email
+        mock_repo.get_by_id.assert_awaited_once_with(mock_user.id)
+        mock_verify.assert_not_called()
+
+    async def test_cache_miss_loads_and_caches_user(self, mock_db_session, mock_user, mock_redis):
+        """Test a cache miss reads the database and stores the user in Redis."""
+        from agentic_search_audit.api.routes.users import CurrentUser, get_current_user
+
+        @asynccontextmanager
+        async def mock_db_gen():
+            yield mock_db_session
+
+        mock_repo = MagicMock()
+        mock_repo.get_by_id = AsyncMock(return_value=mock_user)
+
+        with (
+            patch("agentic_search_audit.api.deps._redis_client", mock_redis),
+            patch("agentic_search_audit.api.deps.get_db_session", return_value=mock_db_gen()),
+            patch("agentic_search_audit.db.repositories.UserRepository", return_value=mock_repo),
+        ):
+            user = await get_current_user({"sub": str(mock_user.id)})
+
+        mock_redis.get.assert_awaited_once_with(f"usr:{mock_user.id}")
+        key, value = mock_redis.set.call_args.args
+        assert key == f"usr:{mock_user.id}"
+        assert mock_redis.set.call_args.kwargs["ex"] == 30
+        assert CurrentUser.from_json(value) == user
+
+    async def test_cache_hit_skips_database(self, mock_user, mock_redis):
+        """Test a cached user is returned without a database lookup."""
+        from agentic_search_audit.api.routes.users import CurrentUser, get_current_user
+
+        cached = CurrentUser.from_model(mock_user)
+        mock_redis.get = AsyncMock(return_value=orjson.dumps(dataclasses.asdict(cached)))
+
+        with (
+            patch("agentic_search_audit.api.deps._redis_client", mock_redis),
+            patch("agentic_search_audit.api.deps.get_db_session") as mock_get_db,
+        ):
+            user = await get_current_user({"sub": str(mock_user.id)})
+
+        assert user == cached
+        mock_get_db.assert_not_called()
+
+    async def test_inactive_user_rejected_and_not_cached(
+        self, mock_db_session, mock_user, mock_redis
+    ):
+        """Test disabled accounts are refused and never cached."""
+        from fastapi import HTTPException
+
+        from agentic_search_audit.api.routes.users import get_current_user
+
+        mock_user.is_active = False
+
+        @asynccontextmanager
+        async def mock_db_gen():
+            yield mock_db_session
+
+        mock_repo = MagicMock()
+        mock_repo.get_by_id = AsyncMock(return_value=mock_user)
+
+        with (
+            patch("agentic_search_audit.api.deps._redis_client", mock_redis),
+            patch("agentic_search_audit.api.deps.get_db_session", return_value=mock_db_gen()),
+            patch("agentic_search_audit.db.repositories.UserRepository", return_value=mock_repo),
+            pytest.raises(HTTPException) as exc_info,
+        ):
+            await get_current_user({"sub": str(mock_user.id)})
+
+        assert exc_info.value.status_code == 403
+        mock_redis.set.assert_not_called()
+
+    async def test_invalidate_cached_user(self, mock_redis):
+        """Test invalidation deletes the user's cache entry."""
+        from agentic_search_audit.api.routes.users import invalidate_cached_user
+
+        user_id = uuid4()
+        mock_redis.delete = AsyncMock(return_value=1)
+
+        with patch("agentic_search_audit.api.deps._redis_client", mock_redis):
+            await invalidate_cached_user(user_id)
+
+        mock_redis.delete.assert_awaited_once_with(f"usr:{user_id}")
@@ -182,6 +182,66 @@ class TestAuditCreateRequestValidation:
         assert any("queries" in str(e["loc"]) for e in errors)
 
 
+class TestWebhookUrlValidation:
+    """Tests for SSRF protection on webhook_url."""
+
+    @pytest.mark.parametrize(
+        "webhook_url",
+        [
+            "http://localhost/hook",
+            "http://api.localhost/hook",
+            "http://127.0.0.1/hook",
+            "http://127.1.2.3/hook",
+            "http://0.0.0.0/hook",
+            "http://[::1]/hook",
+            "http://10.0.0.1/hook",
+            "http://172.16.0.1/hook",
+            "http://0xac100001/hook",
+            "http://192.168.1.1/hook",
+            "http://169.254.169.254/latest/meta-data",
+            "http://[::ffff:10.0.0.1]/hook",
+            "http://[fd00::1]/hook",
+            "http://[fe80::1]/hook",
+            "http://224.0.0.1/hook",
+        ],
+    )
+    def test_internal_addresses_rejected(self, webhook_url):
+        """Test that loopback, private and link-local webhook targets are rejected."""
+        with pytest.raises(ValidationError, match="Webhook URL cannot point to"):
+            AuditCreateRequest(
+                site_url="https://example.com",
+                queries=["test"],
+                webhook_url=webhook_url,
+            )
+
+    @pytest.mark.parametrize(
+        "webhook_url",
+        [
+            "https://hooks.example.com/callback",
+            "https://8.8.8.8/callback",
+            "https://[2001:4860:4860::8888]/callback",
+            "https://10.example.com/callback",
+        ],
+    )
+    def test_public_addresses_allowed(self, webhook_url):
+        """Test that public hostnames and addresses are accepted."""
+        request = AuditCreateRequest(
+            site_url="https://example.com",
+            queries=["test"],
+            webhook_url=webhook_url,
+        )
+        assert request.webhook_url is not None
+
+    def test_worker_shares_api_rules(self):
+        """Test the worker re-checks stored webhook URLs with the same adapter."""
+        from agentic_search_audit.jobs.worker import validate_webhook_url
+
+        assert validate_webhook_url("https://hooks.example.com/callback") is True
+        assert validate_webhook_url("http://[::ffff:10.0.0.1]/hook") is False
+        assert validate_webhook_url("ftp://hooks.example.com/callback") is False
+        assert validate_webhook_url("not-a-url") is False
+
+
 class TestAuditCancelRequestValidation:
     """Tests for AuditCancelRequest schema validation."""
 
@@ -0,0 +1,56 @@
+"""Tests for the Playwright driver shared between browser clients."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from agentic_search_audit.browser import driver
+
+
+@pytest.fixture(autouse=True)
+def _reset_shared_playwright():
+    """Start every test without a shared Playwright driver."""
+    driver._shared_playwright = None
+    driver._shared_playwright_loop = None
+    driver._shared_playwright_lock = None
+    yield
+    driver._shared_playwright = None
+    driver._shared_playwright_loop = None
+    driver._shared_playwright_lock = None
+
+
+class TestSharedPlaywright:
+    """Tests for get_shared_playwright and close_shared_playwright."""
+
+    async def test_driver_started_once_for_concurrent_clients(self) -> None:
+        mock_pw = AsyncMock()
+        mock_cm = AsyncMock()
+        mock_cm.start = AsyncMock(return_value=mock_pw)
+
+        with patch(
+            "agentic_search_audit.browser.driver.async_playwright",
+            return_value=mock_cm,
+        ):
+            drivers = await asyncio.gather(*(driver.get_shared_playwright() for _ in range(5)))
+
+        assert all(pw is mock_pw for pw in drivers)
+        mock_cm.start.assert_awaited_once()
+
+    async def test_close_stops_driver_and_allows_restart(self) -> None:
+        first_pw, second_pw = AsyncMock(), AsyncMock()
+        mock_cm = AsyncMock()
+        mock_cm.start = AsyncMock(side_effect=[first_pw, second_pw])
+
+        with patch(
+            "agentic_search_audit.browser.driver.async_playwright",
+            return_value=mock_cm,
+        ):
+            assert await driver.get_shared_playwright() is first_pw
+            await driver.close_shared_playwright()
+            assert await driver.get_shared_playwright() is second_pw
+
+        first_pw.stop.assert_awaited_once()
+
+    async def test_close_without_driver_is_noop(self) -> None:
+        await driver.close_shared_playwright()  # should not raise
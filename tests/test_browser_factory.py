@@ -57,24 +57,24 @@ class TestFactoryCDP:
         with pytest.raises(ValueError, match="cdp_endpoint.*browserbase_api_key"):
             RunConfig(browser_backend=BrowserBackend.CDP)
 
-    def test_cdp_with_browserbase_calls_get_endpoint(self) -> None:
+    def test_cdp_with_browserbase_defers_session_creation(self) -> None:
         config = RunConfig(
             browser_backend=BrowserBackend.CDP,
             browserbase_api_key="bb_live_test",
         )
         with patch(
             "agentic_search_audit.browser.browserbase.get_browserbase_endpoint",
-            return_value="wss://connect.browserbase.com/session123",
         ) as mock_get:
             client = create_browser_client(config)
-            mock_get.assert_called_once_with(
-                api_key="bb_live_test",
-                project_id=None,
-            )
-            from agentic_search_audit.browser.cdp_client import CDPBrowserClient
+            # The blocking SDK call happens in connect(), not in the factory
+            mock_get.assert_not_called()
 
-            assert isinstance(client, CDPBrowserClient)
-            assert client.cdp_endpoint == "wss://connect.browserbase.com/session123"
+        from agentic_search_audit.browser.cdp_client import CDPBrowserClient
+
+        assert isinstance(client, CDPBrowserClient)
+        assert client.cdp_endpoint is None
+        assert client.browserbase_api_key == "bb_live_test"
+        assert client.browserbase_project_id is None
 
 
 class TestFactoryUndetected:
@@ -155,3 +155,37 @@ class TestFactoryUnknownBackend:
         config.browser_backend = "fake"  # type: ignore[assignment]
         with pytest.raises(ValueError, match="Unknown browser backend"):
             create_browser_client(config)
+
+
+class TestPackageLazyBackends:
+    """Backends are resolved from the package on first access."""
+
+    def test_optional_backends_resolve(self) -> None:
+        import agentic_search_audit.browser as browser
+        from agentic_search_audit.browser.cdp_client import CDPBrowserClient
+        from agentic_search_audit.browser.playwright_client import PlaywrightBrowserClient
+        from agentic_search_audit.browser.undetected_client import UndetectedBrowserClient
+
+        assert browser.PlaywrightBrowserClient is PlaywrightBrowserClient
+        assert browser.CDPBrowserClient is CDPBrowserClient
+        assert browser.UndetectedBrowserClient is UndetectedBrowserClient
+        assert "CDPBrowserClient" in browser.__all__
+
+    def test_package_import_does_not_load_playwright(self) -> None:
+        import subprocess
+        import sys
+
+        code = (
+            "import sys, agentic_search_audit.browser; "
+            "print(any(m.startswith('playwright') for m in sys.modules))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        assert result.stdout.strip() == "False"
+
+    def test_unknown_attribute_raises(self) -> None:
+        import agentic_search_audit.browser as browser
+
+        with pytest.raises(AttributeError, match="NoSuchClient"):
+            browser.NoSuchClient  # noqa: B018
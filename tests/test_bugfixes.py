@@ -82,7 +82,7 @@ class TestPlaywrightStealthFallback:
 
         with (
             patch(
-                "agentic_search_audit.browser.playwright_client.async_playwright",
+                "agentic_search_audit.browser.driver.async_playwright",
                 return_value=mock_cm,
             ),
             patch.dict("sys.modules", {"playwright_stealth": mock_stealth_mod}),
@@ -124,7 +124,7 @@ class TestCDPStealthFallback:
 
         with (
             patch(
-                "agentic_search_audit.browser.cdp_client.async_playwright",
+                "agentic_search_audit.browser.driver.async_playwright",
                 return_value=mock_cm,
             ),
             patch.dict("sys.modules", {"playwright_stealth": mock_stealth_mod}),
@@ -228,7 +228,7 @@ class TestCDPContextOwnership:
 
         with (
             patch(
-                "agentic_search_audit.browser.cdp_client.async_playwright",
+                "agentic_search_audit.browser.driver.async_playwright",
                 return_value=mock_cm,
             ),
             patch.dict("sys.modules", {"playwright_stealth": mock_stealth_mod}),
@@ -265,7 +265,7 @@ class TestCDPContextOwnership:
 
         with (
             patch(
-                "agentic_search_audit.browser.cdp_client.async_playwright",
+                "agentic_search_audit.browser.driver.async_playwright",
                 return_value=mock_cm,
             ),
             patch.dict("sys.modules", {"playwright_stealth": mock_stealth_mod}),
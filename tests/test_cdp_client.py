@@ -1,11 +1,11 @@
 """Tests for CDPBrowserClient."""
 
 from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock, PropertyMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-from playwright.async_api import Error as PlaywrightError
 
+from agentic_search_audit.browser import driver
 from agentic_search_audit.browser.cdp_client import CDPBrowserClient
 
 
@@ -14,6 +14,18 @@ def client() -> CDPBrowserClient:
     return CDPBrowserClient(cdp_endpoint="ws://localhost:9222")
 
 
+@pytest.fixture(autouse=True)
+def _reset_shared_playwright():
+    """Start every test without a shared Playwright driver."""
+    driver._shared_playwright = None
+    driver._shared_playwright_loop = None
+    driver._shared_playwright_lock = None
+    yield
+    driver._shared_playwright = None
+    driver._shared_playwright_loop = None
+    driver._shared_playwright_lock = None
+
+
 # ---------------------------------------------------------------------------
 # Connection
 # ---------------------------------------------------------------------------
@@ -43,7 +55,7 @@ class TestCDPConnect:
         mock_cm.start = AsyncMock(return_value=mock_pw)
 
         with patch(
-            "agentic_search_audit.browser.cdp_client.async_playwright",
+            "agentic_search_audit.browser.driver.async_playwright",
             return_value=mock_cm,
         ):
             # Mock stealth module with an async stealth_async function
@@ -54,6 +66,39 @@ class TestCDPConnect:
 
             mock_pw.chromium.connect_over_cdp.assert_awaited_once_with("ws://localhost:9222")
             assert client._page is mock_page
+            # The existing context belongs to the remote browser: no stealth
+            mock_stealth_mod.stealth_async.assert_not_awaited()
+
+    async def test_connect_applies_stealth_to_new_context(self) -> None:
+        client = CDPBrowserClient(cdp_endpoint="ws://localhost:9222")
+        mock_page = AsyncMock()
+        mock_page.set_default_timeout = MagicMock()
+        mock_page.set_default_navigation_timeout = MagicMock()
+
+        mock_context = AsyncMock()
+        mock_context.pages = []
+        mock_context.new_page = AsyncMock(return_value=mock_page)
+
+        mock_browser = AsyncMock()
+        mock_browser.contexts = []
+        mock_browser.new_context = AsyncMock(return_value=mock_context)
+
+        mock_pw = AsyncMock()
+        mock_pw.chromium.connect_over_cdp = AsyncMock(return_value=mock_browser)
+        mock_cm = AsyncMock()
+        mock_cm.start = AsyncMock(return_value=mock_pw)
+
+        with patch(
+            "agentic_search_audit.browser.driver.async_playwright",
+            return_value=mock_cm,
+        ):
+            mock_stealth_mod = MagicMock()
+            mock_stealth_mod.stealth_async = AsyncMock()
+            with patch.dict("sys.modules", {"playwright_stealth": mock_stealth_mod}):
+                await client.connect()
+
+        assert client._owns_context is True
+        mock_stealth_mod.stealth_async.assert_awaited_once_with(mock_page)
 
     async def test_disconnect_does_not_close_browser(self, client: CDPBrowserClient) -> None:
         """Disconnect should NOT close the external browser, only the page."""
@@ -71,7 +116,9 @@ class TestCDPConnect:
         page.close.assert_awaited_once()
         # browser.close should NOT be called — it's an external process
         browser.close.assert_not_awaited()
-        pw.stop.assert_awaited_once()
+        # The Playwright driver is shared with other clients and stays up
+        pw.stop.assert_not_awaited()
+        assert client._playwright is None
         assert client._page is None
         assert client._browser is None
 
@@ -79,6 +126,49 @@ class TestCDPConnect:
         await client.disconnect()  # should not raise
 
 
+class TestCDPBrowserbase:
+    """Tests for creating a Browserbase session on connect."""
+
+    async def test_connect_creates_session_once(self) -> None:
+        client = CDPBrowserClient(browserbase_api_key="bb_live_test", browserbase_project_id="p1")
+
+        mock_page = AsyncMock()
+        mock_page.set_default_timeout = MagicMock()
+        mock_page.set_default_navigation_timeout = MagicMock()
+        mock_context = AsyncMock()
+        mock_context.pages = [mock_page]
+        mock_browser = AsyncMock()
+        mock_browser.contexts = [mock_context]
+        mock_pw = AsyncMock()
+        mock_pw.chromium.connect_over_cdp = AsyncMock(return_value=mock_browser)
+        mock_cm = AsyncMock()
+        mock_cm.start = AsyncMock(return_value=mock_pw)
+
+        with (
+            patch(
+                "agentic_search_audit.browser.driver.async_playwright",
+                return_value=mock_cm,
+            ),
+            patch(
+                "agentic_search_audit.browser.browserbase.get_browserbase_endpoint",
+                return_value="wss://connect.browserbase.com/session123",
+            ) as mock_get,
+        ):
+            await client.connect()
+            await client.reconnect()
+
+        mock_get.assert_called_once_with("bb_live_test", "p1")
+        assert client.cdp_endpoint == "wss://connect.browserbase.com/session123"
+        mock_pw.chromium.connect_over_cdp.assert_awaited_with(
+            "wss://connect.browserbase.com/session123"
+        )
+
+    async def test_connect_without_endpoint_or_key_raises(self) -> None:
+        client = CDPBrowserClient()
+        with pytest.raises(ValueError, match="cdp_endpoint.*browserbase_api_key"):
+            await client.connect()
+
+
 # ---------------------------------------------------------------------------
 # Health Checks
 # ---------------------------------------------------------------------------
@@ -105,7 +195,7 @@ class TestCDPHealthChecks:
 
     def test_is_browser_alive_true(self, client: CDPBrowserClient) -> None:
         browser = MagicMock()
-        browser.contexts = []
+        browser.is_connected.return_value = True
         client._browser = browser
         assert client.is_browser_alive() is True
 
@@ -115,9 +205,7 @@ class TestCDPHealthChecks:
 
     def test_is_browser_alive_false_when_dead(self, client: CDPBrowserClient) -> None:
         browser = MagicMock()
-        type(browser).contexts = PropertyMock(
-            side_effect=PlaywrightError("Browser has been closed")
-        )
+        browser.is_connected.return_value = False
         client._browser = browser
         assert client.is_browser_alive() is False
 
@@ -203,16 +291,28 @@ class TestCDPDOMMethods:
         assert result == "https://example.com/page"
 
     async def test_query_selector_found(self, connected_client: CDPBrowserClient) -> None:
-        mock_el = AsyncMock()
-        connected_client._page.query_selector = AsyncMock(return_value=mock_el)
+        locator = MagicMock()
+        locator.count = AsyncMock(return_value=2)
+        connected_client._page.locator = MagicMock(return_value=locator)
         result = await connected_client.query_selector("div.test")
         assert result == {"exists": True}
+        connected_client._page.locator.assert_called_once_with("div.test")
 
     async def test_query_selector_not_found(self, connected_client: CDPBrowserClient) -> None:
-        connected_client._page.query_selector = AsyncMock(return_value=None)
+        locator = MagicMock()
+        locator.count = AsyncMock(return_value=0)
+        connected_client._page.locator = MagicMock(return_value=locator)
         result = await connected_client.query_selector("div.test")
         assert result is None
 
+    async def test_query_selector_all_uses_count(self, connected_client: CDPBrowserClient) -> None:
+        locator = MagicMock()
+        locator.count = AsyncMock(return_value=3)
+        connected_client._page.locator = MagicMock(return_value=locator)
+        result = await connected_client.query_selector_all("li")
+        assert result == [{"index": 0}, {"index": 1}, {"index": 2}]
+        connected_client._page.query_selector_all.assert_not_called()
+
     async def test_click_uses_timeout(self, connected_client: CDPBrowserClient) -> None:
         connected_client.click_timeout_ms = 7000
         await connected_client.click("button.submit")
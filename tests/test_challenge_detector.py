@@ -6,17 +6,29 @@ from unittest.mock import AsyncMock
 import pytest
 
 from agentic_search_audit.browser.challenge_detector import (
+    CHALLENGE_SELECTORS,
     ChallengeDetectedError,
     ChallengeDetection,
     detect_challenge,
 )
 
 
+def probe_result(
+    title: str = "Normal Title",
+    selector: str = "",
+    iframe: str = "",
+    text: str = "lots of normal page content",
+    length: int = 5000,
+) -> dict:
+    """Build the object returned by the challenge probe script."""
+    return {"title": title, "selector": selector, "iframe": iframe, "len": length, "text": text}
+
+
 @pytest.fixture
 def mock_client():
     """Create a mock browser client."""
     client = AsyncMock()
-    client.evaluate = AsyncMock(return_value=None)
+    client.evaluate_raw = AsyncMock(return_value=None)
     client.query_selector = AsyncMock(return_value=None)
     return client
 
@@ -24,29 +36,29 @@ def mock_client():
 @pytest.mark.unit
 async def test_detect_challenge_clean_page(mock_client):
     """No challenge detected on a normal page."""
-    call_count = 0
-
-    async def evaluate_side_effect(expression):
-        nonlocal call_count
-        call_count += 1
-        if call_count == 1:  # title check
-            return "Nike Search Results"
-        if "iframe" in expression:  # iframe check
-            return ""
-        # body check
-        return json.dumps({"len": 5000, "text": "lots of normal page content"})
-
-    mock_client.evaluate = AsyncMock(side_effect=evaluate_side_effect)
-    mock_client.query_selector = AsyncMock(return_value=None)
+    mock_client.evaluate_raw = AsyncMock(return_value=probe_result(title="Nike Search Results"))
     result = await detect_challenge(mock_client)
     assert result.detected is False
     assert result.challenge_type == "none"
+    assert result is await detect_challenge(mock_client)
+
+
+@pytest.mark.unit
+async def test_detect_challenge_single_round_trip(mock_client):
+    """All heuristics are answered by one evaluate_raw call and no selector queries."""
+    mock_client.evaluate_raw = AsyncMock(return_value=probe_result())
+    await detect_challenge(mock_client)
+
+    mock_client.evaluate_raw.assert_awaited_once()
+    mock_client.query_selector.assert_not_called()
+    script = mock_client.evaluate_raw.call_args.args[0]
+    assert json.dumps(", ".join(CHALLENGE_SELECTORS)) in script
 
 
 @pytest.mark.unit
 async def test_detect_challenge_title_cloudflare(mock_client):
     """Detect Cloudflare challenge via title."""
-    mock_client.evaluate = AsyncMock(return_value="Just a moment...")
+    mock_client.evaluate_raw = AsyncMock(return_value=probe_result(title="Just a moment..."))
     result = await detect_challenge(mock_client)
     assert result.detected is True
     assert result.challenge_type == "title_match"
@@ -56,7 +68,9 @@ async def test_detect_challenge_title_cloudflare(mock_client):
 @pytest.mark.unit
 async def test_detect_challenge_title_access_denied(mock_client):
     """Detect access denied via title."""
-    mock_client.evaluate = AsyncMock(return_value="Access Denied - Security Check")
+    mock_client.evaluate_raw = AsyncMock(
+        return_value=probe_result(title="Access Denied - Security Check")
+    )
     result = await detect_challenge(mock_client)
     assert result.detected is True
     assert result.challenge_type == "title_match"
@@ -65,7 +79,9 @@ async def test_detect_challenge_title_access_denied(mock_client):
 @pytest.mark.unit
 async def test_detect_challenge_title_verify_human(mock_client):
     """Detect human verification page via title."""
-    mock_client.evaluate = AsyncMock(return_value="Please Verify You Are Human")
+    mock_client.evaluate_raw = AsyncMock(
+        return_value=probe_result(title="Please Verify You Are Human")
+    )
     result = await detect_challenge(mock_client)
     assert result.detected is True
     assert result.challenge_type == "title_match"
@@ -74,31 +90,17 @@ async def test_detect_challenge_title_verify_human(mock_client):
 @pytest.mark.unit
 async def test_detect_challenge_selector_cloudflare(mock_client):
     """Detect Cloudflare challenge via CSS selector."""
-    mock_client.evaluate = AsyncMock(return_value="Normal Title")
-
-    # Return None for title check, then match on the selector
-    async def query_side_effect(selector):
-        if selector == "#challenge-running":
-            return {"exists": True}
-        return None
-
-    mock_client.query_selector = AsyncMock(side_effect=query_side_effect)
+    mock_client.evaluate_raw = AsyncMock(return_value=probe_result(selector="#challenge-running"))
     result = await detect_challenge(mock_client)
     assert result.detected is True
     assert result.challenge_type == "selector_match"
+    assert "#challenge-running" in result.message
 
 
 @pytest.mark.unit
 async def test_detect_challenge_selector_perimeterx(mock_client):
     """Detect PerimeterX challenge via selector."""
-    mock_client.evaluate = AsyncMock(return_value="Normal Title")
-
-    async def query_side_effect(selector):
-        if selector == "#px-captcha":
-            return {"exists": True}
-        return None
-
-    mock_client.query_selector = AsyncMock(side_effect=query_side_effect)
+    mock_client.evaluate_raw = AsyncMock(return_value=probe_result(selector="#px-captcha"))
     result = await detect_challenge(mock_client)
     assert result.detected is True
     assert result.challenge_type == "selector_match"
@@ -107,21 +109,7 @@ async def test_detect_challenge_selector_perimeterx(mock_client):
 @pytest.mark.unit
 async def test_detect_challenge_captcha_iframe(mock_client):
     """Detect challenge via CAPTCHA iframe."""
-    # Title is normal, no selectors match
-    call_count = 0
-
-    async def evaluate_side_effect(expression):
-        nonlocal call_count
-        call_count += 1
-        if call_count == 1:  # title check
-            return "Normal Title"
-        if "iframe" in expression:  # iframe check
-            return "recaptcha"
-        # body check
-        return json.dumps({"len": 5000, "text": "lots of content"})
-
-    mock_client.evaluate = AsyncMock(side_effect=evaluate_side_effect)
-    mock_client.query_selector = AsyncMock(return_value=None)
+    mock_client.evaluate_raw = AsyncMock(return_value=probe_result(iframe="recaptcha"))
     result = await detect_challenge(mock_client)
     assert result.detected is True
     assert result.challenge_type == "captcha_iframe"
@@ -130,20 +118,9 @@ async def test_detect_challenge_captcha_iframe(mock_client):
 @pytest.mark.unit
 async def test_detect_challenge_short_body_with_block_keyword(mock_client):
     """Detect block page via short body with keywords."""
-    call_count = 0
-
-    async def evaluate_side_effect(expression):
-        nonlocal call_count
-        call_count += 1
-        if call_count == 1:  # title check
-            return "Normal Title"
-        if "iframe" in expression:  # iframe check
-            return ""
-        # body check
-        return json.dumps({"len": 200, "text": "access denied by cloudflare. ray id: abc123"})
-
-    mock_client.evaluate = AsyncMock(side_effect=evaluate_side_effect)
-    mock_client.query_selector = AsyncMock(return_value=None)
+    mock_client.evaluate_raw = AsyncMock(
+        return_value=probe_result(text="access denied by cloudflare. ray id: abc123", length=200)
+    )
     result = await detect_challenge(mock_client)
     assert result.detected is True
     assert result.challenge_type == "short_body_block"
@@ -152,19 +129,47 @@ async def test_detect_challenge_short_body_with_block_keyword(mock_client):
 @pytest.mark.unit
 async def test_detect_challenge_long_body_ignored(mock_client):
     """Long body should not trigger short-body detection even with keywords."""
-    call_count = 0
-
-    async def evaluate_side_effect(expression):
-        nonlocal call_count
-        call_count += 1
-        if call_count == 1:
-            return "Normal Title"
-        if "iframe" in expression:
-            return ""
-        return json.dumps({"len": 5000, "text": "cloudflare protects this site..."})
-
-    mock_client.evaluate = AsyncMock(side_effect=evaluate_side_effect)
-    mock_client.query_selector = AsyncMock(return_value=None)
+    mock_client.evaluate_raw = AsyncMock(
+        return_value=probe_result(text="cloudflare protects this site...", length=5000)
+    )
+    result = await detect_challenge(mock_client)
+    assert result.detected is False
+
+
+@pytest.mark.unit
+async def test_detect_challenge_content_page_skips_dom_checks(mock_client):
+    """A long content page is not flagged by embedded CAPTCHA widgets."""
+    mock_client.evaluate_raw = AsyncMock(
+        return_value=probe_result(selector=".g-recaptcha", iframe="recaptcha", length=20000)
+    )
+    result = await detect_challenge(mock_client)
+    assert result.detected is False
+
+
+@pytest.mark.unit
+async def test_detect_challenge_content_page_still_checks_title(mock_client):
+    """A long page with a challenge title is still detected."""
+    mock_client.evaluate_raw = AsyncMock(
+        return_value=probe_result(title="Access Denied", length=20000)
+    )
+    result = await detect_challenge(mock_client)
+    assert result.detected is True
+    assert result.challenge_type == "title_match"
+
+
+@pytest.mark.unit
+async def test_detect_challenge_probe_failure(mock_client):
+    """A failed probe is treated as no challenge rather than raising."""
+    mock_client.evaluate_raw = AsyncMock(side_effect=RuntimeError("page closed"))
+    result = await detect_challenge(mock_client)
+    assert result.detected is False
+    assert result.challenge_type == "none"
+
+
+@pytest.mark.unit
+async def test_detect_challenge_non_object_probe_result(mock_client):
+    """A probe result that is not an object is treated as no challenge."""
+    mock_client.evaluate_raw = AsyncMock(return_value="not an object")
     result = await detect_challenge(mock_client)
     assert result.detected is False
 
@@ -180,3 +185,14 @@ async def test_challenge_detected_error():
     error = ChallengeDetectedError(detection)
     assert error.detection is detection
     assert "Just a moment" in str(error)
+
+
+@pytest.mark.unit
+async def test_challenge_detection_is_immutable():
+    """ChallengeDetection instances cannot be modified after creation."""
+    import dataclasses
+
+    detection = ChallengeDetection(detected=False, challenge_type="none", message="ok")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        detection.detected = True  # type: ignore[misc]
+    assert not hasattr(detection, "__dict__")
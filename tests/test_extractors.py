@@ -600,3 +600,16 @@ async def test_url_verification_flags_off_domain():
     assert len(results) == 1
     # URL is preserved but flagged as off-domain
     assert results[0].attributes.get("url_off_domain") == "true"
+
+
+@pytest.mark.unit
+async def test_find_close_button_reads_native_result():
+    """Close-button lookup uses the object returned by evaluate_raw."""
+    client = AsyncMock()
+    handler = ModalHandler(client, ModalsConfig())
+    client.evaluate_raw = AsyncMock(
+        return_value={"selector": "button", "index": 3, "text": "Close"},
+    )
+
+    assert await handler._find_close_button() == ("button", 3)
+    client.evaluate.assert_not_called()
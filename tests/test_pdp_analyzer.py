@@ -21,6 +21,7 @@ def mock_client():
     client = AsyncMock()
     client.navigate = AsyncMock(return_value="https://example.com/product/1")
     client.evaluate = AsyncMock(return_value=None)
+    client.evaluate_raw = AsyncMock(return_value=None)
     client.screenshot = AsyncMock()
     client.press_key = AsyncMock()
     client.query_selector = AsyncMock(return_value=None)
@@ -374,7 +375,7 @@ async def test_extract_select_dropdown_options(
     """Test extraction from <select> elements."""
     analyzer = _make_analyzer(mock_client, llm_config, modals_config, sample_query, tmp_path)
 
-    mock_client.evaluate = AsyncMock(
+    mock_client.evaluate_raw = AsyncMock(
         return_value={
             "found": "true",
             "count": "5",
@@ -398,10 +399,23 @@ async def test_extract_select_returns_none_when_not_found(
 ):
     """Test returns None when select element not found."""
     analyzer = _make_analyzer(mock_client, llm_config, modals_config, sample_query, tmp_path)
-    mock_client.evaluate = AsyncMock(return_value=None)
+    mock_client.evaluate_raw = AsyncMock(return_value=None)
+
+    result = await analyzer._extract_select_options('select[name*="size" i]')
+    assert result is None
+
+
+@pytest.mark.unit
+async def test_extract_select_ignores_stringified_result(
+    mock_client, llm_config, modals_config, sample_query, tmp_path
+):
+    """Test the options object is read natively, not from a coerced string."""
+    analyzer = _make_analyzer(mock_client, llm_config, modals_config, sample_query, tmp_path)
+    mock_client.evaluate_raw = AsyncMock(return_value="{'found': 'true'}")
 
     result = await analyzer._extract_select_options('select[name*="size" i]')
     assert result is None
+    mock_client.evaluate.assert_not_called()
 
 
 @pytest.mark.unit
@@ -413,7 +427,7 @@ async def test_extract_expanded_options(
 
     mock_client.query_selector = AsyncMock(return_value={"tagName": "BUTTON"})
     mock_client.click = AsyncMock()
-    mock_client.evaluate = AsyncMock(
+    mock_client.evaluate_raw = AsyncMock(
         return_value={
             "found": "true",
             "count": "3",
@@ -430,7 +444,7 @@ async def test_extract_expanded_options(
     mock_client.click.assert_called_once()
 
     # Verify the JS uses scoped querying (trigger + container, not document-wide)
-    evaluate_calls = mock_client.evaluate.call_args_list
+    evaluate_calls = mock_client.evaluate_raw.call_args_list
     js_code = evaluate_calls[-1][0][0]  # Last evaluate call is the options extraction
     assert "trigger" in js_code
     assert "container" in js_code
@@ -1,14 +1,32 @@
 """Tests for PlaywrightBrowserClient and browser error classification."""
 
-from unittest.mock import AsyncMock, MagicMock, PropertyMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from playwright.async_api import Error as PlaywrightError
 from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
+from agentic_search_audit.browser import driver as shared_driver
+from agentic_search_audit.browser import playwright_client
+from agentic_search_audit.browser.driver import close_shared_playwright
 from agentic_search_audit.browser.errors import BrowserErrorKind, classify_error, is_retryable
 from agentic_search_audit.browser.playwright_client import PlaywrightBrowserClient
 
+
+@pytest.fixture(autouse=True)
+def _reset_browser_pool():
+    """Start every test with an empty browser pool and no shared driver."""
+    shared_driver._shared_playwright = None
+    shared_driver._shared_playwright_loop = None
+    shared_driver._shared_playwright_lock = None
+    playwright_client._idle_browsers.clear()
+    yield
+    shared_driver._shared_playwright = None
+    shared_driver._shared_playwright_loop = None
+    shared_driver._shared_playwright_lock = None
+    playwright_client._idle_browsers.clear()
+
+
 # ---------------------------------------------------------------------------
 # Error Classification
 # ---------------------------------------------------------------------------
@@ -54,6 +72,13 @@ class TestBrowserErrorClassification:
         exc = PlaywrightError("Element is not an input")
         assert classify_error(exc) == BrowserErrorKind.PERMANENT
 
+    def test_classify_subclass_uses_nearest_registered_type(self) -> None:
+        class CustomTimeoutError(PlaywrightTimeoutError):
+            pass
+
+        exc = CustomTimeoutError("Page has been closed")
+        assert classify_error(exc) == BrowserErrorKind.TIMEOUT
+
     def test_classify_runtime_not_connected(self) -> None:
         exc = RuntimeError("Browser not connected")
         assert classify_error(exc) == BrowserErrorKind.NOT_CONNECTED
@@ -151,68 +176,62 @@ class TestPlaywrightClientDisconnect:
         c = PlaywrightBrowserClient(headless=True)
         return c
 
-    async def test_disconnect_closes_all_resources(self, client: PlaywrightBrowserClient) -> None:
+    async def test_disconnect_closes_browser_outside_pool(
+        self, client: PlaywrightBrowserClient
+    ) -> None:
         page = AsyncMock()
         context = AsyncMock()
         browser = AsyncMock()
-        pw = AsyncMock()
 
         client._page = page
         client._context = context
         client._browser = browser
-        client._playwright = pw
+        client._playwright = AsyncMock()
 
         await client.disconnect()
 
-        page.close.assert_awaited_once()
-        context.close.assert_awaited_once()
+        # Browser.close() tears down its contexts and pages in one call
         browser.close.assert_awaited_once()
-        pw.stop.assert_awaited_once()
+        page.close.assert_not_awaited()
+        context.close.assert_not_awaited()
 
         assert client._page is None
         assert client._context is None
         assert client._browser is None
         assert client._playwright is None
 
-    async def test_disconnect_continues_on_page_failure(
+    async def test_disconnect_continues_on_browser_failure(
         self, client: PlaywrightBrowserClient
     ) -> None:
-        page = AsyncMock()
-        page.close = AsyncMock(side_effect=RuntimeError("page already dead"))
-        context = AsyncMock()
         browser = AsyncMock()
-        pw = AsyncMock()
+        browser.close = AsyncMock(side_effect=RuntimeError("browser already dead"))
 
-        client._page = page
-        client._context = context
+        client._page = AsyncMock()
+        client._context = AsyncMock()
         client._browser = browser
-        client._playwright = pw
 
         await client.disconnect()
 
-        # All resources should still be cleaned up
-        context.close.assert_awaited_once()
-        browser.close.assert_awaited_once()
-        pw.stop.assert_awaited_once()
         assert client._page is None
+        assert client._context is None
+        assert client._browser is None
 
-    async def test_disconnect_continues_on_context_failure(
+    async def test_disconnect_closes_context_without_browser(
         self, client: PlaywrightBrowserClient
     ) -> None:
+        page = AsyncMock()
         context = AsyncMock()
-        context.close = AsyncMock(side_effect=RuntimeError("context dead"))
-        browser = AsyncMock()
-        pw = AsyncMock()
 
-        client._page = None
+        client._page = page
         client._context = context
-        client._browser = browser
-        client._playwright = pw
+        client._browser = None
 
         await client.disconnect()
 
-        browser.close.assert_awaited_once()
-        pw.stop.assert_awaited_once()
+        # Closing the context also closes its page
+        context.close.assert_awaited_once()
+        page.close.assert_not_awaited()
+        assert client._page is None
         assert client._context is None
 
     async def test_disconnect_noop_when_nothing_set(self, client: PlaywrightBrowserClient) -> None:
@@ -220,6 +239,165 @@ class TestPlaywrightClientDisconnect:
         await client.disconnect()
 
 
+# ---------------------------------------------------------------------------
+# Browser Pool
+# ---------------------------------------------------------------------------
+
+
+def _mock_playwright() -> tuple[AsyncMock, list[MagicMock]]:
+    """Build a mock driver whose chromium.launch() returns a new browser each call."""
+    launched: list[MagicMock] = []
+
+    def launch(**kwargs: object) -> MagicMock:
+        page = AsyncMock()
+        page.set_default_timeout = MagicMock()
+        page.set_default_navigation_timeout = MagicMock()
+        context = AsyncMock()
+        context.new_page = AsyncMock(return_value=page)
+        browser = MagicMock()
+        browser.new_context = AsyncMock(return_value=context)
+        browser.close = AsyncMock()
+        browser.is_connected = MagicMock(return_value=True)
+        launched.append(browser)
+        return browser
+
+    pw = AsyncMock()
+    pw.chromium.launch = AsyncMock(side_effect=launch)
+    return pw, launched
+
+
+class TestPlaywrightBrowserPool:
+    """Tests that launched browsers are reused across clients."""
+
+    @pytest.fixture()
+    def driver(self):
+        pw, launched = _mock_playwright()
+        cm = MagicMock()
+        cm.start = AsyncMock(return_value=pw)
+        with (
+            patch(
+                "agentic_search_audit.browser.driver.async_playwright",
+                return_value=cm,
+            ) as factory,
+            patch.dict("sys.modules", {"playwright_stealth": None}),
+        ):
+            yield pw, launched, factory
+
+    async def test_second_client_reuses_browser(self, driver) -> None:
+        pw, launched, factory = driver
+
+        first = PlaywrightBrowserClient(headless=True)
+        await first.connect()
+        context = first._context
+        await first.disconnect()
+
+        context.close.assert_awaited_once()
+        launched[0].close.assert_not_awaited()
+
+        second = PlaywrightBrowserClient(headless=True)
+        await second.connect()
+
+        assert pw.chromium.launch.await_count == 1
+        assert second._browser is launched[0]
+        assert launched[0].new_context.await_count == 2
+        factory.assert_called_once()
+
+    async def test_different_proxy_launches_new_browser(self, driver) -> None:
+        pw, launched, _ = driver
+
+        first = PlaywrightBrowserClient(headless=True)
+        await first.connect()
+        await first.disconnect()
+
+        second = PlaywrightBrowserClient(headless=True, proxy_url="http://proxy:8080")
+        await second.connect()
+
+        assert pw.chromium.launch.await_count == 2
+        assert second._browser is launched[1]
+
+    async def test_set_proxy_does_not_pool_under_new_proxy(self, driver) -> None:
+        pw, launched, _ = driver
+
+        client = PlaywrightBrowserClient(headless=True)
+        await client.connect()
+        await client.set_proxy("http://proxy:8080")
+
+        # The browser launched without a proxy is only offered to matching clients
+        assert playwright_client._idle_browsers[(pw, True, None)] == [launched[0]]
+        assert client._browser is launched[1]
+
+    async def test_reconnect_launches_new_browser(self, driver) -> None:
+        pw, launched, _ = driver
+
+        client = PlaywrightBrowserClient(headless=True)
+        await client.connect()
+        await client.reconnect()
+
+        launched[0].close.assert_awaited_once()
+        assert pw.chromium.launch.await_count == 2
+        assert client._browser is launched[1]
+        assert not playwright_client._idle_browsers.get((pw, True, None))
+
+    async def test_new_event_loop_warns_about_stale_pool(self, driver, caplog) -> None:
+        _, _, factory = driver
+        new_pw, new_launched = _mock_playwright()
+
+        client = PlaywrightBrowserClient(headless=True)
+        await client.connect()
+        await client.disconnect()
+        # As if the next client ran on another loop with its own driver
+        shared_driver._shared_playwright_loop = None
+        factory.return_value.start = AsyncMock(return_value=new_pw)
+
+        await client.connect()
+
+        assert "Dropping 1 pooled browser(s)" in caplog.text
+        assert client._browser is new_launched[0]
+        assert not playwright_client._idle_browsers
+
+    async def test_dead_browser_is_not_pooled(self, driver) -> None:
+        pw, launched, _ = driver
+
+        client = PlaywrightBrowserClient(headless=True)
+        await client.connect()
+        launched[0].is_connected.return_value = False
+        await client.disconnect()
+
+        launched[0].close.assert_awaited_once()
+        await client.connect()
+        assert pw.chromium.launch.await_count == 2
+
+    async def test_pool_size_zero_closes_browser(self, driver, monkeypatch) -> None:
+        _, launched, _ = driver
+        monkeypatch.setenv(playwright_client.BROWSER_POOL_SIZE_ENV, "0")
+
+        client = PlaywrightBrowserClient(headless=True)
+        await client.connect()
+        await client.disconnect()
+
+        launched[0].close.assert_awaited_once()
+        assert not playwright_client._idle_browsers
+
+    async def test_stopped_driver_browsers_are_not_reused(self, driver, caplog) -> None:
+        pw, launched, factory = driver
+        new_pw, new_launched = _mock_playwright()
+
+        client = PlaywrightBrowserClient(headless=True)
+        await client.connect()
+        await client.disconnect()
+        await close_shared_playwright()
+        # Stopping the driver ends the browsers it launched
+        launched[0].is_connected.return_value = False
+        factory.return_value.start = AsyncMock(return_value=new_pw)
+
+        await client.connect()
+
+        pw.stop.assert_awaited_once()
+        assert client._browser is new_launched[0]
+        assert "Dropping" not in caplog.text
+        assert not playwright_client._idle_browsers
+
+
 # ---------------------------------------------------------------------------
 # Browser Health
 # ---------------------------------------------------------------------------
@@ -234,7 +412,7 @@ class TestPlaywrightClientBrowserHealth:
 
     def test_is_browser_alive_true(self, client: PlaywrightBrowserClient) -> None:
         browser = MagicMock()
-        browser.contexts = []
+        browser.is_connected.return_value = True
         client._browser = browser
         assert client.is_browser_alive() is True
 
@@ -244,9 +422,7 @@ class TestPlaywrightClientBrowserHealth:
 
     def test_is_browser_alive_false_when_dead(self, client: PlaywrightBrowserClient) -> None:
         browser = MagicMock()
-        type(browser).contexts = PropertyMock(
-            side_effect=PlaywrightError("Browser has been closed")
-        )
+        browser.is_connected.return_value = False
         client._browser = browser
         assert client.is_browser_alive() is False
 
@@ -305,17 +481,20 @@ class TestPlaywrightClientErrorPropagation:
     def client(self) -> PlaywrightBrowserClient:
         c = PlaywrightBrowserClient(headless=True)
         c._page = AsyncMock()
+        c._page.locator = MagicMock()
         return c
 
     async def test_query_selector_reraises_playwright_error(
         self, client: PlaywrightBrowserClient
     ) -> None:
-        client._page.query_selector = AsyncMock(side_effect=PlaywrightError("Page has been closed"))
+        client._page.locator.return_value.count = AsyncMock(
+            side_effect=PlaywrightError("Page has been closed")
+        )
         with pytest.raises(PlaywrightError):
             await client.query_selector("div")
 
     async def test_query_selector_reraises_timeout(self, client: PlaywrightBrowserClient) -> None:
-        client._page.query_selector = AsyncMock(
+        client._page.locator.return_value.count = AsyncMock(
             side_effect=PlaywrightTimeoutError("Timeout 5000ms exceeded")
         )
         with pytest.raises(PlaywrightTimeoutError):
@@ -331,33 +510,75 @@ class TestPlaywrightClientErrorPropagation:
     async def test_query_selector_all_reraises_playwright_error(
         self, client: PlaywrightBrowserClient
     ) -> None:
-        client._page.query_selector_all = AsyncMock(
+        client._page.locator.return_value.count = AsyncMock(
             side_effect=PlaywrightError("Page has been closed")
         )
         with pytest.raises(PlaywrightError):
             await client.query_selector_all("div")
 
+    async def test_query_selector_all_counts_without_handles(
+        self, client: PlaywrightBrowserClient
+    ) -> None:
+        client._page.locator.return_value.count = AsyncMock(return_value=2)
+        result = await client.query_selector_all("li.item")
+        assert result == [{"index": 0}, {"index": 1}]
+        client._page.locator.assert_called_once_with("li.item")
+        client._page.query_selector_all.assert_not_called()
+
     async def test_get_element_text_reraises_playwright_error(
         self, client: PlaywrightBrowserClient
     ) -> None:
-        client._page.query_selector = AsyncMock(side_effect=PlaywrightError("Page has been closed"))
+        client._page.locator.return_value.evaluate_all = AsyncMock(
+            side_effect=PlaywrightError("Page has been closed")
+        )
         with pytest.raises(PlaywrightError):
             await client.get_element_text("div")
 
     async def test_get_element_attribute_reraises_playwright_error(
         self, client: PlaywrightBrowserClient
     ) -> None:
-        client._page.query_selector = AsyncMock(side_effect=PlaywrightError("Page has been closed"))
+        client._page.locator.return_value.evaluate_all = AsyncMock(
+            side_effect=PlaywrightError("Page has been closed")
+        )
         with pytest.raises(PlaywrightError):
             await client.get_element_attribute("div", "href")
 
+    async def test_get_element_text_reads_first_match_in_one_call(
+        self, client: PlaywrightBrowserClient
+    ) -> None:
+        client._page.locator.return_value.evaluate_all = AsyncMock(return_value="Shoes")
+        assert await client.get_element_text("h1") == "Shoes"
+        client._page.locator.assert_called_once_with("h1")
+        client._page.query_selector.assert_not_called()
+
+    async def test_get_element_attribute_passes_name_to_page(
+        self, client: PlaywrightBrowserClient
+    ) -> None:
+        evaluate_all = AsyncMock(return_value="/cart")
+        client._page.locator.return_value.evaluate_all = evaluate_all
+        assert await client.get_element_attribute("a.cart", "href") == "/cart"
+        assert evaluate_all.await_args.args[1] == "href"
+
     async def test_query_selector_swallows_non_playwright_exception(
         self, client: PlaywrightBrowserClient
     ) -> None:
-        client._page.query_selector = AsyncMock(side_effect=ValueError("weird"))
+        client._page.locator.return_value.count = AsyncMock(side_effect=ValueError("weird"))
         result = await client.query_selector("div")
         assert result is None
 
+    async def test_evaluate_raw_returns_native_value(self, client: PlaywrightBrowserClient) -> None:
+        client._page.evaluate = AsyncMock(return_value={"count": 2, "items": ["a", "b"]})
+        assert await client.evaluate_raw("x") == {"count": 2, "items": ["a", "b"]}
+        assert await client.evaluate("x") == "{'count': 2, 'items': ['a', 'b']}"
+
+    async def test_wait_for_page_stable_waits_for_painted_frame(
+        self, client: PlaywrightBrowserClient
+    ) -> None:
+        await client.wait_for_page_stable(timeout=1000)
+        client._page.wait_for_load_state.assert_awaited_once_with("networkidle", timeout=1000)
+        client._page.evaluate.assert_awaited_once()
+        assert client._page.evaluate.await_args.args[0].count("requestAnimationFrame") == 2
+
     async def test_evaluate_swallows_non_playwright_exception(
         self, client: PlaywrightBrowserClient
     ) -> None:
@@ -379,7 +600,8 @@ class TestPlaywrightClientReconnect:
 
         call_order: list[str] = []
 
-        async def mock_disconnect() -> None:
+        async def mock_disconnect(release_to_pool: bool = True) -> None:
+            assert release_to_pool is False
             call_order.append("disconnect")
 
         async def mock_connect() -> None:
@@ -38,6 +38,34 @@ class TestUserRepository:
         mock_session.add.assert_called_once()
         mock_session.flush.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_create_many(self, repo, mock_session):
+        """Test creating several users in one flush."""
+        mock_session.add_all = MagicMock()
+
+        users = await repo.create_many(
+            [
+                {"email": "a@example.com", "password_hash": "h1", "name": "A"},
+                {"email": "b@example.com", "password_hash": "h2", "name": None},
+            ]
+        )
+
+        assert [u.email for u in users] == ["a@example.com", "b@example.com"]
+        mock_session.add_all.assert_called_once_with(users)
+        mock_session.flush.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_get_existing_emails(self, repo, mock_session):
+        """Test looking up which emails are already registered."""
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = ["a@example.com"]
+        mock_session.execute.return_value = mock_result
+
+        result = await repo.get_existing_emails(["a@example.com", "b@example.com"])
+
+        assert result == {"a@example.com"}
+        mock_session.execute.assert_called_once()
+
     @pytest.mark.asyncio
     async def test_get_by_id(self, repo, mock_session):
         """Test getting user by ID."""
@@ -82,10 +110,11 @@ class TestUserRepository:
         mock_result.scalar_one_or_none.return_value = mock_user
         mock_session.execute.return_value = mock_result
 
-        await repo.update(uuid4(), name="Updated Name")
+        result = await repo.update(uuid4(), name="Updated Name")
 
-        assert mock_session.execute.call_count == 2  # update + select
-        mock_session.flush.assert_called_once()
+        assert result == mock_user
+        mock_session.execute.assert_called_once()  # UPDATE ... RETURNING
+        assert "RETURNING" in str(mock_session.execute.call_args.args[0])
 
 
 class TestOrganizationRepository:
@@ -107,6 +136,28 @@ class TestOrganizationRepository:
 
         return OrganizationRepository(mock_session)
 
+    @pytest.mark.asyncio
+    async def test_get_detail(self, repo, mock_session):
+        """Test organization detail, counts and membership come from one query."""
+        mock_row = MagicMock()
+        mock_result = MagicMock()
+        mock_result.one_or_none.return_value = mock_row
+        mock_session.execute.return_value = mock_result
+
+        result = await repo.get_detail(uuid4(), uuid4())
+
+        assert result == mock_row
+        mock_session.execute.assert_called_once()
+        query = mock_session.execute.call_args.args[0]
+        assert [c.name for c in query.selected_columns] == [
+            "id",
+            "name",
+            "created_at",
+            "member_count",
+            "audit_count",
+            "is_member",
+        ]
+
     @pytest.mark.asyncio
     async def test_create_organization(self, repo, mock_session):
         """Test creating an organization."""
@@ -326,6 +377,8 @@ class TestAuditRepository:
 
         assert len(audits) == 2
         assert total == 2
+        query = str(mock_session.execute.call_args_list[1].args[0])
+        assert "ORDER BY audits.created_at DESC, audits.id DESC" in query
 
     @pytest.mark.asyncio
     async def test_list_by_user_with_status_filter(self, repo, mock_session):
@@ -342,6 +395,89 @@ class TestAuditRepository:
 
         assert total == 1
 
+    @pytest.mark.asyncio
+    async def test_list_summaries_by_user(self, repo, mock_session):
+        """Test listing audit summaries uses a single query with a window total."""
+        row = MagicMock()
+        row.total = 7
+        summary_result = MagicMock()
+        summary_result.all.return_value = [row]
+        mock_session.execute.return_value = summary_result
+
+        rows, total = await repo.list_summaries_by_user(uuid4(), page=1, page_size=20)
+
+        assert rows == [row]
+        assert total == 7
+        mock_session.execute.assert_called_once()
+        sql = str(mock_session.execute.call_args[0][0])
+        assert "json_array_length" in sql
+        assert "OVER ()" in sql
+
+    @pytest.mark.asyncio
+    async def test_list_summaries_by_user_past_last_page(self, repo, mock_session):
+        """Test listing summaries past the last page falls back to a count."""
+        summary_result = MagicMock()
+        summary_result.all.return_value = []
+        count_result = MagicMock()
+        count_result.scalar.return_value = 3
+
+        mock_session.execute.side_effect = [summary_result, count_result]
+
+        rows, total = await repo.list_summaries_by_user(uuid4(), page=5, page_size=20)
+
+        assert rows == []
+        assert total == 3
+
+    @pytest.mark.asyncio
+    async def test_list_by_user_keyset_first_page(self, repo, mock_session):
+        """Test first keyset page returns a cursor for the last row and the total."""
+        from agentic_search_audit.db.repositories import decode_audit_cursor
+
+        rows = [MagicMock(), MagicMock(), MagicMock()]
+        for i, row in enumerate(rows):
+            row.created_at = datetime(2024, 1, 3 - i)
+            row.id = uuid4()
+            row.total = 5
+        keyset_result = MagicMock()
+        keyset_result.all.return_value = rows
+        mock_session.execute.return_value = keyset_result
+
+        page, next_cursor, total = await repo.list_by_user_keyset(uuid4(), limit=2)
+
+        assert page == rows[:2]
+        assert total == 5
+        assert decode_audit_cursor(next_cursor) == (rows[1].created_at, rows[1].id)
+        sql = str(mock_session.execute.call_args[0][0])
+        assert "OFFSET" not in sql
+        assert "OVER ()" in sql
+
+    @pytest.mark.asyncio
+    async def test_list_by_user_keyset_with_cursor(self, repo, mock_session):
+        """Test keyset page after a cursor seeks past it without counting."""
+        from agentic_search_audit.db.repositories import encode_audit_cursor
+
+        keyset_result = MagicMock()
+        keyset_result.all.return_value = [MagicMock()]
+        mock_session.execute.return_value = keyset_result
+
+        cursor = encode_audit_cursor(datetime(2024, 1, 1), uuid4())
+        page, next_cursor, total = await repo.list_by_user_keyset(uuid4(), cursor=cursor, limit=2)
+
+        assert len(page) == 1
+        assert next_cursor is None
+        assert total is None
+        sql = str(mock_session.execute.call_args[0][0])
+        assert "(audits.created_at, audits.id) <" in sql
+        assert "OVER ()" not in sql
+
+    @pytest.mark.asyncio
+    async def test_list_by_user_keyset_invalid_cursor(self, repo, mock_session):
+        """Test malformed keyset cursor is rejected before querying."""
+        with pytest.raises(ValueError):
+            await repo.list_by_user_keyset(uuid4(), cursor="not-a-cursor")
+
+        mock_session.execute.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_update_status(self, repo, mock_session):
         """Test updating audit status."""
@@ -377,6 +513,92 @@ class TestAuditRepository:
 
         mock_session.execute.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_get_results_for_audits(self, repo, mock_session):
+        """Test fetching results for several audits in one query."""
+        first_id, second_id = uuid4(), uuid4()
+        results = []
+        for audit_id in (first_id, second_id, first_id):
+            audit_result = MagicMock()
+            audit_result.audit_id = audit_id
+            results.append(audit_result)
+        mock_result = MagicMock()
+        mock_result.scalars.return_value = iter(results)
+        mock_session.execute.return_value = mock_result
+
+        grouped = await repo.get_results_for_audits([first_id, second_id])
+
+        mock_session.execute.assert_called_once()
+        assert grouped[first_id] == [results[0], results[2]]
+        assert grouped[second_id] == [results[1]]
+        assert grouped.get(uuid4(), []) == []
+
+    @pytest.mark.asyncio
+    async def test_get_results_for_no_audits(self, repo, mock_session):
+        """Test no query is issued without audit IDs."""
+        assert await repo.get_results_for_audits([]) == {}
+        mock_session.execute.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_delete_many(self, repo, mock_session):
+        """Test bulk deletion removes results, reports and audits in three statements."""
+        await repo.delete_many([uuid4() for _ in range(50)])
+
+        assert mock_session.execute.call_count == 3
+        tables = [call.args[0].table.name for call in mock_session.execute.call_args_list]
+        assert tables == ["audit_results", "audit_reports", "audits"]
+
+    @pytest.mark.asyncio
+    async def test_iter_batches_by_user(self, repo, mock_session):
+        """Test audits are walked in keyset batches until a short batch."""
+        created_at = datetime(2024, 1, 1)
+        batches = [
+            [MagicMock(id=uuid4(), created_at=created_at) for _ in range(2)],
+            [MagicMock(id=uuid4(), created_at=created_at)],
+        ]
+        results = []
+        for batch in batches:
+            mock_result = MagicMock()
+            mock_result.scalars.return_value.all.return_value = batch
+            results.append(mock_result)
+        mock_session.execute.side_effect = results
+
+        seen = [batch async for batch in repo.iter_batches_by_user(uuid4(), batch_size=2)]
+
+        assert seen == batches
+        assert mock_session.execute.call_count == 2
+        second_query = str(mock_session.execute.call_args_list[1].args[0])
+        assert "audits.created_at, audits.id) <" in second_query
+
+    @pytest.mark.asyncio
+    async def test_iter_batches_by_user_full_last_batch(self, repo, mock_session):
+        """Test an empty follow-up batch ends iteration."""
+        batch = [MagicMock(id=uuid4(), created_at=datetime(2024, 1, 1)) for _ in range(2)]
+        full, empty = MagicMock(), MagicMock()
+        full.scalars.return_value.all.return_value = batch
+        empty.scalars.return_value.all.return_value = []
+        mock_session.execute.side_effect = [full, empty]
+
+        seen = [b async for b in repo.iter_batches_by_user(uuid4(), batch_size=2)]
+
+        assert seen == [batch]
+        assert mock_session.execute.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_delete_by_user(self, repo, mock_session):
+        """Test deleting a user's audits issues set-based deletes without a fetch."""
+        await repo.delete_by_user(uuid4())
+
+        tables = [call.args[0].table.name for call in mock_session.execute.call_args_list]
+        assert tables == ["audit_results", "audit_reports", "audits"]
+
+    @pytest.mark.asyncio
+    async def test_delete_many_empty(self, repo, mock_session):
+        """Test bulk deletion without IDs is a no-op."""
+        await repo.delete_many([])
+
+        mock_session.execute.assert_not_called()
+
 
 class TestUsageRepository:
     """Test suite for UsageRepository."""
@@ -250,6 +250,13 @@ class TestUndetectedDOMMethods:
         result = await connected_client.evaluate("void 0")
         assert result is None
 
+    async def test_evaluate_raw_keeps_structure(
+        self, connected_client: UndetectedBrowserClient
+    ) -> None:
+        connected_client._driver.execute_script = MagicMock(return_value={"found": "true"})
+        result = await connected_client.evaluate_raw("({found: 'true'})")
+        assert result == {"found": "true"}
+
     async def test_get_html(self, connected_client: UndetectedBrowserClient) -> None:
         connected_client._driver.page_source = "<html></html>"
         result = await connected_client.get_html()